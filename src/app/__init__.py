@@ -1,16 +1,23 @@
+from typing import List
 from pydantic import BaseModel, Field
 import pygame
+from app.core.systems.menu.loading import LoadingScreen
 from app.core.systems.menu.start import StartMenuManager
 from project import AppData
 from project.settings.constants import GameInfo
-from tools import AssetManager
+from tools import AssetManager, image_cache
 from tools.console import *
+from tools.preloader import asset_preloader
 from app.core.engine import Engine
+from app.core.engine.compositor import compositor
+from app.core.engine.input import InputQueue
+from app.core.engine.loop import GameLoop
 from enum import Enum
 
 
 class State(Enum):
     MENU = "menu"
+    LOADING = "loading"
     PLAYING = "playing"
     PAUSED = "paused"
 
@@ -19,9 +26,12 @@ class App(BaseModel):
     display_surface: pygame.Surface = Field(default=None)
     running: bool = Field(default=True)
     engine: Engine = Field(default=None)
-    clock: pygame.time.Clock = Field(default_factory=pygame.time.Clock)
+    loop: GameLoop = Field(default=None)
+    input: InputQueue = Field(default_factory=InputQueue)
     game_state: State = Field(default=State.MENU)
     menu: StartMenuManager = Field(default=None)
+    loading_screen: LoadingScreen = Field(default=None)
+    _rendered_state: State = None  # * State drawn last frame (a state change repaints the whole screen)
 
     class Config:
         arbitrary_types_allowed = True
@@ -34,16 +44,24 @@ class App(BaseModel):
         
         # Initialize display first
         self.display_surface = self.set_display_mode()
+        self.loop = GameLoop(fps=self.app_data.settings.fps, tick_rate=self.app_data.settings.tick_rate)
+        image_cache.set_budget(self.app_data.settings.image_cache_mb * 1024 * 1024)
+        compositor.enabled = self.app_data.settings.dirty_rects
 
         # Then initialize menu and engine
         self.menu = StartMenuManager(self.display_surface, self.new_game)  # Pass the method directly
+        self.loading_screen = LoadingScreen(self.menu.theme, self.menu.background)
         # self._init_pause_menu()
 
+        # * Decode the game assets in the background while the menu is shown
+        Engine.queue_assets(asset_preloader)
+
         print(f"\033[94mApp Running\033[0m")
 
     def init_engine(self):
         """Initialize or reinitialize the game engine"""
         if self.engine:
+            self.engine.cleanup()  # * Release cached assets before dropping the old engine
             del self.engine
             self.engine = None
         
@@ -51,9 +69,15 @@ class App(BaseModel):
         self.engine.init(self.display_surface)
 
     def new_game(self):
-        """Start a new game, ensuring clean state"""
+        """Start a new game once the preloaded assets are ready (shows the loading screen meanwhile)"""
         print("Initializing new game...")
+        Engine.queue_assets(asset_preloader)  # * Only queues what isn't loaded yet (e.g. the map of a previous game)
+        self.game_state = State.LOADING
+
+    def _start_game(self):
+        """Build the engine from the preloaded assets, ensuring clean state"""
         self.init_engine()  # Reinitialize engine
+        self.loop.reset()  # * Don't fast forward the time spent loading
         self.game_state = State.PLAYING
         print(f"Game state changed to: {self.game_state}")
 
@@ -65,6 +89,7 @@ class App(BaseModel):
     def _toggle_fullscreen(self):
         self.app_data.settings.fullscreen ^= True
         self.display_surface = self.set_display_mode()
+        compositor.invalidate()
         # todo: Def some more generic 'init_components' fn
         # # Reinitialize components with new display surface
         # if self.engine: self.engine.initialize_display(self.display_surface)
@@ -91,10 +116,7 @@ class App(BaseModel):
     def handle_click(self, event: pygame.event.Event) -> None:
         pos = event.pos
         match self.game_state:
-            case State.MENU: 
-                self.menu.handle_click(pos)
-                self.menu.handle_mousemotion(pos)
-                self.menu.handle_mouseup(pos)
+            case State.MENU: self.menu.handle_click(pos)
             case State.PLAYING: self.engine.handle_click(event)
 
     # def handle_hover(self, event: pygame.event.Event) -> None:
@@ -107,25 +129,56 @@ class App(BaseModel):
     #     if self.engine: self.engine.initialize(self.display_surface)
     #     if self.menu: self.menu = MenuManager(self.display_surface, self.new_game)
 
-    def handle_events(self, event: pygame.event.Event) -> None:
-        match event.type:
-            case pygame.QUIT: self.running = False
-            case pygame.KEYDOWN: self.handle_keydown(event)
-            case pygame.MOUSEBUTTONDOWN: self.handle_click(event)
-            # case pygame.MOUSEMOTION: self.handle_hover(event)
-            # case pygame.VIDEORESIZE: self.handle_resize(event)
+    def handle_mousemotion(self, event: pygame.event.Event) -> None:
+        match self.game_state:
+            case State.MENU: self.menu.handle_mousemotion(event.pos)
+
+    def handle_mouseup(self, event: pygame.event.Event) -> None:
+        match self.game_state:
+            case State.MENU: self.menu.handle_mouseup(event.pos)
+
+    def handle_events(self, events: List[pygame.event.Event]) -> None:
+        """Dispatch every event drained this frame"""
+        for event in events:
+            match event.type:
+                case pygame.QUIT: self.running = False
+                case pygame.KEYDOWN: self.handle_keydown(event)
+                case pygame.MOUSEBUTTONDOWN: self.handle_click(event)
+                case pygame.MOUSEBUTTONUP: self.handle_mouseup(event)
+                case pygame.MOUSEMOTION: self.handle_mousemotion(event)
+                case pygame.WINDOWEXPOSED: compositor.invalidate()
+                # case pygame.VIDEORESIZE: self.handle_resize(event)
+        if events and self.game_state == State.MENU: compositor.invalidate()  # * The menu only changes on input
+
+    def update(self, dt: float) -> None:
+        """Advance the simulation by one fixed step"""
+        match self.game_state:
+            case State.MENU: asset_preloader.poll()
+            case State.LOADING:
+                asset_preloader.poll(budget_ms=self.loop.stats.budget_ms / 2)  # * Nothing else to do: use more of the frame
+                if asset_preloader.done: self._start_game()
+            case State.PLAYING: self.engine.update(dt)
+
+    def render(self, alpha: float) -> None:
+        """Draw the current state (`alpha` interpolates between the last two simulation steps)"""
+        if self.game_state != self._rendered_state:
+            compositor.invalidate()
+            self._rendered_state = self.game_state
+        match self.game_state:
+            case State.MENU:
+                if compositor.dirty or not compositor.enabled: self.menu.draw(self.display_surface)  # * Idle menu: nothing to draw
+            case State.LOADING: self.loading_screen.draw(self.display_surface, asset_preloader.progress)
+            case State.PLAYING: self.engine.render(alpha)
 
     def run(self) -> None:
         while self.running:
-            dt: float = self.clock.tick(self.app_data.settings.fps) / 1000.0
-            self.handle_events(pygame.event.poll())  # * Handle events in the queue
-            match self.game_state:  # * Match the current game state
-                case State.MENU:
-                    self.menu.draw(self.display_surface)
-                case State.PLAYING:
-                    self.engine.update(dt)
-                    self.engine.run()
-
-            pygame.display.flip()
-
+            self.loop.begin_frame()  # * The only rate limit of the frame
+            self.handle_events(self.input.drain())  # * Handle every event in the queue (batched)
+            for dt in self.loop.steps():  # * Fixed simulation steps owed for this frame
+                self.update(dt)
+            self.render(self.loop.alpha)
+            compositor.present(self.display_surface)  # * The only present of the frame (only the dirty rects if enabled)
+            self.input.mark_presented()
+
+        asset_preloader.shutdown()
         pygame.quit()
@@ -3,8 +3,15 @@ from typing import Optional, Dict, Any
 import pygame
 from pydantic import BaseModel, Field
 
+from app.core.engine.camera import ZOOM_STEP
+from app.core.engine.compositor import compositor
 from app.core.engine.world import WorldManager
+from app.core.engine.world.map_cache import map_cache
+from app.core.systems.entities.npc import get_all_assets
+from app.game.base.player import PlayerSprite
+from tools import AssetManager
 from tools.audio import AudioType, audio_manager
+from tools.preloader import AssetPreloader
 
 class EngineState(BaseModel):
     """Holds the current state of the game engine"""
@@ -16,7 +23,6 @@ class Engine(BaseModel):
     """Core game engine handling basic game loop and state management"""
     state: EngineState = Field(default_factory=EngineState)
     display_surface: Optional[pygame.Surface] = Field(default=None)
-    clock: pygame.time.Clock = Field(default_factory=pygame.time.Clock)
     # * Store modules/systems that can be added to the engine
     systems: Dict[str, Any] = Field(default_factory=dict)  # * Add systems dictionary
     world_manager: Optional[WorldManager] = Field(default=None)
@@ -24,13 +30,13 @@ class Engine(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
-    def init(self, surface: pygame.Surface) -> None:
+    def init(self, surface: pygame.Surface, map_file: str = 'main-copy.tmx') -> None:
         """Initialize the engine with a display surface"""
         self.display_surface = surface
 
         self.world_manager = WorldManager()
         # self.world_manager.create_world("main", 'main-map.tmx')
-        self.world_manager.create_world("main", 'main-copy.tmx')
+        self.world_manager.create_world("main", map_file)
         # Initialize any required systems here
         def init_systems():
             # * init audio system
@@ -40,22 +46,36 @@ class Engine(BaseModel):
         init_systems()
         print(f"\033[92mEngine Initialized\033[0m")
 
+    @staticmethod
+    def queue_assets(preloader: AssetPreloader, map_file: str = 'main-copy.tmx') -> None:
+        """Queue everything `init` loads so it can be decoded in the background"""
+        preloader.queue_map(AssetManager.get_map_abs(map_file), map_cache.acquire, map_cache.release)
+        [preloader.queue_image(path) for path in PlayerSprite.asset_paths()]
+        [preloader.queue_image(AssetManager.get_image(path)) for path in get_all_assets()]
+        preloader.queue_sound("env\\env-00.mp3", AssetManager.get_audio_abs("env\\env-00.mp3"), AudioType.UI)
+
     def add_system(self, name: str, system: Any) -> None: self.systems[name] = system
 
     def get_system(self, name: str) -> Optional[Any]: return self.systems.get(name)
 
-    def update(self, dt: float) -> None:
+    def update(self, dt: float, keys: Optional[pygame.key.ScancodeWrapper] = None) -> None:
+        """Advance the simulation by one fixed step"""
         if not self.display_surface: return
         self.state.delta_time = dt # Update delta time
         [system.update(dt) for system in self.systems.values() if hasattr(system, 'update')]
+        self.world_manager.update(dt, keys)  # Update the world
 
-    def render(self) -> None:
-        """Render the current frame"""
+    def render(self, alpha: float = 1.0) -> None:
+        """Render the current frame (interpolated `alpha` between the last two steps). Presenting is up to the caller"""
         if not self.display_surface: return
 
-        # * Render all systems
-        [system.render(self.display_surface) for system in self.systems.values() if hasattr(system, 'render')]
-        pygame.display.flip()  # Flip display (update screen)
+        self.display_surface.fill((0, 0, 0))  # Clear the screen
+        self.world_manager.draw(self.display_surface, alpha)
+
+        # * Render all systems (they don't report their regions: present the whole frame)
+        renderers = [system for system in self.systems.values() if hasattr(system, 'render')]
+        [system.render(self.display_surface) for system in renderers]
+        if renderers: compositor.invalidate()
 
     def handle_keydown(self, event: pygame.event.Event) -> None:
         """Handle keyboard events"""
@@ -73,6 +93,8 @@ class Engine(BaseModel):
 
         match event.key:
             case pygame.K_i: self.world_manager.player.inventory.toggle_visibility()
+            case pygame.K_EQUALS | pygame.K_PLUS | pygame.K_KP_PLUS: self.world_manager.camera.set_zoom(self.world_manager.camera.zoom + ZOOM_STEP)
+            case pygame.K_MINUS | pygame.K_KP_MINUS: self.world_manager.camera.set_zoom(self.world_manager.camera.zoom - ZOOM_STEP)
             case pygame.K_e: 
                 if self.world_manager.npc_manager:
                     # self.world_manager.npc_manager.dialogue_system.handle_input(event)
@@ -108,21 +130,6 @@ class Engine(BaseModel):
             case 3: print("Right mouse button click")
 
 
-    def run(self) -> None:
-        """Main game loop"""
-        if not self.display_surface:
-            raise ValueError("Engine not initialized. Call initialize() first.")
-
-        dt = self.clock.tick(self.state.fps) / 1000.0
-        self.update(dt)
-        self.render()
-
-        self.display_surface.fill((0, 0, 0))  # Clear the screen
-        self.world_manager.update(dt)  # Update the world
-        self.world_manager.draw(self.display_surface)
-
-        pygame.display.flip()
-
 
     def cleanup(self) -> None:
         """Clean up engine resources"""
@@ -131,6 +138,8 @@ class Engine(BaseModel):
             if hasattr(system, 'cleanup'):
                 system.cleanup()
 
+        if self.world_manager: self.world_manager.cleanup()
+
         # Reset engine state
         self.state = EngineState()
         self.systems.clear()
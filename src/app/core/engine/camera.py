@@ -1,35 +1,71 @@
 import pygame
-from pydantic import BaseModel, Field
-from typing import Tuple
+from typing import Optional, Tuple
 
-class Camera(BaseModel):
-    position: pygame.math.Vector2 = Field(default_factory=lambda: pygame.math.Vector2(0, 0))
-    map_size: Tuple[int, int] = Field(default=(0, 0))
-    zoom: float = Field(default=1.0, gt=0.5, lt=2.0)
-    move_speed: float = Field(default=200.0)  # pixels per second
+ZOOM_STEP: float = 0.125  # * Zoom levels are multiples of this (scaled tiles keep whole pixel sizes)
+ZOOM_BOUNDS: Tuple[float, float] = (0.5, 2.0)  # * Exclusive
 
-    class Config:
-        arbitrary_types_allowed = True
+def clamp_view(value: float, map_length: float, view_length: float) -> float:
+    """Keep a view edge inside the map (a map smaller than the view is centered, like pyscroll does)"""
+    if map_length <= view_length: return (map_length - view_length) / 2
+    return max(0, min(value, map_length - view_length))
+
+class Camera:
+    __slots__ = ("position", "map_size", "zoom", "move_speed", "previous_position", "render_position")
+
+    def __init__(
+            self, position: Optional[pygame.math.Vector2] = None, map_size: Tuple[int, int] = (0, 0),
+            zoom: float = 1.0, move_speed: float = 200.0
+    ):
+        if not ZOOM_BOUNDS[0] < zoom < ZOOM_BOUNDS[1]: raise ValueError(f"Camera zoom must be within {ZOOM_BOUNDS}, got {zoom}")
+        self.position = position if position is not None else pygame.math.Vector2(0, 0)
+        self.map_size = map_size
+        self.zoom = zoom
+        self.move_speed = move_speed  # pixels per second
+        self.previous_position = pygame.math.Vector2(0, 0)  # Position at the previous simulation step
+        self.render_position = pygame.math.Vector2(0, 0)  # Interpolated position used for drawing
 
     def move(self, dx: float, dy: float, dt: float):
+        self.previous_position.update(self.position)
         # movement = pygame.math.Vector2(dx, dy) * self.move_speed
         movement = pygame.math.Vector2(dx, dy) * self.move_speed * dt
         new_position = self.position + movement
 
         screen_size = pygame.math.Vector2(pygame.display.get_surface().get_size())
-        max_x = self.map_size[0] - screen_size.x / self.zoom
-        max_y = self.map_size[1] - screen_size.y / self.zoom
-        
-        self.position.x = max(0, min(new_position.x, max_x))
-        self.position.y = max(0, min(new_position.y, max_y))
+        self.position.x = clamp_view(new_position.x, self.map_size[0], screen_size.x / self.zoom)
+        self.position.y = clamp_view(new_position.y, self.map_size[1], screen_size.y / self.zoom)
+
+    def set_zoom(self, zoom: float) -> None:
+        """Zoom around the view center (snapped to ZOOM_STEP, within the zoom bounds)"""
+        zoom = max(ZOOM_BOUNDS[0] + ZOOM_STEP, min(ZOOM_BOUNDS[1] - ZOOM_STEP, round(zoom / ZOOM_STEP) * ZOOM_STEP))
+        if zoom == self.zoom: return
+        center = self.position + pygame.math.Vector2(pygame.display.get_surface().get_size()) / (2 * self.zoom)
+        self.zoom = zoom
+        self.center_on(center)
+
+    def center_on(self, world_pos: pygame.math.Vector2) -> None:
+        """Jump (no interpolation) to center the view on a world position (e.g. after a world switch)"""
+        screen_size = pygame.math.Vector2(pygame.display.get_surface().get_size()) / self.zoom
+        self.position.x = clamp_view(world_pos[0] - screen_size.x / 2, self.map_size[0], screen_size.x)
+        self.position.y = clamp_view(world_pos[1] - screen_size.y / 2, self.map_size[1], screen_size.y)
+        self.previous_position.update(self.position)
+        self.render_position.update(self.position)
 
     def get_visible_area(self) -> pygame.Rect:
         screen_size = pygame.math.Vector2(pygame.display.get_surface().get_size())
         visible_size = screen_size / self.zoom
         return pygame.Rect(self.position, visible_size)
 
+    def interpolate(self, alpha: float = 1.0) -> None:
+        """Set the render position between the previous and the current simulation step"""
+        self.render_position = self.previous_position.lerp(self.position, min(1.0, max(0.0, alpha)))
+
+    def get_culling_area(self, margin: int = 0) -> pygame.Rect:
+        """Visible area grown by `margin` screen pixels on every side (sprites are drawn around their position)"""
+        world_margin = int(margin / self.zoom)
+        return self.get_visible_area().inflate(world_margin * 2, world_margin * 2)
+
     def world_to_screen(self, world_pos: pygame.math.Vector2) -> pygame.math.Vector2:
-        return (world_pos - self.position) * self.zoom
+        return (world_pos - self.render_position) * self.zoom
 
     def screen_to_world(self, screen_pos: pygame.math.Vector2) -> pygame.math.Vector2:
-        return (screen_pos / self.zoom) + self.position
+        return (screen_pos / self.zoom) + self.render_position
@@ -0,0 +1,174 @@
+# app/core/engine/collision.py
+from math import floor
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence, Set, Tuple
+import pygame
+
+SOLID_PROPERTIES: Tuple[str, ...] = ("solid", "collides", "collision")  # * Tile / layer properties marking a tile as solid
+SOLID_LAYERS: Tuple[str, ...] = ("Collision",)  # * Tile layers where every tile is solid
+EPSILON: float = 1e-6  # * Bounds touching a tile edge don't overlap that tile
+CHUNK_SIZE: int = 32  # * Tiles per chunk side of maps baked up front (bundles use their own chunk size)
+
+Bounds = Tuple[float, float, float, float]  # * left, top, width, height (world pixels, sub-pixel precise)
+Chunk = Tuple[int, int]
+
+
+class ChunkSource(Protocol):
+    """Anything that can provide the gids of a chunk (None while it isn't available), e.g. a MapBundle or a ChunkStreamer"""
+    def get_chunk(self, cx: int, cy: int) -> Optional[Sequence[int]]: ...
+
+
+def is_solid(properties: Optional[dict]) -> bool:
+    return bool(properties) and any(properties.get(key) for key in SOLID_PROPERTIES)
+
+
+class TileCollisionMap:
+    """Solidity of a tile map (one byte per tile, stored per chunk). Movement is swept against the few cells the bounds cross.
+    With a chunk `source` (map bundle or streamer) each chunk is baked on first touch: the map is never scanned whole"""
+    def __init__(
+            self, width: int, height: int, tilewidth: int, tileheight: int, chunk_size: int = CHUNK_SIZE,
+            source: Optional[ChunkSource] = None, max_chunks: Optional[int] = None
+    ):
+        self.width, self.height = width, height
+        self.tilewidth, self.tileheight = tilewidth, tileheight
+        self.chunk_size = chunk_size
+        self.source = source  # * Gids of the chunks to bake (None: every solid tile was set up front)
+        self.max_chunks = max_chunks  # * Baked chunks kept (None: all), oldest dropped first and baked again if needed
+        self.solid_gids: Set[int] = set()
+        self.solid_layers: List[Tuple[int, bool]] = []  # * (tile layer, every tile solid) of the layers that can block
+        self.rects: List[pygame.Rect] = []  # * Collision layer rects, applied to each chunk as it's baked
+        self._chunks: Dict[Chunk, bytearray] = {}
+        self._empty = bytes(chunk_size * chunk_size)
+        self._blocked = b"\1" * (chunk_size * chunk_size)  # * Chunk not streamed in yet: wait at its edge
+        self.bakes = 0
+
+    @classmethod
+    def from_tiled_map(cls, tiled_map, rects: Iterable[pygame.Rect] = ()) -> 'TileCollisionMap':
+        """Solid tiles (tile / layer properties) and Collision layer `rects` of a TiledMap (bundles bake chunks on demand)"""
+        bundle = tiled_map.bundle
+        collision = cls(
+            tiled_map.width, tiled_map.height, tiled_map.tilewidth, tiled_map.tileheight,
+            bundle.chunk_size if bundle else CHUNK_SIZE,
+            tiled_map.streamer or bundle, tiled_map.streamer.max_chunks if tiled_map.streamer else None
+        )
+        collision.solid_gids = {gid for gid, properties in tiled_map.tile_properties.items() if is_solid(properties)}
+        for layer, (name, properties) in enumerate(tiled_map.get_tile_layers()):
+            whole_layer = name in SOLID_LAYERS or is_solid(properties)
+            if whole_layer or collision.solid_gids: collision.solid_layers.append((layer, whole_layer))
+        collision.rects = list(rects)
+        if bundle: return collision
+
+        # * Parsed TMX (small maps): set every solid tile up front
+        for layer, whole_layer in collision.solid_layers:
+            for x0, y, row in tiled_map.iter_layer_rows(layer):
+                # * Skip rows without a single solid tile (C side set checks)
+                if whole_layer and not any(row): continue
+                if not whole_layer and collision.solid_gids.isdisjoint(row): continue
+                for i, gid in enumerate(row):
+                    if gid and (whole_layer or gid in collision.solid_gids): collision.set_solid(x0 + i, y)
+        for rect in collision.rects: collision.mark_rect(rect)
+        return collision
+
+    def get_chunk(self, cx: int, cy: int) -> Sequence[int]:
+        """Solidity of a chunk (row-major), baked from the source gids on first use"""
+        solid = self._chunks.get((cx, cy))
+        if solid is not None: return solid
+        if self.source is None: return self._empty
+        gids = self.source.get_chunk(cx, cy)
+        return self._bake(cx, cy, gids) if gids is not None else self._blocked
+
+    def _bake(self, cx: int, cy: int, gids: Sequence[int]) -> bytearray:
+        size = self.chunk_size
+        area = size * size
+        solid = bytearray(area)
+        for layer, whole_layer in self.solid_layers:
+            cells = gids[layer * area:(layer + 1) * area]
+            if whole_layer and not any(cells): continue
+            if not whole_layer and self.solid_gids.isdisjoint(cells): continue
+            for i, gid in enumerate(cells):
+                if gid and (whole_layer or gid in self.solid_gids): solid[i] = 1
+
+        x0, y0 = cx * size, cy * size
+        for rect in self.rects:
+            tx1, tx2 = max(x0, rect.left // self.tilewidth), min(x0 + size - 1, (rect.right - 1) // self.tilewidth)
+            for ty in range(max(y0, rect.top // self.tileheight), min(y0 + size - 1, (rect.bottom - 1) // self.tileheight) + 1):
+                start = (ty - y0) * size - x0
+                solid[start + tx1:start + tx2 + 1] = b"\1" * max(0, tx2 - tx1 + 1)
+
+        if self.max_chunks and len(self._chunks) >= self.max_chunks: del self._chunks[next(iter(self._chunks))]
+        self._chunks[(cx, cy)] = solid
+        self.bakes += 1
+        return solid
+
+    def set_solid(self, tx: int, ty: int, solid: bool = True) -> None:
+        """Set a tile of a map baked up front"""
+        if not (0 <= tx < self.width and 0 <= ty < self.height): return
+        cy, ly = divmod(ty, self.chunk_size)
+        cx, lx = divmod(tx, self.chunk_size)
+        chunk = self._chunks.get((cx, cy))
+        if chunk is None: chunk = self._chunks[(cx, cy)] = bytearray(self.chunk_size * self.chunk_size)
+        chunk[ly * self.chunk_size + lx] = solid
+
+    def mark_rect(self, rect: pygame.Rect) -> None:
+        """Mark every tile overlapped by a world pixel rect as solid"""
+        for ty in range(rect.top // self.tileheight, (rect.bottom - 1) // self.tileheight + 1):
+            for tx in range(rect.left // self.tilewidth, (rect.right - 1) // self.tilewidth + 1):
+                self.set_solid(tx, ty)
+
+    def is_solid(self, tx: int, ty: int) -> bool:
+        """Whether a tile blocks movement (outside the map, or in a chunk not streamed in yet, always does)"""
+        if not (0 <= tx < self.width and 0 <= ty < self.height): return True
+        cy, ly = divmod(ty, self.chunk_size)
+        cx, lx = divmod(tx, self.chunk_size)
+        chunk = self._chunks.get((cx, cy))
+        if chunk is None: chunk = self.get_chunk(cx, cy)
+        return bool(chunk[ly * self.chunk_size + lx])
+
+    def _column_blocked(self, tx: int, ty1: int, ty2: int) -> bool:
+        if not 0 <= tx < self.width: return True
+        return any(self.is_solid(tx, ty) for ty in range(ty1, ty2 + 1))
+
+    def _row_blocked(self, ty: int, tx1: int, tx2: int) -> bool:
+        if not 0 <= ty < self.height: return True
+        return any(self.is_solid(tx, ty) for tx in range(tx1, tx2 + 1))
+
+    def collides(self, bounds: Bounds) -> bool:
+        """Whether the bounds overlap a solid tile"""
+        left, top, width, height = bounds
+        ty1, ty2 = floor(top / self.tileheight), floor((top + height - EPSILON) / self.tileheight)
+        tx1, tx2 = floor(left / self.tilewidth), floor((left + width - EPSILON) / self.tilewidth)
+        return any(self._row_blocked(ty, tx1, tx2) for ty in range(ty1, ty2 + 1))
+
+    def sweep_x(self, bounds: Bounds, dx: float) -> float:
+        """Horizontal move allowed before the bounds hit a solid column (checks every column crossed: no tunneling)"""
+        if not dx: return 0.0
+        left, top, width, height = bounds
+        ty1, ty2 = floor(top / self.tileheight), floor((top + height - EPSILON) / self.tileheight)
+        if dx > 0:
+            edge = left + width
+            for tx in range(floor((edge - EPSILON) / self.tilewidth) + 1, floor((edge + dx - EPSILON) / self.tilewidth) + 1):
+                if self._column_blocked(tx, ty1, ty2): return max(0.0, tx * self.tilewidth - edge)
+        else:
+            for tx in range(floor(left / self.tilewidth) - 1, floor((left + dx) / self.tilewidth) - 1, -1):
+                if self._column_blocked(tx, ty1, ty2): return min(0.0, (tx + 1) * self.tilewidth - left)
+        return dx
+
+    def sweep_y(self, bounds: Bounds, dy: float) -> float:
+        """Vertical move allowed before the bounds hit a solid row"""
+        if not dy: return 0.0
+        left, top, width, height = bounds
+        tx1, tx2 = floor(left / self.tilewidth), floor((left + width - EPSILON) / self.tilewidth)
+        if dy > 0:
+            edge = top + height
+            for ty in range(floor((edge - EPSILON) / self.tileheight) + 1, floor((edge + dy - EPSILON) / self.tileheight) + 1):
+                if self._row_blocked(ty, tx1, tx2): return max(0.0, ty * self.tileheight - edge)
+        else:
+            for ty in range(floor(top / self.tileheight) - 1, floor((top + dy) / self.tileheight) - 1, -1):
+                if self._row_blocked(ty, tx1, tx2): return min(0.0, (ty + 1) * self.tileheight - top)
+        return dy
+
+    def move(self, bounds: Bounds, dx: float, dy: float) -> Tuple[float, float]:
+        """Resolve a move one axis at a time (slides along walls). Returns the allowed (dx, dy)"""
+        left, top, width, height = bounds
+        dx = self.sweep_x(bounds, dx)
+        dy = self.sweep_y((left + dx, top, width, height), dy)
+        return dx, dy
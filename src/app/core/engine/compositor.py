@@ -0,0 +1,69 @@
+# app/core/engine/compositor.py
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+import pygame
+
+
+class Compositor:
+    """Collects the screen regions that changed this frame and presents only those (dirty rect mode)"""
+    def __init__(self, dirty_rects: bool = False, full_ratio: float = 0.5):
+        self.enabled = dirty_rects  # * Disabled: every frame is flipped whole (what the subsystems report is ignored)
+        self.full_ratio = full_ratio  # * Past this share of the screen a single flip is cheaper than the rect updates
+        self._rects: List[pygame.Rect] = []
+        self._full = True
+        self._tracked: Dict[Hashable, Tuple[pygame.Rect, Any]] = {}  # * key -> (area, version) last presented
+        self._seen: Set[Hashable] = set()
+        self.flips = self.updates = self.idle = 0
+
+    @property
+    def dirty(self) -> bool:
+        """Whether something was reported changed so far this frame"""
+        return self._full or bool(self._rects)
+
+    def invalidate(self) -> None:
+        """The whole screen changed (camera moved, state changed, window exposed...)"""
+        self._full = True
+
+    def mark(self, rect: pygame.Rect) -> None:
+        """A screen area changed"""
+        if rect.width > 0 and rect.height > 0: self._rects.append(pygame.Rect(rect))
+
+    def track(self, key: Hashable, rect: pygame.Rect, version: Any = None) -> None:
+        """Report an element drawn this frame: its old and new areas are presented only if it moved or `version` changed"""
+        self._seen.add(key)
+        last = self._tracked.get(key)
+        if last is not None and last[0] == rect and last[1] == version: return
+        if last is not None: self.mark(last[0])
+        self.mark(rect)
+        self._tracked[key] = (pygame.Rect(rect), version)
+
+    def present(self, surface: Optional[pygame.Surface] = None) -> None:
+        """Present the frame: flip, update the dirty rects only or nothing at all if the scene is idle"""
+        surface = surface or pygame.display.get_surface()
+        # * Elements not drawn this frame leave their last area behind
+        for key in [key for key in self._tracked if key not in self._seen]: self.mark(self._tracked.pop(key)[0])
+
+        if not self.enabled or self._full or surface is None: self._flip()
+        elif self._rects:
+            screen = surface.get_rect()
+            rects = [rect.clip(screen) for rect in self._rects]
+            rects = [rect for rect in rects if rect.width and rect.height]
+            if sum(rect.width * rect.height for rect in rects) > self.full_ratio * screen.width * screen.height: self._flip()
+            elif rects:
+                pygame.display.update(rects)
+                self.updates += 1
+            else: self.idle += 1
+        else: self.idle += 1
+
+        self._rects.clear()
+        self._seen.clear()
+        self._full = False
+
+    def _flip(self) -> None:
+        pygame.display.flip()
+        self.flips += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"flips": self.flips, "updates": self.updates, "idle": self.idle, "tracked": len(self._tracked)}
+
+
+compositor = Compositor()
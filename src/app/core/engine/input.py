@@ -0,0 +1,56 @@
+# app/core/engine/input.py
+from time import perf_counter
+from typing import List, Optional
+import pygame
+from pydantic import BaseModel, Field
+
+
+class InputStats(BaseModel):
+    """Input timings and queue metrics of the last frame"""
+    queue_depth: int = Field(default=0)       # Events drained from the SDL queue this frame
+    dispatched: int = Field(default=0)        # Events left after coalescing
+    coalesced: int = Field(default=0)         # MOUSEMOTION events merged into a neighbour
+    max_wait_ms: float = Field(default=0.0)   # Time since the previous drain (upper bound of queue wait)
+    latency_ms: float = Field(default=0.0)    # Previous drain -> present (upper bound of input-to-frame latency)
+
+
+class InputQueue(BaseModel):
+    """Drains the whole event queue once per frame and coalesces redundant mouse motion"""
+    coalesce_motion: bool = Field(default=True)
+    stats: InputStats = Field(default_factory=InputStats)
+    _last_drain: Optional[float] = None
+    _drain_time: Optional[float] = None
+
+    def drain(self) -> List[pygame.event.Event]:
+        """Get every pending event (consecutive MOUSEMOTIONs merged into one)"""
+        now = perf_counter()
+        events = pygame.event.get()
+
+        self.stats.queue_depth = len(events)
+        self.stats.max_wait_ms = (now - self._last_drain) * 1000.0 if self._last_drain is not None else 0.0
+        self._last_drain, self._drain_time = now, now
+
+        if self.coalesce_motion: events = self._coalesce(events)
+        self.stats.dispatched = len(events)
+        self.stats.coalesced = self.stats.queue_depth - len(events)
+        return events
+
+    def mark_presented(self) -> None:
+        """Record the input-to-frame latency once the frame that handled the batch is presented"""
+        if self._drain_time is None: return
+        self.stats.latency_ms = self.stats.max_wait_ms + (perf_counter() - self._drain_time) * 1000.0
+        self._drain_time = None
+
+    @staticmethod
+    def _coalesce(events: List[pygame.event.Event]) -> List[pygame.event.Event]:
+        """Merge runs of MOUSEMOTION (last position, summed relative motion). Event order is preserved"""
+        merged: List[pygame.event.Event] = []
+        for event in events:
+            previous = merged[-1] if merged else None
+            if event.type == pygame.MOUSEMOTION and previous is not None and previous.type == pygame.MOUSEMOTION:
+                merged[-1] = pygame.event.Event(pygame.MOUSEMOTION, {
+                    **event.dict,
+                    "rel": tuple(a + b for a, b in zip(getattr(previous, "rel", (0, 0)), getattr(event, "rel", (0, 0)))),
+                })
+            else: merged.append(event)
+        return merged
@@ -0,0 +1,70 @@
+# app/core/engine/loop.py
+from typing import Iterator
+import pygame
+from pydantic import BaseModel, Field
+
+
+class FrameStats(BaseModel):
+    """Measured timings of the last frame"""
+    frame_ms: float = Field(default=0.0)   # Wall time between two frames (work + wait)
+    work_ms: float = Field(default=0.0)    # Time actually spent on the last frame (without the rate limit wait)
+    budget_ms: float = Field(default=0.0)  # Time available per frame at the target fps
+    fps: float = Field(default=0.0)        # Average presented fps (pygame.time.Clock.get_fps)
+    steps: int = Field(default=0)          # Simulation steps run this frame
+    dropped_ms: float = Field(default=0.0) # Simulation time thrown away to avoid a spiral of death
+
+    @property
+    def load(self) -> float:
+        """Fraction of the frame budget used by the last frame (> 1.0 means the target fps is missed)"""
+        return self.work_ms / self.budget_ms if self.budget_ms else 0.0
+
+
+class GameLoop(BaseModel):
+    """Fixed-timestep scheduler: constant simulation rate, one rate limit and one present per frame"""
+    fps: int = Field(default=72, ge=1)          # Target present rate
+    tick_rate: int = Field(default=60, ge=1)    # Simulation steps per second
+    max_steps: int = Field(default=5, ge=1)     # Max simulation steps per frame
+    clock: pygame.time.Clock = Field(default_factory=pygame.time.Clock)
+    accumulator: float = Field(default=0.0)
+    stats: FrameStats = Field(default_factory=FrameStats)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @property
+    def step_dt(self) -> float:
+        """Fixed simulation timestep (seconds)"""
+        return 1.0 / self.tick_rate
+
+    @property
+    def alpha(self) -> float:
+        """How far (0..1) the render time is between the last two simulation steps"""
+        return min(1.0, self.accumulator / self.step_dt)
+
+    def begin_frame(self) -> None:
+        """Rate limit the frame (the only clock.tick of the frame) and bank the elapsed time"""
+        frame_ms = self.clock.tick(self.fps)
+        self.stats.work_ms = self.clock.get_rawtime()
+        self.stats.frame_ms = frame_ms
+        self.stats.budget_ms = 1000.0 / self.fps
+        self.stats.fps = self.clock.get_fps()
+        self.accumulator += frame_ms / 1000.0
+
+    def steps(self) -> Iterator[float]:
+        """Yield the fixed timestep once per simulation step owed for this frame"""
+        step_dt = self.step_dt
+        self.stats.steps = 0
+        self.stats.dropped_ms = 0.0
+        while self.accumulator >= step_dt:
+            if self.stats.steps >= self.max_steps:  # * Too far behind: drop the backlog instead of catching up
+                self.stats.dropped_ms = (self.accumulator // step_dt) * step_dt * 1000.0
+                self.accumulator %= step_dt
+                break
+            self.accumulator -= step_dt
+            self.stats.steps += 1
+            yield step_dt
+
+    def reset(self) -> None:
+        """Forget banked time (e.g. after a long load so the simulation doesn't fast forward)"""
+        self.accumulator = 0.0
+        self.clock.tick()
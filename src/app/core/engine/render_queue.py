@@ -0,0 +1,52 @@
+# app/core/engine/render_queue.py
+from enum import IntEnum
+from typing import Any, Hashable, List, NamedTuple, Optional, Tuple
+import pygame
+
+from app.core.engine.compositor import compositor
+
+
+class RenderLayer(IntEnum):
+    """World draw passes (lower layers are drawn first)"""
+    GROUND = 0     # * Shadows, decals... (under every entity)
+    ENTITIES = 10  # * Actors, Y-sorted among themselves
+    OVERLAY = 20   # * Hints, markers... (over every entity)
+
+
+class RenderCommand(NamedTuple):
+    layer: int
+    sort_key: float
+    order: int  # * Submission order (ties keep it)
+    surface: pygame.Surface
+    position: Tuple[float, float]
+    track: Optional[Hashable] = None  # * Compositor key (dirty rect mode)
+    version: Any = None
+
+
+class RenderQueue:
+    """Collects the draw commands of a frame, sorts them once and flushes them in a single Surface.blits call"""
+    def __init__(self):
+        self._commands: List[RenderCommand] = []
+        self.flushed = 0  # * Commands drawn by the last flush
+
+    def submit(
+            self, layer: int, sort_key: float, surface: pygame.Surface, position: Tuple[float, float],
+            track: Optional[Hashable] = None, version: Any = None
+    ) -> None:
+        """Queue a blit. `sort_key` orders a layer (e.g. the screen y of an actor's feet)"""
+        self._commands.append(RenderCommand(layer, sort_key, len(self._commands), surface, position, track, version))
+
+    def flush(self, target: pygame.Surface) -> List[pygame.Rect]:
+        """Draw every queued command in (layer, sort_key) order and clear the queue. Returns the drawn areas"""
+        if not self._commands: return []
+        self._commands.sort(key=lambda command: (command.layer, command.sort_key, command.order))
+        rects = target.blits([(command.surface, command.position) for command in self._commands])
+        for command, rect in zip(self._commands, rects):
+            if command.track is not None: compositor.track(command.track, rect, command.version)
+        self.flushed = len(self._commands)
+        self._commands.clear()
+        return rects
+
+    def clear(self) -> None: self._commands.clear()
+
+    def __len__(self) -> int: return len(self._commands)
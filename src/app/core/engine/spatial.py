@@ -0,0 +1,135 @@
+# app/core/engine/spatial.py
+from math import floor
+from typing import Any, Dict, Generic, Iterator, List, Optional, Sequence, Set, Tuple, TypeVar
+import pygame
+
+T = TypeVar('T')
+Cell = Tuple[int, int]
+
+
+class SpatialHash(Generic[T]):
+    """Uniform grid that buckets objects by world cell for fast range & nearest queries"""
+    def __init__(self, cell_size: float = 128.0):
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, Dict[int, T]] = {}
+        # * id(obj) -> (obj, cell, position); positions are kept by reference, call move() after they change
+        self._entries: Dict[int, Tuple[T, Cell, pygame.math.Vector2]] = {}
+
+    def cell_of(self, x: float, y: float) -> Cell:
+        return floor(x / self.cell_size), floor(y / self.cell_size)
+
+    def insert(self, obj: T, position: pygame.math.Vector2) -> None:
+        """Register an object (or move it if it's already registered)"""
+        if id(obj) in self._entries: return self.move(obj, position)
+        cell = self.cell_of(*position)
+        self._cells.setdefault(cell, {})[id(obj)] = obj
+        self._entries[id(obj)] = (obj, cell, position)
+
+    def move(self, obj: T, position: pygame.math.Vector2) -> None:
+        """Update an object's position, re-bucketing it only when it changes cell"""
+        entry = self._entries.get(id(obj))
+        if entry is None: return self.insert(obj, position)
+        cell = self.cell_of(*position)
+        if cell != entry[1]:
+            self._discard(id(obj), entry[1])
+            self._cells.setdefault(cell, {})[id(obj)] = obj
+        self._entries[id(obj)] = (obj, cell, position)
+
+    def remove(self, obj: T) -> None:
+        entry = self._entries.pop(id(obj), None)
+        if entry: self._discard(id(obj), entry[1])
+
+    def _discard(self, key: int, cell: Cell) -> None:
+        bucket = self._cells.get(cell)
+        if bucket is None: return
+        bucket.pop(key, None)
+        if not bucket: del self._cells[cell]
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._entries.clear()
+
+    def _iter_cells(self, left: float, top: float, right: float, bottom: float) -> Iterator[Dict[int, T]]:
+        min_cx, min_cy = self.cell_of(left, top)
+        max_cx, max_cy = self.cell_of(right, bottom)
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket: yield bucket
+
+    def query_rect(self, rect: pygame.Rect) -> List[T]:
+        """Get every object whose position lies inside `rect`"""
+        found: List[T] = []
+        for bucket in self._iter_cells(rect.left, rect.top, rect.right, rect.bottom):
+            for key, obj in bucket.items():
+                x, y = self._entries[key][2]
+                if rect.left <= x < rect.right and rect.top <= y < rect.bottom:
+                    found.append(obj)
+        return found
+
+    def nearest(self, position: pygame.math.Vector2, max_distance: float) -> Tuple[Optional[T], float]:
+        """Get the closest object within `max_distance` (and its distance) or (None, inf)"""
+        x, y = position
+        best: Optional[T] = None
+        best_sq = max_distance * max_distance
+        for bucket in self._iter_cells(x - max_distance, y - max_distance, x + max_distance, y + max_distance):
+            for key, obj in bucket.items():
+                ox, oy = self._entries[key][2]
+                dist_sq = (ox - x) ** 2 + (oy - y) ** 2
+                if dist_sq < best_sq or (best is None and dist_sq == best_sq):
+                    best, best_sq = obj, dist_sq
+        return (best, best_sq ** 0.5) if best is not None else (None, float("inf"))
+
+    def __len__(self) -> int: return len(self._entries)
+
+    def __contains__(self, obj: Any) -> bool: return id(obj) in self._entries
+
+
+class StaticRectIndex:
+    """Immutable set of rects (e.g. map collision geometry) bucketed by grid cell for fast overlap queries"""
+    def __init__(self, rects: Sequence[pygame.Rect] = (), cell_size: float = 128.0):
+        self.cell_size = cell_size
+        self.rects: List[pygame.Rect] = [pygame.Rect(rect) for rect in rects]
+        self._cells: Dict[Cell, List[int]] = {}  # * cell -> indices into self.rects
+        self._cell_rects: Dict[Cell, List[pygame.Rect]] = {}  # * cell -> rects (for the C side Rect.collidelist)
+        for index, rect in enumerate(self.rects):
+            for cell in self._cells_of(rect):
+                self._cells.setdefault(cell, []).append(index)
+                self._cell_rects.setdefault(cell, []).append(rect)
+
+    def _cells_of(self, rect: pygame.Rect) -> Iterator[Cell]:
+        min_cx, min_cy = floor(rect.left / self.cell_size), floor(rect.top / self.cell_size)
+        max_cx, max_cy = floor((rect.right - 1) / self.cell_size), floor((rect.bottom - 1) / self.cell_size)
+        for cx in range(min_cx, max(min_cx, max_cx) + 1):
+            for cy in range(min_cy, max(min_cy, max_cy) + 1):
+                yield cx, cy
+
+    def _candidates(self, rect: pygame.Rect) -> List[int]:
+        """Indices of the rects sharing a cell with `rect` (sorted, no duplicates)"""
+        found: Set[int] = set()
+        for cell in self._cells_of(rect):
+            bucket = self._cells.get(cell)
+            if bucket: found.update(bucket)
+        return sorted(found)
+
+    def collidelistall(self, rect: pygame.Rect) -> List[int]:
+        """Indices (into `rects`) of every rect overlapping `rect` (same semantics as Rect.collidelistall)"""
+        return [index for index in self._candidates(rect) if rect.colliderect(self.rects[index])]
+
+    def query(self, rect: pygame.Rect) -> List[pygame.Rect]:
+        """Every rect overlapping `rect`"""
+        return [self.rects[index] for index in self.collidelistall(rect)]
+
+    def collides(self, rect: pygame.Rect) -> bool:
+        """Whether `rect` overlaps any rect (stops at the first hit)"""
+        size = self.cell_size
+        cx, cy = floor(rect.left / size), floor(rect.top / size)
+        if cx == floor((rect.right - 1) / size) and cy == floor((rect.bottom - 1) / size):
+            bucket = self._cell_rects.get((cx, cy))  # * Common case: an actor inside a single cell
+            return bool(bucket) and rect.collidelist(bucket) != -1
+        for cell in self._cells_of(rect):
+            bucket = self._cell_rects.get(cell)
+            if bucket and rect.collidelist(bucket) != -1: return True
+        return False
+
+    def __len__(self) -> int: return len(self.rects)
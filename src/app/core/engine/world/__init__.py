@@ -1,32 +1,62 @@
 # app/core/engine/world.py
-from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
 import pygame
 from pydantic import BaseModel, Field
 
 from app.core.engine.camera import Camera
+from app.core.engine.collision import TileCollisionMap
+from app.core.engine.compositor import compositor
+from app.core.engine.render_queue import RenderQueue
+from app.core.engine.spatial import StaticRectIndex
+from app.core.engine.world.map_cache import map_cache
 from app.core.engine.world.tiled_map import TiledMap
+from app.core.systems.entities.npc import NPC, NPCType
 from app.core.systems.entities.npc_manager import NPCManager
 from app.game.base.player import Player
 from tools import AssetManager
+from tools.preloader import asset_preloader
+from tools.profiler import frame_profiler
+
+class Portal(BaseModel):
+    """Area of a map leading to another one: a 'Portal' or 'Door' object with a `map` and an optional `spawn` property"""
+    rect: pygame.Rect
+    target_map: str
+    spawn: Optional[str] = None  # * Object of the target map to arrive at (default: its spawn point)
+
+    class Config:
+        arbitrary_types_allowed = True
+
 
 class World(BaseModel):
     map_file: str
     tiled_map: Optional[TiledMap] = None
     size: pygame.math.Vector2 = Field(default_factory=lambda: pygame.math.Vector2(0, 0))
     tile_size: pygame.math.Vector2 = Field(default_factory=lambda: pygame.math.Vector2(16, 16))
+    # * Static map queries, precomputed once at load
+    collision_index: StaticRectIndex = Field(default_factory=StaticRectIndex)
+    collision_map: Optional[TileCollisionMap] = None  # * Solid tiles (tile properties + Collision layer) for movement
+    objects_by_name: Dict[str, Any] = Field(default_factory=dict)
+    objects_by_type: Dict[str, List[Any]] = Field(default_factory=dict)
+    portals: List[Portal] = Field(default_factory=list)
+    npc_manager: Optional[NPCManager] = None  # * NPCs, hints and dialogue living in this world
 
     class Config:
         arbitrary_types_allowed = True
 
-    def __init__(self, **data):
+    def __init__(self, saved_state: Optional[Dict[str, Any]] = None, **data):
         super().__init__(**data)
         self.load_map()
+        self.build_indexes()
+        # * Back where they were when the world was unloaded, or as placed on the map on the first visit
+        if saved_state and "npcs" in saved_state: self.npc_manager = NPCManager.from_state(saved_state)
+        else: self.npc_manager = NPCManager(npcs=self.spawn_npcs())
 
     def load_map(self) -> None:
         """Load the TMX map file"""
         try:
             map_path = AssetManager.get_map_abs(self.map_file)
-            self.tiled_map = TiledMap(filename=map_path)
+            self.tiled_map = TiledMap(filename=map_path, bundle=asset_preloader.take_map(map_path))
             
             # Update world size based on map
             self.size.x = self.tiled_map.width
@@ -44,6 +74,14 @@ class World(BaseModel):
             print(f"Error loading map: {e}")
             self.tiled_map = None
 
+    def stream(self, view: pygame.Rect, block: bool = False) -> None:
+        """Keep the map chunks around `view` (world pixels) resident (streamed maps only)"""
+        if self.tiled_map: self.tiled_map.update_view(view, block)
+
+    def unload(self) -> None:
+        if self.npc_manager: self.npc_manager.clear()
+        if self.tiled_map: self.tiled_map.close()
+
     def update(self, dt: float) -> None:
         """Update world state"""
         if not self.tiled_map:
@@ -52,124 +90,273 @@ class World(BaseModel):
         if self.tiled_map.group:
             self.tiled_map.group.update(dt)
 
-    def draw(self, surface: pygame.Surface, camera: Camera) -> None:
-        """Draw the world with camera position"""
-        if not self.tiled_map or not self.tiled_map.group:
-            return
+    def build_indexes(self) -> None:
+        """Precompute the collision geometry and the object lookup tables (the map is static)"""
+        collision_rects = []
+        self.objects_by_name, self.objects_by_type = {}, {}
+        if self.tiled_map:
+            # Get collision objects from map
+            for obj in self.tiled_map.get_object_layer('Collision') or []:
+                if hasattr(obj, 'width') and hasattr(obj, 'height'):
+                    collision_rects.append(pygame.Rect(obj.x, obj.y, obj.width, obj.height))
+
+            # * 'Objects' layer lookups (spawn points, doors...)
+            for obj in self.tiled_map.get_object_layer('Objects') or []:
+                if obj.name: self.objects_by_name.setdefault(obj.name, obj)
+                if obj.type: self.objects_by_type.setdefault(obj.type, []).append(obj)
+
+        self.portals = [
+            Portal(rect=pygame.Rect(obj.x, obj.y, max(1, obj.width), max(1, obj.height)),
+                   target_map=obj.properties['map'], spawn=obj.properties.get('spawn'))
+            for obj in self.get_objects('Portal') + self.get_objects('Door') if obj.properties.get('map')
+        ]
+
+        self.collision_index = StaticRectIndex(collision_rects, cell_size=4 * max(self.tile_size.x, self.tile_size.y))
+        if self.tiled_map: self.collision_map = TileCollisionMap.from_tiled_map(self.tiled_map, collision_rects)
+
+    def spawn_npcs(self) -> List[NPC]:
+        """NPCs placed on the map: 'NPC' objects with an `npc_type` (NPCType name) and comma separated `dialogue` keys"""
+        return [
+            NPC(
+                position=pygame.math.Vector2(obj.x, obj.y),
+                npc_type=NPCType.__members__.get(obj.properties.get('npc_type', ''), NPCType.CIVILIAN),
+                dialogue_keys=[key.strip() for key in obj.properties.get('dialogue', '').split(',') if key.strip()]
+            ) for obj in self.get_objects('NPC')
+        ]
+
+    def get_spawn_point(self, name: Optional[str] = None) -> Tuple[float, float]:
+        """Get player spawn point from map (the center of the object called `name` if given)"""
+        spawn = self.objects_by_name.get(name) if name else None
+        if spawn: return float(spawn.x + spawn.width / 2), float(spawn.y + spawn.height / 2)
+        spawns = self.objects_by_type.get('Spawn')
+        if spawns: return float(spawns[0].x), float(spawns[0].y)
+        return 300.0, 300.0  # Default if no spawn point found
 
-        # Get camera position and screen size
-        cam_x, cam_y = camera.position
-        cam_width, cam_height = surface.get_size()
+    def get_object(self, name: str) -> Optional[Any]:
+        """Get an object of the 'Objects' layer by name"""
+        return self.objects_by_name.get(name)
 
-        # Update map layer size and center position
-        self.tiled_map.group._map_layer.set_size((cam_width, cam_height))
-        self.tiled_map.group.center((cam_x + cam_width // 2, cam_y + cam_height // 2))
-        
-        # Draw the map
-        self.tiled_map.group.draw(surface)
+    def get_objects(self, object_type: str) -> List[Any]:
+        """Get every object of the 'Objects' layer of a type"""
+        return self.objects_by_type.get(object_type, [])
 
-    def get_spawn_point(self) -> Tuple[float, float]:
-        """Get player spawn point from map"""
-        if not self.tiled_map:
-            return 300.0, 300.0  # Default spawn point
-            
-        # Try to find spawn point in map objects
-        object_layer = self.tiled_map.get_object_layer('Objects')
-        if object_layer:
-            for obj in object_layer:
-                if obj.type == 'Spawn':
-                    return float(obj.x), float(obj.y)
-                    
-        return 300.0, 300.0  # Default if no spawn point found
+    def get_portal(self, rect: pygame.Rect) -> Optional[Portal]:
+        """Get the portal overlapping `rect` (if any)"""
+        return next((portal for portal in self.portals if portal.rect.colliderect(rect)), None)
+
+    @property
+    def neighbor_maps(self) -> Set[str]:
+        """Map files reachable through this world's portals"""
+        return {portal.target_map for portal in self.portals}
 
     def get_collision_rects(self) -> List[pygame.Rect]:
-        """Get collision rectangles from map"""
-        collision_rects = []
-        
-        if not self.tiled_map:
-            return collision_rects
-            
-        # Get collision objects from map
-        object_layer = self.tiled_map.get_object_layer('Collision')
-        if object_layer:
-            for obj in object_layer:
-                if hasattr(obj, 'width') and hasattr(obj, 'height'):
-                    rect = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
-                    collision_rects.append(rect)
-                    
-        return collision_rects
+        """Get collision rectangles from map (precomputed, don't mutate them)"""
+        return self.collision_index.rects
+
+    def get_collisions(self, rect: pygame.Rect) -> List[pygame.Rect]:
+        """Get the collision rectangles overlapping `rect`"""
+        return self.collision_index.query(rect)
+
+    def collides(self, rect: pygame.Rect) -> bool:
+        """Whether `rect` overlaps any collision rectangle"""
+        return self.collision_index.collides(rect)
 
 # ========================== WorldManager Class ==========================
 
 class WorldManager(BaseModel):
     """Manages game worlds, camera, player, and debug UI"""
-    worlds: Dict[str, World] = Field(default_factory=dict)
+    worlds: Dict[str, World] = Field(default_factory=dict)  # * Resident worlds, least recently used first
+    world_files: Dict[str, str] = Field(default_factory=dict)  # * Every known world (resident or not) -> map file
+    # * State of the worlds left behind: player position, plus the NPCs and hints of the unloaded ones
+    saved_states: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    max_resident: int = Field(default=3, ge=1)  # * Current world + recently used ones kept loaded
     current_world: Optional[World] = Field(default=None)
+    current_name: Optional[str] = Field(default=None)
     camera: Camera = Field(default_factory=Camera)
     player: Player = Field(default_factory=Player)
     # debug_ui: Optional[DebugUI] = Field(default=None)
-    npc_manager: Optional[NPCManager] = Field(default=None)
+    cull_margin: int = Field(default=128)  # * Screen pixels around the view still considered visible (scaled sprite bounds)
+    render_queue: RenderQueue = Field(default_factory=RenderQueue)  # * World sprites of the frame (depth sorted, one blits call)
     # interaction_menu: InteractionMenu = Field(default_factory=InteractionMenu)
+    _prefetched: Set[str] = set()  # * Map paths queued in the preloader for the current world's neighbors
+    _portal_lock: Optional[Portal] = None  # * Portal the player arrived on (ignored until the player leaves it)
 
     class Config:
         arbitrary_types_allowed = True
 
-    def __init__(self, **data):
-        super().__init__(**data)
+    @property
+    def npc_manager(self) -> Optional[NPCManager]:
+        """NPCs, hints and dialogue of the current world"""
+        return self.current_world.npc_manager if self.current_world else None
 
-        # * Initialize debug UI
-        self.npc_manager = NPCManager()
+    def cleanup(self) -> None:
+        """Release the assets held by the player and the NPCs"""
+        self.player.release_assets()
+        for name in list(self.worlds): self.unload_world(name)
+        self._drop_prefetched(set())
 
     def create_world(self, name: str, map_file: str) -> None:
-        new_world = World(map_file=map_file)
-        self.worlds[name] = new_world
+        self.world_files[name] = map_file
+        new_world = self.get_world(name)
         if self.current_world is None:
-            self.current_world = new_world
+            self.current_world, self.current_name = new_world, name
             self.camera.map_size = (
                 new_world.tiled_map.pixel_width,
                 new_world.tiled_map.pixel_height
             )
             self.player.position = pygame.math.Vector2(300, 300)
-
-    def update(self, dt: float):
+            self.player.collision = new_world.collision_map
+            if not new_world.npc_manager.npcs and name not in self.saved_states: new_world.npc_manager.add_test_npcs()
+            new_world.stream(self.camera.get_culling_area(self.cull_margin), block=True)  # * No blank first frame
+            self.prefetch_neighbors()
+
+    # ^ World residency ------------------------------------------------------------------------
+
+    def get_world(self, name: str) -> World:
+        """Get a world (loading it if it isn't resident) and mark it as the most recently used"""
+        world = self.worlds.pop(name, None)
+        if world is None: world = World(map_file=self.world_files[name], saved_state=self.saved_states.get(name))
+        self.worlds[name] = world
+        self._evict()
+        return world
+
+    def unload_world(self, name: str) -> None:
+        """Drop a resident world (its map buffers and its bundle reference), saving its NPCs and hints for the next visit"""
+        world = self.worlds.pop(name, None)
+        if world is None: return
+        if world.npc_manager: self.saved_states.setdefault(name, {}).update(world.npc_manager.get_state())
+        world.unload()
+        print(f"World unloaded: {name}")
+
+    def _evict(self) -> None:
+        """Unload the least recently used worlds beyond `max_resident` (never the current or the most recent one)"""
+        for name in list(self.worlds)[:-1]:
+            if len(self.worlds) <= self.max_resident: break
+            if self.worlds[name] is not self.current_world: self.unload_world(name)
+
+    def world_name(self, map_file: str) -> str:
+        """Name of the world of a map file (registered under the file stem if unknown)"""
+        for name, file in self.world_files.items():
+            if file == map_file: return name
+        name = Path(map_file).stem
+        self.world_files[name] = map_file
+        return name
+
+    def switch_world(self, name: str, spawn: Optional[str] = None) -> bool:
+        """Make another world current, placing the player at `spawn` (or where they left it). Returns False if it can't load"""
+        if name == self.current_name: return True
+        world = self.get_world(name)
+        if not world.tiled_map:
+            self.unload_world(name)
+            return False
+
+        if self.current_name: self.saved_states.setdefault(self.current_name, {})["player_position"] = tuple(self.player.position)
+        saved = self.saved_states.get(name, {})
+        self.current_world, self.current_name = world, name
+
+        if spawn or "player_position" not in saved: self.player.position = pygame.math.Vector2(world.get_spawn_point(spawn))
+        else: self.player.position = pygame.math.Vector2(saved["player_position"])
+        self.player.snapshot()
+        self.player.collision = world.collision_map
+        self._portal_lock = world.get_portal(self._player_rect())  # * Don't bounce straight back
+
+        self.camera.map_size = (world.tiled_map.pixel_width, world.tiled_map.pixel_height)
+        self.camera.center_on(self.player.position)
+        world.stream(self.camera.get_culling_area(self.cull_margin), block=True)
+        compositor.invalidate()
+        self._evict()
+        self.prefetch_neighbors()
+        print(f"World switched to: {name}")
+        return True
+
+    def prefetch_neighbors(self) -> None:
+        """Load the maps reachable from the current world in the background (and drop the ones no longer reachable)"""
+        resident = {world.map_file for world in self.worlds.values()}
+        wanted = {
+            AssetManager.get_map_abs(map_file) for map_file in self.current_world.neighbor_maps if map_file not in resident
+        } if self.current_world else set()
+        self._drop_prefetched(wanted)
+        for path in wanted - self._prefetched: asset_preloader.queue_map(path, map_cache.acquire, map_cache.release)
+        self._prefetched = wanted
+
+    def _drop_prefetched(self, keep: Set[str]) -> None:
+        for path in self._prefetched - keep:
+            bundle = asset_preloader.take_map(path)
+            if bundle is not None: map_cache.release(bundle)
+
+    def _player_rect(self) -> pygame.Rect:
+        left, top, width, height = self.player.get_bounds()
+        return pygame.Rect(int(left), int(top), int(width), int(height))
+
+    def _check_portals(self) -> None:
+        """Travel through the portal the player stepped on"""
+        portal = self.current_world.get_portal(self._player_rect())
+        if portal is not None and portal is self._portal_lock: return
+        self._portal_lock = None
+        if portal is not None and not self.switch_world(self.world_name(portal.target_map), portal.spawn):
+            print(f"Portal target unavailable: {portal.target_map}")
+            self._portal_lock = portal
+
+    def update(self, dt: float, keys: Optional[pygame.key.ScancodeWrapper] = None):
         if not self.current_world: return
 
-        # Handle keyboard input
-        keys = pygame.key.get_pressed()
-        # self.player.update(dt, keys, self.current_world.get_collision_rects())
-        self.player.update(dt, keys)
+        # Handle keyboard input (keys can be injected, e.g. scripted input for benchmarks)
+        if keys is None: keys = pygame.key.get_pressed()
+        with frame_profiler.section("update.player"):
+            self.player.update(dt, keys)
+            if self.current_world.portals: self._check_portals()
 
-        camera_dx = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
-        camera_dy = keys[pygame.K_DOWN] - keys[pygame.K_UP]
-        speed_multiplier = 4 if (keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]) else 1.5
-        self.camera.move(camera_dx * speed_multiplier, camera_dy * speed_multiplier, dt)
+        with frame_profiler.section("update.camera"):
+            camera_dx = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
+            camera_dy = keys[pygame.K_DOWN] - keys[pygame.K_UP]
+            speed_multiplier = 4 if (keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]) else 1.5
+            self.camera.move(camera_dx * speed_multiplier, camera_dy * speed_multiplier, dt)
 
         # ^ Update world
-        self.current_world.update(dt)
+        with frame_profiler.section("update.world"):
+            if not asset_preloader.done: asset_preloader.poll()  # * Neighbor maps loading (or to release) in the background
+            self.current_world.stream(self.camera.get_culling_area(self.cull_margin))
+            self.current_world.update(dt)
 
         # Update NPC manager
         if self.npc_manager:
-            self.npc_manager.update(dt, self.player.position)
+            with frame_profiler.section("update.npcs"):
+                self.npc_manager.update(dt, self.player.position, self.camera.get_culling_area(self.cull_margin))
 
-    def draw(self, surface: pygame.Surface):
+    def draw(self, surface: pygame.Surface, alpha: float = 1.0):
         if not self.current_world or not self.current_world.tiled_map:
             return
 
-        cam_x, cam_y = self.camera.position
+        self.camera.interpolate(alpha)  # * Draw between the last two simulation steps
+        cam_x, cam_y = self.camera.render_position
         cam_width, cam_height = surface.get_size()
+        zoom = self.camera.zoom
 
-        self.current_world.tiled_map.group._map_layer.set_size((cam_width, cam_height))
-        self.current_world.tiled_map.group.center((cam_x + cam_width // 2, cam_y + cam_height // 2))
-        self.current_world.tiled_map.group.draw(surface)
+        with frame_profiler.section("draw.map"):
+            if self.current_world.tiled_map.draw(surface, (cam_x + cam_width / zoom / 2, cam_y + cam_height / zoom / 2), zoom):
+                compositor.invalidate()  # * Scrolled (or animated): every pixel changed
 
-        self.player.draw(surface, self.camera)
+        # ^ Queue the world sprites: the player is Y-sorted among the NPCs, hints go over every actor
+        visible_area = self.camera.get_culling_area(self.cull_margin)
+        with frame_profiler.section("draw.player"):
+            if visible_area.collidepoint(self.player.position):
+                self.player.draw(surface, self.camera, alpha, self.render_queue)
 
-        # Draw NPCs and interaction hints
-        if self.npc_manager: self.npc_manager.draw(surface, self.camera)
+        if self.npc_manager:
+            with frame_profiler.section("draw.npcs"):
+                self.npc_manager.draw(surface, self.camera, visible_area, alpha, self.render_queue)
+
+        with frame_profiler.section("draw.sprites"):
+            self.render_queue.flush(surface)
+
+        if self.npc_manager:
+            with frame_profiler.section("draw.dialogue"):
+                self.npc_manager.draw_dialogue(surface)
 
         # Draw inventory
-        self.player.reputation.draw(surface, (10, 10))
-        self.player.inventory.draw(surface)
+        with frame_profiler.section("draw.hud"):
+            self.player.reputation.draw(surface, (10, 10))
+            self.player.inventory.draw(surface)
 
     # # ? Debug UI methods ----------------------------------------------------------------------
 
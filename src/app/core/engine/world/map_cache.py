@@ -0,0 +1,346 @@
+# app/core/engine/world/map_cache.py
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import pygame
+import pytmx
+from pyscroll.common import rect_to_bb
+from pyscroll.data import PyscrollDataAdapter
+from pytmx.util_pygame import handle_transformation
+
+from app.core.engine.collision import Chunk, ChunkSource
+from tools import image_cache
+
+# * Bundle layout: header | JSON metadata | padding (4 bytes aligned) | chunks
+# * Chunks are stored row by row; a chunk holds, for every tile layer, CHUNK_SIZE² uint32 gids (row-major,
+# * zero padded on the map edges), so any chunk can be read (or paged in) with a single contiguous read
+MAGIC = b"PDMB"
+VERSION = 2
+HEADER = struct.Struct("<4sII")  # magic, version, metadata length
+CHUNK_SIZE = 32  # Tiles per chunk side
+CACHE_DIR = ".cache"  # * Next to the maps: assets/maps/.cache/<map>.pdmb
+
+@dataclass
+class MapObject:
+    """Plain object of an object layer (same attributes as the pytmx.TiledObject the game reads)"""
+    name: Optional[str] = None
+    type: Optional[str] = None
+    x: float = 0.0
+    y: float = 0.0
+    width: float = 0.0
+    height: float = 0.0
+    gid: int = 0
+    properties: Dict[str, Any] = field(default_factory=dict)
+
+
+def _flags_to_int(flags) -> int:
+    if not flags: return 0
+    return flags.flipped_horizontally | flags.flipped_vertically << 1 | flags.flipped_diagonally << 2
+
+
+def _int_to_flags(value: int) -> pytmx.TileFlags:
+    return pytmx.TileFlags(bool(value & 1), bool(value & 2), bool(value & 4))
+
+
+def _json_safe(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the properties that survive a JSON round trip (animation frames as [gid, duration] pairs)"""
+    safe = {}
+    for key, value in properties.items():
+        if key == "frames": value = [[frame.gid, frame.duration] for frame in value]
+        try: json.dumps(value)
+        except TypeError: continue
+        safe[key] = value
+    return safe
+
+
+def bundle_path(tmx_path: Union[Path, str]) -> Path:
+    tmx_path = Path(tmx_path)
+    return tmx_path.parent / CACHE_DIR / f"{tmx_path.stem}.pdmb"
+
+
+def compile_map(tmx_path: Union[Path, str], output: Optional[Union[Path, str]] = None) -> Path:
+    """Compile a .tmx (and its tilesets) into a binary map bundle. Returns the bundle path"""
+    tmx_path = Path(tmx_path).resolve()
+    output = Path(output) if output else bundle_path(tmx_path)
+    root = tmx_path.parent
+
+    # * Parse without decoding any image: the loader only records (file, colorkey, rect, flags) per gid
+    def index_loader(filename: str, colorkey: Optional[str], **kwargs):
+        return lambda rect=None, flags=None: (filename, colorkey, rect, flags)
+    tmx = pytmx.TiledMap(str(tmx_path), image_loader=index_loader)
+
+    images: List[str] = []
+    tiles: List[Optional[list]] = []
+    for tile in tmx.images:
+        if not tile:
+            tiles.append(None)
+            continue
+        filename, colorkey, rect, flags = tile
+        source = os.path.relpath(os.path.normpath(filename), root)
+        if source not in images: images.append(source)
+        tiles.append([images.index(source), colorkey, list(rect) if rect else None, _flags_to_int(flags)])
+
+    tile_layers = [layer for layer in tmx.layers if isinstance(layer, pytmx.TiledTileLayer)]
+    layers = [{"name": layer.name, "visible": bool(layer.visible), "properties": _json_safe(layer.properties)} for layer in tile_layers]
+
+    objects = {
+        group.name: [
+            {
+                "name": obj.name, "type": obj.type, "x": obj.x, "y": obj.y,
+                "width": obj.width, "height": obj.height, "gid": obj.gid,
+                "properties": _json_safe(obj.properties)
+            } for obj in group
+        ] for group in tmx.objectgroups
+    }
+    dependencies = [str(tmx_path)] + [os.path.normpath(root / ts.source) for ts in tmx.tilesets if ts.source]
+    meta = json.dumps({
+        "byteorder": sys.byteorder,
+        "dependencies": [os.path.relpath(path, root) for path in dependencies],
+        "width": tmx.width, "height": tmx.height,
+        "tilewidth": tmx.tilewidth, "tileheight": tmx.tileheight,
+        "chunk_size": CHUNK_SIZE,
+        "layers": layers,
+        "images": images,
+        "tiles": tiles,
+        "tile_properties": {str(gid): _json_safe(props) for gid, props in tmx.tile_properties.items()},
+        "objects": objects,
+    }).encode("utf-8")
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    temp = output.with_suffix(".tmp")
+    with open(temp, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(meta)))
+        file.write(meta)
+        file.write(b"\0" * (-(HEADER.size + len(meta)) % 4))
+        for cy in range(0, tmx.height, CHUNK_SIZE):
+            for cx in range(0, tmx.width, CHUNK_SIZE):
+                chunk = array("I", [0]) * (len(tile_layers) * CHUNK_SIZE * CHUNK_SIZE)
+                for l, layer in enumerate(tile_layers):
+                    for ly, row in enumerate(layer.data[cy:cy + CHUNK_SIZE]):
+                        start = (l * CHUNK_SIZE + ly) * CHUNK_SIZE
+                        chunk[start:start + len(row[cx:cx + CHUNK_SIZE])] = array("I", row[cx:cx + CHUNK_SIZE])
+                chunk.tofile(file)
+    os.replace(temp, output)  # * Never leave a half written bundle behind
+    return output
+
+
+class MapBundle:
+    """Map bundle: metadata in memory, chunks read straight from the memory-mapped file pages"""
+    def __init__(self, path: Union[Path, str], root: Union[Path, str]):
+        self.path = Path(path)
+        self.root = Path(root)
+        with open(self.path, "rb") as file:
+            magic, version, meta_len = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION: raise ValueError(f"Not a v{VERSION} map bundle: {self.path}")
+            meta = json.loads(file.read(meta_len))
+        if meta["byteorder"] != sys.byteorder: raise ValueError(f"Map bundle byte order mismatch: {self.path}")
+
+        self.width: int = meta["width"]
+        self.height: int = meta["height"]
+        self.tilewidth: int = meta["tilewidth"]
+        self.tileheight: int = meta["tileheight"]
+        self.chunk_size: int = meta["chunk_size"]
+        self.chunks_x: int = -(-self.width // self.chunk_size)
+        self.chunks_y: int = -(-self.height // self.chunk_size)
+        self.layer_names: List[str] = [layer["name"] for layer in meta["layers"]]
+        self.visible_layers: List[int] = [i for i, layer in enumerate(meta["layers"]) if layer["visible"]]
+        self.layer_properties: List[Dict[str, Any]] = [layer["properties"] for layer in meta["layers"]]
+        self.image_paths: List[str] = [str(self.root / image) for image in meta["images"]]
+        self.tiles: List[Optional[list]] = meta["tiles"]
+        self.tile_properties: Dict[int, Dict[str, Any]] = {int(gid): props for gid, props in meta["tile_properties"].items()}
+        self.objects: Dict[str, List[MapObject]] = {
+            name: [MapObject(**obj) for obj in group] for name, group in meta["objects"].items()
+        }
+
+        self.data_start = HEADER.size + meta_len + (-(HEADER.size + meta_len) % 4)
+        self.chunk_length = len(self.layer_names) * self.chunk_size * self.chunk_size  # * gids per chunk
+        self._gids: Optional[memoryview] = None  # * Whole chunk area, mapped on first use (streamed maps never map it)
+        self._mmap: Optional[mmap.mmap] = None
+        self._images: Dict[int, Optional[pygame.Surface]] = {}
+
+    def chunk_offset(self, cx: int, cy: int) -> int:
+        """File offset of a chunk"""
+        return self.data_start + (cy * self.chunks_x + cx) * self.chunk_length * 4
+
+    def get_chunk(self, cx: int, cy: int) -> Optional[memoryview]:
+        """Get the gids of a chunk as a zero-copy view of the mapped file (None outside the map)"""
+        if not (0 <= cx < self.chunks_x and 0 <= cy < self.chunks_y): return None
+        if self._gids is None:
+            with open(self.path, "rb") as file:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._gids = memoryview(self._mmap)[self.data_start:].cast("I")
+        start = (cy * self.chunks_x + cx) * self.chunk_length
+        return self._gids[start:start + self.chunk_length]
+
+    def get_gid(self, x: int, y: int, layer: int, chunks: Optional[ChunkSource] = None) -> int:
+        """Get the gid of a tile, read from `chunks` (default: this bundle). 0 when out of the map or not loaded"""
+        if not (0 <= x < self.width and 0 <= y < self.height): return 0
+        cx, lx = divmod(x, self.chunk_size)
+        cy, ly = divmod(y, self.chunk_size)
+        chunk = (chunks or self).get_chunk(cx, cy)
+        return chunk[(layer * self.chunk_size + ly) * self.chunk_size + lx] if chunk is not None else 0
+
+    def get_tile_image_by_gid(self, gid: int) -> Optional[pygame.Surface]:
+        """Get a tile surface (cut from the shared tileset image on first use)"""
+        if not gid: return None
+        image = self._images.get(gid)
+        if image is None and gid not in self._images:
+            image = self._images[gid] = self._build_tile(gid)
+        return image
+
+    def _build_tile(self, gid: int) -> Optional[pygame.Surface]:
+        tile = self.tiles[gid] if gid < len(self.tiles) else None
+        if tile is None: return None
+        image_index, colorkey, rect, flags = tile
+        sheet = image_cache.get(self.image_paths[image_index])
+        surface = sheet.subsurface(rect) if rect else sheet
+        if flags: surface = handle_transformation(surface, _int_to_flags(flags))
+        if colorkey:
+            surface = surface.convert()
+            surface.set_colorkey(pygame.Color(f"#{colorkey}"), pygame.RLEACCEL)
+        return surface
+
+    def get_tile_properties(self, x: int, y: int, layer: int, chunks: Optional[ChunkSource] = None) -> Dict[str, Any]:
+        return self.tile_properties.get(self.get_gid(x, y, layer, chunks), {})
+
+    def get_layer_index(self, name: str) -> Optional[int]:
+        return self.layer_names.index(name) if name in self.layer_names else None
+
+    def close(self) -> None:
+        if self._gids is not None: self._gids.release()
+        if self._mmap is not None: self._mmap.close()
+        self._gids = self._mmap = None
+
+
+class MapBundleData(PyscrollDataAdapter):
+    """pyscroll data source reading tiles from a MapBundle (or from the chunks streamed out of it)"""
+    def __init__(self, bundle: MapBundle, chunks: Optional[ChunkSource] = None):
+        super().__init__()
+        self.bundle = bundle
+        self.chunks: ChunkSource = chunks or bundle
+        self.reload_animations()
+
+    def reload_data(self) -> None: pass
+
+    @property
+    def tile_size(self) -> Tuple[int, int]: return self.bundle.tilewidth, self.bundle.tileheight
+
+    @property
+    def map_size(self) -> Tuple[int, int]: return self.bundle.width, self.bundle.height
+
+    @property
+    def visible_tile_layers(self) -> List[int]: return self.bundle.visible_layers
+
+    def get_animations(self) -> Iterator[Tuple[int, list]]:
+        for gid, props in self.bundle.tile_properties.items():
+            if props.get("frames"): yield gid, props["frames"]
+
+    def convert_surfaces(self, parent: pygame.Surface, alpha: bool = False) -> None: pass  # * Tiles come from converted sheets
+
+    def _get_tile_image(self, x: int, y: int, l: int) -> Optional[pygame.Surface]:
+        return self.bundle.get_tile_image_by_gid(self.bundle.get_gid(x, y, l, self.chunks))
+
+    def _get_tile_image_by_id(self, id: int) -> Optional[pygame.Surface]:
+        return self.bundle.get_tile_image_by_gid(id)
+
+    def get_tile_images_by_rect(self, rect) -> Iterator[Tuple[int, int, int, pygame.Surface]]:
+        """Batch read of the tile rect (inclusive bounds), row slices straight from the chunks (layer by layer)"""
+        bundle, size = self.bundle, self.bundle.chunk_size
+        x1, y1, x2, y2 = rect_to_bb(rect)
+        x1, y1, x2, y2 = max(0, x1), max(0, y1), min(bundle.width - 1, x2), min(bundle.height - 1, y2)
+        if x1 > x2 or y1 > y2: return
+        animated, tracked, animations = self._animated_tile, self._tracked_gids, self._animation_map
+        track = bool(self._animation_queue)
+        chunks = {
+            (cx, cy): self.chunks.get_chunk(cx, cy)
+            for cy in range(y1 // size, y2 // size + 1) for cx in range(x1 // size, x2 // size + 1)
+        }
+        for l in bundle.visible_layers:
+            for y in range(y1, y2 + 1):
+                cy, ly = divmod(y, size)
+                for cx in range(x1 // size, x2 // size + 1):
+                    chunk = chunks[(cx, cy)]
+                    if chunk is None: continue  # * Not streamed in yet
+                    first, last = max(x1, cx * size), min(x2, cx * size + size - 1)
+                    row = (l * size + ly) * size - cx * size
+                    for x, gid in enumerate(chunk[row + first:row + last + 1], first):
+                        if not gid: continue
+                        if track and gid in tracked: animations[gid].positions.add((x, y, l))  # * Drawn: advance its frames
+                        tile = animated.get((x, y, l)) or bundle.get_tile_image_by_gid(gid)
+                        if tile: yield x, y, l, tile
+
+
+class MapCache:
+    """Compiles maps into bundles (when stale) and shares the open bundles, reference counted like the image cache.
+    Thread safe: the preloader loads bundles on its worker threads"""
+    def __init__(self):
+        self._bundles: Dict[str, MapBundle] = {}
+        self._refs: Dict[MapBundle, int] = {}  # * Bundles in use (a stale one stays open until its last user releases it)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_stale(tmx_path: Union[Path, str]) -> bool:
+        """A bundle is stale when it's missing or older than the map or any of its dependencies"""
+        path = bundle_path(tmx_path)
+        if not path.exists(): return True
+        try:
+            with open(path, "rb") as file:
+                magic, version, meta_len = HEADER.unpack(file.read(HEADER.size))
+                if magic != MAGIC or version != VERSION: return True
+                dependencies = json.loads(file.read(meta_len))["dependencies"]
+        except (OSError, ValueError, struct.error): return True
+        built = path.stat().st_mtime
+        root = Path(tmx_path).resolve().parent
+        return any(not (root / dep).exists() or (root / dep).stat().st_mtime > built for dep in dependencies)
+
+    def load(self, tmx_path: Union[Path, str]) -> MapBundle:
+        """Get the bundle of a map (compiled on first use or when the .tmx changed) without holding a reference to it"""
+        with self._lock: return self._load(tmx_path)
+
+    def _load(self, tmx_path: Union[Path, str]) -> MapBundle:
+        key = str(Path(tmx_path).resolve())
+        stale = self.is_stale(key)
+        bundle = self._bundles.get(key)
+        if bundle is not None and not stale: return bundle
+
+        if stale:
+            compile_map(key)
+            print(f"Map bundle compiled: {bundle_path(key).name}")
+        if bundle is not None and bundle not in self._refs: bundle.close()
+        bundle = self._bundles[key] = MapBundle(bundle_path(key), Path(key).parent)
+        return bundle
+
+    def acquire(self, tmx_path: Union[Path, str]) -> MapBundle:
+        """Get the bundle of a map and keep it open until it's released"""
+        with self._lock:
+            bundle = self._load(tmx_path)
+            self._refs[bundle] = self._refs.get(bundle, 0) + 1
+            return bundle
+
+    def release(self, bundle: MapBundle) -> None:
+        """Drop a reference taken with acquire (the bundle is closed and forgotten with its last one)"""
+        with self._lock:
+            refs = self._refs.pop(bundle, 0) - 1
+            if refs > 0:
+                self._refs[bundle] = refs
+                return
+            for key in [key for key, open_bundle in self._bundles.items() if open_bundle is bundle]: del self._bundles[key]
+            bundle.close()
+
+    def clear(self) -> None:
+        """Close and forget every unreferenced bundle"""
+        with self._lock:
+            for key in [key for key, bundle in self._bundles.items() if bundle not in self._refs]: self._bundles.pop(key).close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock: return {"bundles": len(self._bundles), "referenced": len(self._refs), "refs": sum(self._refs.values())}
+
+
+map_cache = MapCache()
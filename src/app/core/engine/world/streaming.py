@@ -0,0 +1,107 @@
+# app/core/engine/world/streaming.py
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Set
+import pygame
+
+from app.core.engine.world.map_cache import Chunk, MapBundle
+
+
+class ChunkStreamer:
+    """Pages the chunks of a map bundle in and out around the view on a background thread (bounded resident set)"""
+    def __init__(self, bundle: MapBundle, max_chunks: int = 64, prefetch: int = 1):
+        self.bundle = bundle
+        self.max_chunks = max_chunks  # * Resident chunks kept (never evicts the ones around the view)
+        self.prefetch = prefetch      # * Extra ring of chunks loaded around the view
+        self._resident: OrderedDict[Chunk, array] = OrderedDict()  # * Least recently used first
+        self._pending: Dict[Chunk, Future] = {}
+        self._wanted: Set[Chunk] = set()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunks")
+        self._file = open(bundle.path, "rb")  # * Only read by the (single) worker thread
+        self.loads = self.evictions = 0
+
+    def _read(self, cx: int, cy: int) -> array:
+        """Read a chunk from the bundle (worker thread)"""
+        self._file.seek(self.bundle.chunk_offset(cx, cy))
+        chunk = array("I")
+        chunk.frombytes(self._file.read(self.bundle.chunk_length * chunk.itemsize))
+        return chunk
+
+    def get_chunk(self, cx: int, cy: int) -> Optional[array]:
+        """Get a resident chunk or None (requesting it) if it isn't loaded yet"""
+        chunk = self._resident.get((cx, cy))
+        if chunk is None: self.request(cx, cy)
+        else: self._resident.move_to_end((cx, cy))
+        return chunk
+
+    def request(self, cx: int, cy: int) -> None:
+        cell = (cx, cy)
+        if cell in self._resident or cell in self._pending: return
+        if not (0 <= cx < self.bundle.chunks_x and 0 <= cy < self.bundle.chunks_y): return
+        self._pending[cell] = self._executor.submit(self._read, cx, cy)
+
+    def chunk_rect(self, cell: Chunk) -> pygame.Rect:
+        """World pixel area of a chunk"""
+        width = self.bundle.chunk_size * self.bundle.tilewidth
+        height = self.bundle.chunk_size * self.bundle.tileheight
+        return pygame.Rect(cell[0] * width, cell[1] * height, width, height)
+
+    def chunks_around(self, view: pygame.Rect) -> List[Chunk]:
+        """Chunks overlapping `view` (world pixels) plus the prefetch ring, closest to the view center first"""
+        width = self.bundle.chunk_size * self.bundle.tilewidth
+        height = self.bundle.chunk_size * self.bundle.tileheight
+        x1, y1 = view.left // width - self.prefetch, view.top // height - self.prefetch
+        x2, y2 = (view.right - 1) // width + self.prefetch, (view.bottom - 1) // height + self.prefetch
+        center = (view.centerx / width - 0.5, view.centery / height - 0.5)
+        cells = [
+            (cx, cy) for cy in range(max(0, y1), min(self.bundle.chunks_y - 1, y2) + 1)
+            for cx in range(max(0, x1), min(self.bundle.chunks_x - 1, x2) + 1)
+        ]
+        return sorted(cells, key=lambda c: (c[0] - center[0]) ** 2 + (c[1] - center[1]) ** 2)
+
+    def update(self, view: pygame.Rect, block: bool = False) -> Set[Chunk]:
+        """Stream chunks for `view` (world pixels): request, collect and evict. Returns the chunks that arrived"""
+        cells = self.chunks_around(view)
+        self._wanted = set(cells)
+        for cell in cells: self.request(*cell)
+
+        # * Drop requests that scrolled away before the worker got to them
+        for cell in [cell for cell in self._pending if cell not in self._wanted]:
+            if self._pending[cell].cancel(): del self._pending[cell]
+
+        if block: wait([self._pending[cell] for cell in cells if cell in self._pending])
+
+        arrived: Set[Chunk] = set()
+        for cell, future in list(self._pending.items()):
+            if not future.done(): continue
+            del self._pending[cell]
+            try: self._resident[cell] = future.result()
+            except Exception as e:
+                print(f"Error streaming chunk {cell}: {e}")
+                continue
+            arrived.add(cell)
+            self.loads += 1
+
+        # * Evict the least recently used chunks away from the view
+        for cell in list(self._resident):
+            if len(self._resident) <= self.max_chunks: break
+            if cell not in self._wanted:
+                del self._resident[cell]
+                self.evictions += 1
+        return arrived
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "resident": len(self._resident),
+            "pending": len(self._pending),
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "resident_bytes": sum(chunk.buffer_info()[1] * chunk.itemsize for chunk in self._resident.values()),
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._file.close()
+        self._resident.clear()
+        self._pending.clear()
@@ -1,17 +1,35 @@
 # app/core/engine/world/tiled_map.py
-from typing import Optional, Tuple
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
 import pygame
 import pyscroll
 import pytmx
 from pytmx.util_pygame import load_pygame
 from pydantic import BaseModel, Field
 
+from app.core.engine.world.map_cache import MapBundle, MapBundleData, map_cache
+from app.core.engine.world.streaming import ChunkStreamer
+from app.core.engine.world.zoom import ScaledMapData
+
+STREAM_THRESHOLD: int = 256 * 256  # * Maps with more tiles than this are streamed in chunks (when `stream` is None)
+ZOOM_LAYERS: int = 3  # * Map renderers (one per zoom level, with its scaled tiles) kept for switching back
+
 class TiledMap(BaseModel):
     filename: str
     tmx_data: Optional[pytmx.TiledMap] = None
-    map_data: Optional[pyscroll.data.TiledMapData] = None
+    bundle: Optional[MapBundle] = None  # * Pre-baked binary map (preferred over tmx_data), one map cache reference owned
+    stream: Optional[bool] = None  # * Stream the bundle chunks around the view (None: decide by map size)
+    streamer: Optional[ChunkStreamer] = None
+    map_data: Optional[pyscroll.data.PyscrollDataAdapter] = None
     group: Optional[pyscroll.PyscrollGroup] = None
     sprite_group: Optional[pygame.sprite.Group] = None
+    _view_size: Optional[Tuple[int, int]] = None  # * Size the pyscroll buffers were allocated for
+    _view_center: Optional[Tuple[int, int]] = None
+    _frame: Optional[pygame.Surface] = None  # * Last composited map view
+    _dirty: bool = True
+    _zoom: float = 1.0
+    _zoom_layers: OrderedDict[float, pyscroll.BufferedRenderer] = OrderedDict()  # * Least recently used first
+    _stale_layers: Set[float] = set()  # * Zoom levels whose buffer missed a streamed chunk reload
 
     class Config:
         arbitrary_types_allowed = True
@@ -24,63 +42,154 @@ class TiledMap(BaseModel):
     def load_map(self) -> None:
         """Load and process the TMX map"""
         try:
-            # Load TMX data
-            self.tmx_data = load_pygame(self.filename)
-            self.map_data = pyscroll.data.TiledMapData(self.tmx_data)
-
-            # Create pyscroll renderer
-            map_layer = pyscroll.BufferedRenderer(
-                self.map_data,
-                (
-                    self.tmx_data.width * self.tmx_data.tilewidth,
-                    self.tmx_data.height * self.tmx_data.tileheight
-                )
-            )
+            # * Prefer the memory mapped bundle (compiled once per .tmx change), parse the TMX only as a fallback
+            if self.bundle is None and self.tmx_data is None:
+                try: self.bundle = map_cache.acquire(self.filename)
+                except Exception as e: print(f"Map bundle unavailable ({e}), parsing the TMX instead")
+
+            if self.bundle:
+                stream = self.stream if self.stream is not None else self.width * self.height > STREAM_THRESHOLD
+                if stream: self.streamer = ChunkStreamer(self.bundle)
+                self.map_data = MapBundleData(self.bundle, self.streamer)
+            else:
+                if self.tmx_data is None: self.tmx_data = load_pygame(self.filename)
+                self.map_data = pyscroll.data.TiledMapData(self.tmx_data)
+
+            # Create pyscroll renderer (view sized: the buffer never has to hold the whole map)
+            view_size = pygame.display.get_surface().get_size() if pygame.display.get_surface() else (0, 0)
+            map_layer = pyscroll.BufferedRenderer(self.map_data, (
+                min(self.pixel_width, view_size[0] or self.pixel_width),
+                min(self.pixel_height, view_size[1] or self.pixel_height)
+            ))
 
             # Create pyscroll group
             self.group = pyscroll.PyscrollGroup(map_layer=map_layer, default_layer=0)
+            self._zoom_layers[1.0] = map_layer
 
             print(f"Map loaded successfully: {self.filename}")
-            print(f"Size: {self.tmx_data.width}x{self.tmx_data.height} tiles")
-            print(f"Tile size: {self.tmx_data.tilewidth}x{self.tmx_data.tileheight} pixels")
+            print(f"Size: {self.width}x{self.height} tiles")
+            print(f"Tile size: {self.tilewidth}x{self.tileheight} pixels")
+            if self.streamer: print(f"Streaming {self.bundle.chunks_x}x{self.bundle.chunks_y} chunks")
             
         except Exception as e:
             print(f"Error loading map: {str(e)}")
             raise
 
+    def draw(self, surface: pygame.Surface, center: Tuple[float, float], zoom: float = 1.0) -> bool:
+        """Draw the map view centered on `center` (world pixels): resize, recenter and redraw only when needed. Returns whether the view changed"""
+        if self.group is None: return False  # * (an empty sprite group is falsy)
+        if zoom != self._zoom: self._set_zoom(zoom)
+
+        size = surface.get_size()
+        if size != self._view_size:  # * Reallocates the pyscroll buffers: only on real window size changes
+            self.group._map_layer.set_size(size)
+            self._frame = pygame.Surface(size).convert() if pygame.display.get_surface() else pygame.Surface(size)
+            self._view_size, self._view_center = size, None
+            self._zoom_layers = OrderedDict({self._zoom: self.group._map_layer})  # * The others have the old size
+
+        # * The renderer of a zoom level works in scaled pixels
+        center = round(center[0] * zoom), round(center[1] * zoom)
+        if center != self._view_center:
+            self.group.center(center)
+            self._view_center = center
+            self._dirty = True
+
+        # * Static view: reuse the last composited map frame (animated tiles and map sprites always redraw)
+        redrawn = bool(self._dirty or self.group._map_layer.data._animation_queue or len(self.group))
+        if redrawn:
+            self.group.draw(self._frame)
+            self._dirty = False
+        surface.blit(self._frame, (0, 0))
+        return redrawn
+
+    def _set_zoom(self, zoom: float) -> None:
+        """Switch to the renderer of a zoom level (built from tiles scaled once, reused while it stays cached)"""
+        layer = self._zoom_layers.pop(zoom, None)
+        if layer is None:
+            data = self.map_data if zoom == 1.0 else ScaledMapData(self.map_data, zoom)
+            layer = pyscroll.BufferedRenderer(data, self._view_size or self.group._map_layer._size)
+        elif zoom in self._stale_layers: layer.reload()
+        self._stale_layers.discard(zoom)
+        self._zoom_layers[zoom] = layer
+        while len(self._zoom_layers) > ZOOM_LAYERS: self._zoom_layers.popitem(last=False)
+
+        self.group._map_layer = layer
+        self._zoom, self._view_center, self._dirty = zoom, None, True
+
+    def update_view(self, view: pygame.Rect, block: bool = False) -> None:
+        """Stream the chunks around `view` (world pixels) and redraw the map buffer when visible ones arrive"""
+        if not self.streamer: return
+        arrived = self.streamer.update(view, block)
+        if arrived and self.group is not None and any(view.colliderect(self.streamer.chunk_rect(cell)) for cell in arrived):
+            self.group._map_layer.reload()
+            self._stale_layers = set(self._zoom_layers) - {self._zoom}
+            self._dirty = True
+
+    def close(self) -> None:
+        """Stop streaming and release the bundle (closed once no other map uses it)"""
+        if self.streamer: self.streamer.close()
+        if self.bundle: map_cache.release(self.bundle)
+        self.streamer = self.bundle = None
+
+    @property
+    def source(self) -> Optional[Union[MapBundle, pytmx.TiledMap]]:
+        """Loaded map data (both expose width, height, tilewidth & tileheight)"""
+        return self.bundle or self.tmx_data
+
     def get_layer(self, name: str):
-        """Get a specific layer by name"""
+        """Get a specific layer by name (the tile layer index for bundles)"""
+        if self.bundle: return self.bundle.get_layer_index(name)
         return self.tmx_data.get_layer_by_name(name) if self.tmx_data else None
 
     def get_object_layer(self, name: str):
         """Get a specific object layer by name"""
-        return self.tmx_data.get_layer_by_name(name) if self.tmx_data else None
+        if self.bundle: return self.bundle.objects.get(name)
+        try: return self.tmx_data.get_layer_by_name(name) if self.tmx_data else None
+        except ValueError: return None  # * pytmx raises for unknown layers
 
-    def get_tile_properties(self, x: int, y: int, layer) -> dict:
-        """Get properties of a specific tile"""
+    def get_tile_properties(self, x: int, y: int, layer: int) -> dict:
+        """Get properties of a specific tile (`layer` counts tile layers only for bundles)"""
+        if self.bundle: return self.bundle.get_tile_properties(x, y, layer, self.streamer)
         if not self.tmx_data:
             return {}
         return self.tmx_data.get_tile_properties(x, y, layer) or {}
 
+    @property
+    def tile_properties(self) -> Dict[int, Dict[str, Any]]:
+        """Properties of every tile by gid"""
+        return self.source.tile_properties if self.source else {}
+
+    def get_tile_layers(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Name and properties of each tile layer (indexed like `iter_layer_rows`)"""
+        if self.bundle: return list(zip(self.bundle.layer_names, self.bundle.layer_properties))
+        if not self.tmx_data: return []
+        return [(layer.name, layer.properties) for layer in self.tmx_data.layers if isinstance(layer, pytmx.TiledTileLayer)]
+
+    def iter_layer_rows(self, layer: int) -> Iterator[Tuple[int, int, Sequence[int]]]:
+        """Every row of gids of a tile layer as (x of the first tile, y, gids) (parsed TMX only: bundles are read per chunk)"""
+        if self.bundle or not self.tmx_data: return
+        tile_layers = [l for l in self.tmx_data.layers if isinstance(l, pytmx.TiledTileLayer)]
+        for y, row in enumerate(tile_layers[layer].data): yield 0, y, row
+
     @property
     def width(self) -> int:
         """Get map width in tiles"""
-        return self.tmx_data.width if self.tmx_data else 0
+        return self.source.width if self.source else 0
 
     @property
     def height(self) -> int:
         """Get map height in tiles"""
-        return self.tmx_data.height if self.tmx_data else 0
+        return self.source.height if self.source else 0
 
     @property
     def tilewidth(self) -> int:
         """Get tile width in pixels"""
-        return self.tmx_data.tilewidth if self.tmx_data else 0
+        return self.source.tilewidth if self.source else 0
 
     @property
     def tileheight(self) -> int:
         """Get tile height in pixels"""
-        return self.tmx_data.tileheight if self.tmx_data else 0
+        return self.source.tileheight if self.source else 0
 
     @property
     def pixel_width(self) -> int:
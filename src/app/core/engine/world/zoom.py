@@ -0,0 +1,56 @@
+# app/core/engine/world/zoom.py
+from typing import Dict, Iterator, Tuple
+import pygame
+from pyscroll.data import PyscrollDataAdapter
+
+
+class ScaledMapData(PyscrollDataAdapter):
+    """pyscroll data source serving the tiles of another one scaled by `zoom` (each tile is scaled once and cached)"""
+    def __init__(self, data: PyscrollDataAdapter, zoom: float):
+        super().__init__()
+        self.data = data
+        self.zoom = zoom
+        tile_width, tile_height = data.tile_size
+        self._tile_size = (round(tile_width * zoom), round(tile_height * zoom))
+        self._scaled: Dict[pygame.Surface, pygame.Surface] = {}  # * Source tile -> scaled tile
+        self.reload_animations()
+
+    def _scale(self, image: pygame.Surface) -> pygame.Surface:
+        scaled = self._scaled.get(image)
+        if scaled is None:
+            scaled = self._scaled[image] = pygame.transform.scale(image, self._tile_size)
+            if image.get_colorkey() is not None: scaled.set_colorkey(image.get_colorkey(), pygame.RLEACCEL)
+        return scaled
+
+    def reload_data(self) -> None: self.data.reload_data()
+
+    def get_animations(self): return self.data.get_animations()
+
+    def reload_animations(self) -> None:
+        """Own (scaled) frames, advanced over the positions the inner data source tracks as its tiles are drawn"""
+        super().reload_animations()
+        tracked = getattr(self.data, "_animation_map", {})
+        for gid, token in self._animation_map.items():
+            if gid in tracked: token.positions = tracked[gid].positions
+
+    @property
+    def tile_size(self) -> Tuple[int, int]: return self._tile_size
+
+    @property
+    def map_size(self) -> Tuple[int, int]: return self.data.map_size
+
+    @property
+    def visible_tile_layers(self): return self.data.visible_tile_layers
+
+    def _get_tile_image(self, x: int, y: int, l: int):
+        image = self.data._get_tile_image(x, y, l)
+        return self._scale(image) if image else None
+
+    def _get_tile_image_by_id(self, id):
+        image = self.data._get_tile_image_by_id(id)
+        return self._scale(image) if image else None
+
+    def get_tile_images_by_rect(self, rect) -> Iterator[Tuple[int, int, int, pygame.Surface]]:
+        animated = self._animated_tile  # * Current frames (already scaled) win over the inner tile
+        for x, y, l, image in self.data.get_tile_images_by_rect(rect):
+            yield x, y, l, animated.get((x, y, l)) or self._scale(image)
@@ -1,28 +1,58 @@
 import os
 import pygame
-from pydantic import BaseModel, Field
 from typing import Optional
 
 from app.core.engine.camera import Camera
+from app.core.engine.collision import Bounds, TileCollisionMap
+from app.core.engine.render_queue import RenderLayer, RenderQueue
 
 from .sprites import AnimatedSprite
 
-class Entity(BaseModel):
-    position: pygame.math.Vector2 = Field(default_factory=lambda: pygame.math.Vector2(0, 0))
-    
-    class Config:
-        arbitrary_types_allowed = True
+# * Runtime objects (mutated every frame) are plain slotted classes: pydantic stays for config & save data
+class Entity:
+    __slots__ = ("position", "previous_position")
+
+    def __init__(self, position: Optional[pygame.math.Vector2] = None):
+        self.position = position if position is not None else pygame.math.Vector2(0, 0)
+        self.previous_position = pygame.math.Vector2(self.position)  # Position at the previous simulation step
+
+    def __repr__(self) -> str: return f"{type(self).__name__}(position={tuple(self.position)})"
+
+    def snapshot(self) -> None:
+        """Remember the current position (call at the start of each simulation step)"""
+        self.previous_position.update(self.position)
+
+    def get_render_position(self, alpha: float = 1.0) -> pygame.math.Vector2:
+        """Position interpolated between the previous and the current simulation step"""
+        if alpha >= 1.0 or self.previous_position == self.position: return self.position
+        return self.previous_position.lerp(self.position, alpha)
 
 class Actor(Entity):
-    speed: float = Field(default=200.0)
-    size: pygame.math.Vector2 = Field(default_factory=lambda: pygame.math.Vector2(48, 48))
-    sprite: Optional[AnimatedSprite] = None
+    __slots__ = ("speed", "size", "sprite", "collision")
+
+    def __init__(
+            self, speed: float = 200.0, size: Optional[pygame.math.Vector2] = None,
+            sprite: Optional[AnimatedSprite] = None, collision: Optional[TileCollisionMap] = None, **data
+    ):
+        super().__init__(**data)
+        self.speed = speed
+        self.size = size if size is not None else pygame.math.Vector2(48, 48)
+        self.sprite = sprite
+        self.collision = collision  # * Solid tiles of the current world (None: move freely)
+
+    def get_bounds(self) -> Bounds:
+        """Collision box: `size` centered on the position"""
+        return self.position.x - self.size.x / 2, self.position.y - self.size.y / 2, self.size.x, self.size.y
 
     def move(self, dx: float, dy: float, dt: float):
-        self.position.x += dx * self.speed * dt
-        self.position.y += dy * self.speed * dt
+        dx, dy = dx * self.speed * dt, dy * self.speed * dt
+        if self.collision: dx, dy = self.collision.move(self.get_bounds(), dx, dy)
+        self.position.x += dx
+        self.position.y += dy
 
-    def draw(self, surface: pygame.Surface, camera: Camera):
+    def draw(self, surface: pygame.Surface, camera: Camera, alpha: float = 1.0, queue: Optional[RenderQueue] = None):
         if self.sprite:
-            screen_pos = camera.world_to_screen(self.position)
-            surface.blit(self.sprite.get_current_frame(), screen_pos)
+            frame = self.sprite.get_current_frame()
+            screen_pos = camera.world_to_screen(self.get_render_position(alpha))
+            if queue is None: surface.blit(frame, screen_pos)
+            else: queue.submit(RenderLayer.ENTITIES, screen_pos.y + frame.get_height(), frame, screen_pos)
@@ -0,0 +1,57 @@
+# app/core/systems/entities/atlas.py
+from typing import Dict, Iterable, Optional, Set, Tuple
+import pygame
+from pygame import Surface
+
+# * (sheet_key, column, row, flipped, scale) -> ready-to-blit surface
+FrameKey = Tuple[str, int, int, bool, float]
+
+
+class FrameAtlas:
+    """Bakes scaled (and flipped) animation frames once so actors can blit them directly"""
+    def __init__(self):
+        self._frames: Dict[FrameKey, Surface] = {}
+        self._baked: Set[Tuple[str, Tuple[int, int], float]] = set()
+
+    def is_baked(self, sheet_key: str, frame_size: Tuple[int, int], scale: float) -> bool:
+        return (sheet_key, tuple(frame_size), scale) in self._baked
+
+    def bake(self,
+            sheet_key: str,
+            sheet: Surface,
+            frame_size: Tuple[int, int],
+            scale: float,
+            coords: Iterable[Tuple[int, int]],
+            flips: Iterable[bool] = (False, True)
+        ) -> None:
+        """Cut, scale and flip every requested (column, row) frame of a sheet (only once per sheet & scale)"""
+        if self.is_baked(sheet_key, frame_size, scale): return
+
+        frame_width, frame_height = frame_size
+        sheet_width, sheet_height = sheet.get_size()
+        scaled_size = (int(frame_width * scale), int(frame_height * scale))
+        flips = tuple(flips)
+
+        for col, row in set(coords):
+            x, y = col * frame_width, row * frame_height
+            if x + frame_width > sheet_width or y + frame_height > sheet_height:
+                continue  # * Skip frames outside of the sheet (same rule as get_current_frame)
+
+            scaled = pygame.transform.scale(sheet.subsurface((x, y, frame_width, frame_height)), scaled_size)
+            for flip in flips:
+                self._frames[(sheet_key, col, row, flip, scale)] = pygame.transform.flip(scaled, True, False) if flip else scaled
+
+        self._baked.add((sheet_key, tuple(frame_size), scale))
+
+    def get(self, sheet_key: str, col: int, row: int, flip: bool, scale: float) -> Optional[Surface]:
+        """Get a baked frame (None if it was never baked)"""
+        return self._frames.get((sheet_key, col, row, flip, scale))
+
+    def clear(self) -> None:
+        self._frames.clear()
+        self._baked.clear()
+
+    def __len__(self) -> int: return len(self._frames)
+
+
+frame_atlas = FrameAtlas()
@@ -1,11 +1,12 @@
 import random
 from enum import Enum
-from typing import List
-from pydantic import Field
+from typing import Any, Dict, List, Optional
 
+from app.core.engine.compositor import compositor
+from app.core.engine.render_queue import RenderLayer, RenderQueue
 from app.core.systems.entities import *
 from app.core.systems.entities.sprites import *
-from tools import AssetManager
+from tools import AssetManager, image_cache
 from tools.console import *
 
 class NPCType(Enum):
@@ -17,37 +18,50 @@ class NPCType(Enum):
     TAVERN_KEEPER = "Tavern Keeper"
     WANDERING_MERCHANT = "Wandering Merchant"
 
+NPC_VARIANTS: Dict[str, int] = {"Male": 4, "Female": 2}  # * Sprite sheets available per gender
+
 def get_random_asset() -> str:
     """Get a random asset path for the NPC sprite"""
-    gender = random.choice(["Male", "Female"])
-    return f"static\\npc\\{gender}{random.randint(1, 2 if gender == "Female" else 4)}.png"
+    gender = random.choice(list(NPC_VARIANTS))
+    return f"static\\npc\\{gender}{random.randint(1, NPC_VARIANTS[gender])}.png"
 
+def get_all_assets() -> List[str]:
+    """Get every NPC sprite sheet path (e.g. to preload them)"""
+    return [f"static\\npc\\{gender}{i}.png" for gender, count in NPC_VARIANTS.items() for i in range(1, count + 1)]
 
-class NPC(Actor):
-    npc_type: NPCType = Field(...)  # Required field
-    name: str = Field(default=None)  # Default None if not provided
-    dialogue_keys: List[str] = Field(default_factory=list)  # Default empty list if not provided
-    current_dialogue_index: int = Field(default=0)
 
-    sprite_sheet_path: str = Field(default_factory=get_random_asset)
-    sprite_type_index: int = Field(default=0)
-    scale_factor: float = Field(default=3.0)
+class NPC(Actor):
+    __slots__ = (
+        "npc_type", "name", "dialogue_keys", "current_dialogue_index",
+        "sprite_sheet_path", "sprite_type_index", "scale_factor", "_sheet_acquired"
+    )
 
-    def __init__(self, **data):
+    def __init__(
+            self, npc_type: NPCType, dialogue_keys: Optional[List[str]] = None, current_dialogue_index: int = 0,
+            sprite_sheet_path: Optional[str] = None, sprite_type_index: int = 0, scale_factor: float = 3.0,
+            name: Optional[str] = None, **data
+    ):
         super().__init__(**data)
+        self.npc_type = npc_type
+        self.dialogue_keys = dialogue_keys if dialogue_keys is not None else []
+        self.current_dialogue_index = current_dialogue_index
+        self.sprite_sheet_path = sprite_sheet_path or get_random_asset()
+        self.sprite_type_index = sprite_type_index
+        self.scale_factor = scale_factor
+        self._sheet_acquired = False  # Whether the sprite sheet is pinned in the image cache
+
         self.sprite = AnimatedSprite()
-        self.name = f"{self.npc_type.name.title()}-{random.randint(1, 100):02d}"
+        self.name = name or f"{self.npc_type.name.title()}-{random.randint(1, 100):02d}"
 
         self._initialize_random_npc()
 
-        self.npc_type = data.get("npc_type", NPCType.CIVILIAN)
-
     def _initialize_random_npc(self) -> None:
         """Initialize NPC with random appearance from available types"""
         try:
             # Load sprite sheet
             img_path = AssetManager.get_image(self.sprite_sheet_path)
-            sprite_sheet = pygame.image.load(img_path).convert_alpha()
+            sprite_sheet = image_cache.acquire(img_path)  # * Shared: each sheet is only decoded once
+            self._sheet_acquired = True
             
             # Set up sprite properties
             self.sprite.sprite_sheet = sprite_sheet
@@ -57,6 +71,7 @@ class NPC(Actor):
             
             # Set up animations based on direction
             self.sprite.setup_directional_animations()
+            self.sprite.bake(self.sprite_sheet_path, self.scale_factor)  # * Pre-scale frames once
             
             # print(f"{self.name} initialized successfully with sprite sheet: {img_path}")
             print(f"\t\tNew {cyan("NPC")} {self.name}")
@@ -65,6 +80,21 @@ class NPC(Actor):
             print(f"Error initializing NPC: {e}")
             self._create_fallback_sprite()
     
+    def get_state(self) -> Dict[str, Any]:
+        """Arguments rebuilding this NPC as it is now (e.g. after its world was unloaded)"""
+        return {
+            "position": pygame.math.Vector2(self.position), "speed": self.speed, "npc_type": self.npc_type,
+            "dialogue_keys": list(self.dialogue_keys), "current_dialogue_index": self.current_dialogue_index,
+            "sprite_sheet_path": self.sprite_sheet_path, "sprite_type_index": self.sprite_type_index,
+            "scale_factor": self.scale_factor, "name": self.name
+        }
+
+    def release_assets(self) -> None:
+        """Release the sprite sheet reference held in the image cache"""
+        if self._sheet_acquired:
+            image_cache.release(AssetManager.get_image(self.sprite_sheet_path))
+            self._sheet_acquired = False
+
     def _create_fallback_sprite(self) -> None:
         """Create a basic fallback sprite if loading fails"""
         fallback = pygame.Surface((24, 24), pygame.SRCALPHA)
@@ -79,24 +109,25 @@ class NPC(Actor):
     def update(self, dt: float) -> None:
         """Update NPC state and animations"""
         if not self.sprite: return
+        self.snapshot()
         self.sprite.update(dt)  # Update animation
 
-    def draw(self, surface: pygame.Surface, camera: Camera) -> None:
+    def draw(self, surface: pygame.Surface, camera: Camera, alpha: float = 1.0, queue: Optional[RenderQueue] = None) -> None:
         """Draw NPC with proper scaling"""
         if not self.sprite or not self.sprite.sprite_sheet:
             return
             
-        current_frame = self.sprite.get_current_frame()
-        scaled_size = (
-            int(current_frame.get_width() * self.scale_factor),
-            int(current_frame.get_height() * self.scale_factor)
-        )
-        scaled_frame = pygame.transform.scale(current_frame, scaled_size)
+        scale = self.scale_factor * camera.zoom  # * Frames are baked once per zoom level (and sheet)
+        if scale != self.scale_factor: self.sprite.bake(self.sprite_sheet_path, scale)
+        scaled_frame = self.sprite.get_scaled_frame(scale)
+        scaled_width, scaled_height = scaled_frame.get_size()
 
-        screen_pos = camera.world_to_screen(self.position)
+        screen_pos = camera.world_to_screen(self.get_render_position(alpha))
         draw_pos = (
-            screen_pos[0] - scaled_size[0] // 2,
-            screen_pos[1] - scaled_size[1] // 2
+            screen_pos[0] - scaled_width // 2,
+            screen_pos[1] - scaled_height // 2
         )
         
-        surface.blit(scaled_frame, draw_pos)
+        if queue is not None:
+            queue.submit(RenderLayer.ENTITIES, draw_pos[1] + scaled_height, scaled_frame, draw_pos, ("npc", id(self)), scaled_frame)
+        else: compositor.track(("npc", id(self)), surface.blit(scaled_frame, draw_pos), scaled_frame)
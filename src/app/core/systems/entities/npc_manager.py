@@ -1,8 +1,10 @@
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
-from pygame import Vector2
+from pygame import Rect, Vector2
 from app.core.engine.camera import Camera
+from app.core.engine.render_queue import RenderQueue
+from app.core.engine.spatial import SpatialHash
 from app.core.systems.entities.npc import NPC, NPCType
 from app.core.systems.fn.dialogue import DialogueSystem, EnhancedDialogueSystem
 from app.core.systems.ui.hint import *
@@ -16,14 +18,50 @@ class NPCManager(BaseModel):
     hint_manager: HintManager = Field(default_factory=HintManager)
     dialogue_system: EnhancedDialogueSystem = Field(default_factory=EnhancedDialogueSystem )
     closest_npc: Optional[NPC] = None
+    closest_distance: float = Field(default=float("inf"))
+    grid: SpatialHash = Field(default_factory=lambda: SpatialHash(cell_size=128.0))
 
     class Config:
         arbitrary_types_allowed = True
 
     def __init__(self, **data):
         super().__init__(**data)
+        for npc in self.npcs: self.grid.insert(npc, npc.position)
         self._initialize_hints()
-        self._add_test_npcs()
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'NPCManager':
+        """Rebuild the NPCs and hints saved with `get_state`"""
+        manager = cls(npcs=[NPC(**npc) for npc in state.get("npcs", [])])
+        for key, hint in state.get("hints", {}).items(): manager.hint_manager.add_hint(key, Hint(**hint))
+        return manager
+
+    def get_state(self) -> Dict[str, Any]:
+        """NPCs and hints as they are now (what a world keeps while it's unloaded)"""
+        return {"npcs": [npc.get_state() for npc in self.npcs], "hints": self.hint_manager.get_state()}
+
+    def add_npc(self, npc: NPC) -> None:
+        """Add an NPC and register it in the spatial grid"""
+        self.npcs.append(npc)
+        self.grid.insert(npc, npc.position)
+
+    def remove_npc(self, npc: NPC) -> None:
+        """Remove an NPC from the manager and the spatial grid"""
+        self.grid.remove(npc)
+        self.npcs = [n for n in self.npcs if n is not npc]
+        if self.closest_npc is npc: self.closest_npc = None
+        npc.release_assets()
+
+    def clear(self) -> None:
+        """Remove every NPC (releasing their cached assets)"""
+        for npc in self.npcs: npc.release_assets()
+        self.npcs = []
+        self.grid.clear()
+        self.closest_npc = None
+
+    def get_npcs_in_rect(self, rect: Rect) -> List[NPC]:
+        """Get all NPCs whose position lies inside a world-space rect"""
+        return self.grid.query_rect(rect)
 
     def _initialize_hints(self) -> None:
         """Initialize interaction hints"""
@@ -40,19 +78,20 @@ class NPCManager(BaseModel):
         )
         self.hint_manager.add_hint("interact", interaction_hint)
 
-    def update(self, dt: float, player_pos: Vector2) -> None:
-        """Update all NPCs, hints and dialogue"""
+    def update(self, dt: float, player_pos: Vector2, visible_area: Optional[Rect] = None) -> None:
+        """Update all NPCs, hints and dialogue (only on-screen NPCs are animated if `visible_area` is given)"""
         # Update NPCs
-        for npc in self.npcs:
+        for npc in (self.grid.query_rect(visible_area) if visible_area else self.npcs):
             npc.update(dt)
+            self.grid.move(npc, npc.position)  # * Only re-buckets NPCs that changed cell
 
-        # Find closest NPC
+        # Find closest NPC (already limited to the interaction range)
         self.closest_npc = self._get_closest_npc(player_pos)
         
         # Update hint visibility
         show_hint = bool(
             self.closest_npc and 
-            self._get_distance(player_pos, self.closest_npc.position) <= self.interaction_range and
+            self.closest_distance <= self.interaction_range and
             not self.dialogue_system.active  # Don't show hint during dialogue
         )
     
@@ -81,37 +120,38 @@ class NPCManager(BaseModel):
             self.dialogue_system.start_dialogue(self.closest_npc)
             player.reputation.modify(1)  # Small reputation boost for talking
 
-    def draw(self, surface: Surface, camera: Camera) -> None:
-        """Draw NPCs, hints and dialogue"""
+    def draw(
+            self, surface: Surface, camera: Camera, visible_area: Optional[Rect] = None, alpha: float = 1.0,
+            queue: Optional[RenderQueue] = None
+    ) -> None:
+        """Draw NPCs and hints (NPCs outside `visible_area` are culled). With a `queue` they are only submitted to it"""
         # Draw NPCs
-        for npc in self.npcs:
-            npc.draw(surface, camera)
+        for npc in (self.grid.query_rect(visible_area) if visible_area else self.npcs):
+            npc.draw(surface, camera, alpha, queue)
         
         # Draw hint if there's a closest NPC
         if self.closest_npc and not self.dialogue_system.active:
             screen_pos = camera.world_to_screen(self.closest_npc.position)
             self.hint_manager.draw(surface, {
                 "interact": (int(screen_pos.x), int(screen_pos.y))
-            })
-            
-        # Draw dialogue system
+            }, queue)
+        self.hint_manager.draw_world(surface, camera, queue)  # * Anchored hints (labels over world positions)
+
+        if queue is None: self.draw_dialogue(surface)
+
+    def draw_dialogue(self, surface: Surface) -> None:
+        """Draw the dialogue system (on top of the world)"""
         if self.dialogue_system.active:
             self.dialogue_system.draw(surface)
 
     def _get_closest_npc(self, player_pos: Vector2) -> Optional[NPC]:
         """Find the closest NPC within interaction range"""
-        if not self.npcs:
-            return None
-
-        closest = min(self.npcs,
-            key=lambda npc: self._get_distance(player_pos, npc.position)
-        )
-
-        return closest if self._get_distance(player_pos, closest.position) <= self.interaction_range else None
+        closest, self.closest_distance = self.grid.nearest(player_pos, self.interaction_range)
+        return closest
 
     def _get_distance(self, pos1: Vector2, pos2: Vector2) -> float: return pos1.distance_to(pos2)
 
-    def _add_test_npcs(self) -> None:
+    def add_test_npcs(self) -> None:
         """Add test NPCs with their dialogue keys"""
         test_npcs = [
             NPC(position=Vector2(780, 100),
@@ -127,4 +167,4 @@ class NPCManager(BaseModel):
                 npc_type=NPCType.WANDERING_MERCHANT,
                 dialogue_keys=[f"wanderer-{i:02d}" for i in range(1, 6)])
         ]
-        self.npcs.extend(test_npcs)
+        for npc in test_npcs: self.add_npc(npc)
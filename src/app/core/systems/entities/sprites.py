@@ -1,7 +1,8 @@
 import pygame
 from enum import Enum
 from typing import Tuple, List, Dict, Optional
-from pydantic import BaseModel, Field
+
+from app.core.systems.entities.atlas import frame_atlas
 
 class AnimationState(Enum):
     IDLE = 0
@@ -15,19 +16,39 @@ class Direction(Enum):
     UP = 2
     DOWN = 3
 
-class AnimatedSprite(BaseModel):
-    sprite_sheet: Optional[pygame.Surface] = None
-    frame_size: Tuple[int, int] = (32, 48)  # Updated to correct sprite size
-    animations: Dict[AnimationState, List[Tuple[int, int]]] = Field(default_factory=dict)
-    current_state: AnimationState = AnimationState.IDLE
-    current_frame: int = 0
-    animation_speed: float = 0.1
-    animation_timer: float = 0
-    direction: Direction = Direction.RIGHT
-    flip_horizontal: bool = False
-
-    class Config:
-        arbitrary_types_allowed = True
+# * Sprite sheet row used by each direction (LEFT reuses RIGHT, flipped)
+DIRECTION_ROWS: Dict[Direction, int] = {
+    Direction.RIGHT: 0,  # First row
+    Direction.LEFT: 0,   # Same as right, but flipped
+    Direction.UP: 1,     # Second row
+    Direction.DOWN: 2    # Third row
+}
+IDLE_FRAMES = range(4)  # First 4 frames
+WALK_FRAMES = range(4, 8)  # Next 4 frames
+
+class AnimatedSprite:
+    __slots__ = (
+        "sprite_sheet", "sheet_key", "frame_size", "animations", "current_state", "current_frame",
+        "animation_speed", "animation_timer", "direction", "flip_horizontal"
+    )
+
+    def __init__(
+            self, sprite_sheet: Optional[pygame.Surface] = None, sheet_key: Optional[str] = None,
+            frame_size: Tuple[int, int] = (32, 48), animations: Optional[Dict[AnimationState, List[Tuple[int, int]]]] = None,
+            current_state: AnimationState = AnimationState.IDLE, current_frame: int = 0,
+            animation_speed: float = 0.1, animation_timer: float = 0, direction: Direction = Direction.RIGHT,
+            flip_horizontal: bool = False
+    ):
+        self.sprite_sheet = sprite_sheet
+        self.sheet_key = sheet_key  # Atlas key of the sprite sheet (None = not baked)
+        self.frame_size = frame_size  # Updated to correct sprite size
+        self.animations = animations if animations is not None else {}
+        self.current_state = current_state
+        self.current_frame = current_frame
+        self.animation_speed = animation_speed
+        self.animation_timer = animation_timer
+        self.direction = direction
+        self.flip_horizontal = flip_horizontal
 
     def update(self, dt: float):
         """Update animation frame based on timer"""
@@ -78,6 +99,24 @@ class AnimatedSprite(BaseModel):
             print(f"Error getting animation frame: {e}")
             return self.create_default_frame()
 
+    def bake(self, sheet_key: str, scale: float) -> None:
+        """Pre-scale every directional frame (and its flipped copy) into the shared frame atlas"""
+        if self.sprite_sheet is None: return
+        coords = [(i, row) for row in set(DIRECTION_ROWS.values()) for i in (*IDLE_FRAMES, *WALK_FRAMES)]
+        frame_atlas.bake(sheet_key, self.sprite_sheet, self.frame_size, scale, coords)
+        self.sheet_key = sheet_key
+
+    def get_scaled_frame(self, scale: float) -> pygame.Surface:
+        """Get the current frame already scaled (and flipped) from the atlas"""
+        if self.sheet_key and self.current_state in self.animations:
+            col, row = self.animations[self.current_state][self.current_frame]
+            frame = frame_atlas.get(self.sheet_key, col, row, self.flip_horizontal, scale)
+            if frame is not None: return frame
+
+        # * Fallback: scale on the fly (sprites that were never baked)
+        frame = self.get_current_frame()
+        return pygame.transform.scale(frame, (int(frame.get_width() * scale), int(frame.get_height() * scale)))
+
     def create_default_frame(self) -> pygame.Surface:
         """Create a fallback frame if sprite sheet is missing or invalid"""
         surface = pygame.Surface(self.frame_size, pygame.SRCALPHA)
@@ -92,20 +131,8 @@ class AnimatedSprite(BaseModel):
 
     def setup_directional_animations(self) -> None:
         """Set up animations for all directions"""
-        # Frame indices for each animation state
-        idle_frames = range(4)  # First 4 frames
-        walk_frames = range(4, 8)  # Next 4 frames
-
-        # Calculate row offsets for each direction
-        direction_rows = {
-            Direction.RIGHT: 0,  # First row
-            Direction.LEFT: 0,   # Same as right, but flipped
-            Direction.UP: 1,     # Second row
-            Direction.DOWN: 2    # Third row
-        }
-
         # Set up animations for each state and direction
         self.animations = {
-            AnimationState.IDLE: [(i, direction_rows[self.direction]) for i in idle_frames],
-            AnimationState.MOVE: [(i, direction_rows[self.direction]) for i in walk_frames]
+            AnimationState.IDLE: [(i, DIRECTION_ROWS[self.direction]) for i in IDLE_FRAMES],
+            AnimationState.MOVE: [(i, DIRECTION_ROWS[self.direction]) for i in WALK_FRAMES]
         }
@@ -1,13 +1,16 @@
 import random
-from typing import List, Optional, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 import pygame
 from pydantic import BaseModel, Field
 from pygame import Surface, Vector2, font
 
+from app.core.engine.compositor import compositor
 from app.core.systems.entities.npc import NPC, NPCType
 from app.core.systems.fn.interaction import DialogueMenu, DialogueMenuOption, InteractionType
+from app.core.systems.ui.text import TextLayout, text_engine
 from project import npc_lang_manager
-from tools import AssetManager
+from tools import AssetManager, image_cache
 
 class DialogueMessage(BaseModel):
     text: str
@@ -17,6 +20,73 @@ class DialogueMessage(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
+class PortraitCache:
+    """LRU cache of ready-to-blit (circular, bordered) NPC portraits keyed by (sprite_sheet_path, portrait_size)"""
+    def __init__(self, border_color: Tuple[int, int, int], capacity: int = 16):
+        self.border_color = border_color
+        self.capacity = capacity
+        self._portraits: OrderedDict[Tuple[str, int], Optional[Surface]] = OrderedDict()
+        self._faded: Dict[Tuple[str, int], Surface] = {}  # * Per-portrait copy faded in place (portraits stay opaque)
+
+    def get(self, sprite_sheet_path: str, portrait_size: int) -> Optional[Surface]:
+        """Get a portrait, building it (disk load + scale + mask) only on a miss"""
+        key = (sprite_sheet_path, portrait_size)
+        if key in self._portraits:
+            self._portraits.move_to_end(key)
+            return self._portraits[key]
+
+        portrait = self._build(sprite_sheet_path, portrait_size)
+        self._portraits[key] = portrait
+        if len(self._portraits) > self.capacity:
+            evicted, _ = self._portraits.popitem(last=False)  # * Evict the least recently used portrait
+            self._faded.pop(evicted, None)
+        return portrait
+
+    def get_faded(self, sprite_sheet_path: str, portrait_size: int, alpha: int) -> Optional[Surface]:
+        """Get a portrait at `alpha`, set on a copy owned by the cache (the shared portrait is never modified)"""
+        portrait = self.get(sprite_sheet_path, portrait_size)
+        if portrait is None: return None
+        key = (sprite_sheet_path, portrait_size)
+        faded = self._faded.get(key)
+        if faded is None: faded = self._faded[key] = portrait.copy()
+        faded.set_alpha(alpha)
+        return faded
+
+    def preload(self, sprite_sheet_path: str, portrait_size: int) -> None: self.get(sprite_sheet_path, portrait_size)
+
+    def clear(self) -> None:
+        self._portraits.clear()
+        self._faded.clear()
+
+    def _build(self, sprite_sheet_path: str, portrait_size: int) -> Optional[Surface]:
+        """Extract the NPC portrait from its sprite sheet and mask it into a bordered circle"""
+        try:
+            # Load sprite sheet
+            sprite_sheet = image_cache.get(AssetManager.get_image(sprite_sheet_path))
+            
+            # Get the first frame (idle facing front) which is 24x24
+            portrait = sprite_sheet.subsurface(pygame.Rect(0, 0, 24, 24))
+            
+            # Scale up the portrait
+            portrait = pygame.transform.scale_by(portrait, portrait_size / 24)
+        except Exception as e:
+            print(f"Error processing portrait: {e}")
+            return None
+
+        # Create a circular mask for the portrait
+        center, radius = (portrait_size // 2, portrait_size // 2), portrait_size // 2
+        mask = pygame.Surface((portrait_size, portrait_size), pygame.SRCALPHA)
+        pygame.draw.circle(mask, (255, 255, 255, 255), center, radius)
+
+        # Create a surface for the masked portrait
+        portrait_surface = pygame.Surface((portrait_size, portrait_size), pygame.SRCALPHA)
+        portrait_surface.blit(portrait, (0, 0))
+        portrait_surface.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
+
+        # Add a decorative border
+        pygame.draw.circle(portrait_surface, self.border_color, center, radius, 3)
+        return portrait_surface
+
 class DialogueBox(BaseModel):
     width: int = Field(default=800)
     height: int = Field(default=200)
@@ -25,6 +95,9 @@ class DialogueBox(BaseModel):
     background_color: Tuple[int, int, int, int] = Field(default=(0, 0, 0, 220))
     text_color: Tuple[int, int, int] = Field(default=(255, 255, 255))
     name_color: Tuple[int, int, int] = Field(default=(255, 223, 0))
+    portrait_size: int = Field(default=120)
+    font_name: str = Field(default="CascadiaCode.ttf")
+    name_font_name: str = Field(default="CascadiaCodeItalic.ttf")
     font_size: int = Field(default=24)
     name_font_size: int = Field(default=28)
     animation_speed: float = Field(default=50.0)
@@ -37,14 +110,17 @@ class DialogueBox(BaseModel):
     _text_progress: float = 0
     _is_complete: bool = False
     _alpha: float = 0.0  # New alpha for fading
+    _layout: Optional[TextLayout] = None  # Wrapped glyph layout of the current message
+    _portraits: Optional[PortraitCache] = None
     
     class Config:
         arbitrary_types_allowed = True
         
     def __init__(self, **data):
         super().__init__(**data)
-        self._font = font.Font(AssetManager.get_font("CascadiaCode.ttf"), self.font_size)
-        self._name_font = font.Font(AssetManager.get_font("CascadiaCodeItalic.ttf"), self.name_font_size)
+        self._font = text_engine.font(self.font_name, self.font_size)
+        self._name_font = text_engine.font(self.name_font_name, self.name_font_size)
+        self._portraits = PortraitCache(border_color=self.name_color)  # Use the same gold color as the name
     
     def update(self, dt: float, full_text: str, should_show: bool = True) -> None:
         # Update fade
@@ -83,63 +159,31 @@ class DialogueBox(BaseModel):
         )
         
         # Draw content with current alpha
-        name_surface = self._name_font.render(message.speaker, True, self.name_color)
-        name_surface.set_alpha(int(self._alpha))
+        name_surface = text_engine.render_faded(self.name_font_name, self.name_font_size, self.name_color, message.speaker, int(self._alpha))
         box_surface.blit(name_surface, (self.padding, self.padding))
         
         # Handle portrait and text layout
         text_start_x = self.padding
         if message.portrait_path:
-            portrait_size = 120
-            try:
-                portrait = self._get_npc_portrait(message.portrait_path, portrait_size)
-                if portrait:
-                    portrait.set_alpha(int(self._alpha))
-                    
-                    # Create a circular mask for the portrait
-                    mask = pygame.Surface((portrait_size, portrait_size), pygame.SRCALPHA)
-                    pygame.draw.circle(
-                        mask,
-                        (255, 255, 255, int(self._alpha)),
-                        (portrait_size // 2, portrait_size // 2),
-                        portrait_size // 2
-                    )
-                    
-                    # Create a surface for the masked portrait
-                    portrait_surface = pygame.Surface((portrait_size, portrait_size), pygame.SRCALPHA)
-                    portrait_surface.blit(portrait, (0, 0))
-                    portrait_surface.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
-                    
-                    # Add a decorative border
-                    pygame.draw.circle(
-                        portrait_surface,
-                        self.name_color,  # Use the same gold color as the name
-                        (portrait_size // 2, portrait_size // 2),
-                        portrait_size // 2,
-                        3  # Border width
-                    )
-                    
-                    # Draw the portrait
-                    box_surface.blit(portrait_surface, (self.padding, self.padding + 30))
-                    text_start_x = portrait_size + self.padding * 2
-            except Exception as e:
-                print(f"Error drawing portrait: {e}")
+            portrait = self._portraits.get_faded(message.portrait_path, self.portrait_size, int(self._alpha))
+            if portrait:
+                box_surface.blit(portrait, (self.padding, self.padding + 30))
+                text_start_x = self.portrait_size + self.padding * 2
 
         # Draw animated text
-        visible_text = message.text[:int(self._text_progress)]
         text_y = self.padding * 2 + name_surface.get_height()
         
         self._draw_wrapped_text(
             box_surface, 
-            visible_text, 
+            message.text,
+            int(self._text_progress),
             (text_start_x, text_y), 
             self.width - text_start_x - self.padding
         )
 
         # Draw continue indicator
         if self._is_complete:
-            indicator_text = self._font.render('▼', True, self.text_color)
-            indicator_text.set_alpha(int(self._alpha))
+            indicator_text = text_engine.render_faded(self.font_name, self.font_size, self.text_color, '▼', int(self._alpha))
             box_surface.blit(
                 indicator_text,
                 (self.width - self.padding - indicator_text.get_width(),
@@ -149,50 +193,22 @@ class DialogueBox(BaseModel):
         # Position and draw the dialogue box
         box_x = (screen_width - self.width) // 2
         box_y = screen_height - self.height - 20
-        surface.blit(box_surface, (box_x, box_y))
+        box_rect = surface.blit(box_surface, (box_x, box_y))
+        compositor.track("dialogue", box_rect, (int(self._alpha), int(self._text_progress), self._is_complete, message.speaker, message.text))
 
-    def _get_npc_portrait(self, sprite_sheet_path: str, portrait_size: int) -> Optional[Surface]:
-        """Extract and process NPC portrait from sprite sheet"""
-        try:
-            # Load sprite sheet
-            sprite_sheet = pygame.image.load(AssetManager.get_image(sprite_sheet_path))
-            
-            # Get the first frame (idle facing front) which is 24x24
-            frame_rect = pygame.Rect(0, 0, 24, 24)
-            portrait = sprite_sheet.subsurface(frame_rect)
-            
-            # Scale up the portrait
-            scaled_portrait = pygame.transform.scale_by(portrait, portrait_size / 24)
-            
-            return scaled_portrait
-        except Exception as e:
-            print(f"Error processing portrait: {e}")
-            return None
+    def preload_portrait(self, sprite_sheet_path: str) -> None:
+        """Build a portrait ahead of time (keeps disk I/O out of the draw call)"""
+        self._portraits.preload(sprite_sheet_path, self.portrait_size)
 
-    def _draw_wrapped_text(self, surface: Surface, text: str, pos: Tuple[int, int], max_width: int) -> None:
-        words = text.split(' ')
-        line = []
-        x, y = pos
-        y_offset = 0
-        
-        for word in words:
-            line.append(word)
-            text_surface = self._font.render(' '.join(line), True, self.text_color)
-            text_surface.set_alpha(int(self._alpha))
-            
-            if text_surface.get_width() > max_width:
-                line.pop()
-                if line:
-                    final_surface = self._font.render(' '.join(line), True, self.text_color)
-                    final_surface.set_alpha(int(self._alpha))
-                    surface.blit(final_surface, (x, y + y_offset))
-                line = [word]
-                y_offset += self._font.get_height()
-        
-        if line:
-            final_surface = self._font.render(' '.join(line), True, self.text_color)
-            final_surface.set_alpha(int(self._alpha))
-            surface.blit(final_surface, (x, y + y_offset))
+    def _draw_wrapped_text(self, surface: Surface, text: str, visible_chars: int, pos: Tuple[int, int], max_width: int) -> None:
+        """Draw the first `visible_chars` characters of the (wrapped once per message) text"""
+        layout = self._layout
+        if layout is None or layout.text != text or layout.max_width != max_width or visible_chars < layout.visible_chars:
+            layout = self._layout = text_engine.layout(self.font_name, self.font_size, self.text_color, text, max_width)
+
+        text_surface = layout.reveal(visible_chars)
+        text_surface.set_alpha(int(self._alpha))
+        surface.blit(text_surface, pos)
 
     def is_complete(self) -> bool:
         return self._is_complete
@@ -223,6 +239,8 @@ class DialogueSystem(BaseModel):
                 portrait_path=npc.sprite_sheet_path
             ))
 
+        self.dialogue_box.preload_portrait(npc.sprite_sheet_path)
+
         self.messages = m
         self.current_message_index = 0
         self.active = True
@@ -378,3 +396,5 @@ class EnhancedDialogueSystem(DialogueSystem):
                 self.dialogue_box.height
             )
             self.menu.draw(surface, box_rect, int(self.dialogue_box._alpha))
+            hovered = tuple(option.is_hovered for option in self.menu.options)
+            compositor.track("dialogue.menu", box_rect, (int(self.dialogue_box._alpha), hovered))
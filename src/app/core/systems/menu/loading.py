@@ -0,0 +1,42 @@
+# app/core/systems/menu/loading.py
+import pygame
+from pygame import Surface
+
+from app.core.engine.compositor import compositor
+from app.core.systems.menu.base import UITheme
+from app.core.systems.menu.renderer import MenuRenderer
+from project import menu_lang_manager
+
+
+class LoadingScreen:
+    """Progress bar drawn over the menu background while the game assets are preloaded"""
+    def __init__(self, theme: UITheme, background: Surface) -> None:
+        self.theme = theme
+        self.background = background
+        self.renderer = MenuRenderer(theme)
+        self.bar_size = (480, 24)
+
+    def draw(self, surface: Surface, progress: float) -> None:
+        surface.fill(self.theme.background_color)
+        surface.blit(self.background, (0, 0))
+
+        width, height = surface.get_size()
+        text = f"{menu_lang_manager.get_text('loading')}... {int(progress * 100)}%"
+        self.renderer.render_text(
+            text=text,
+            font_type='option',
+            color=self.theme.text_color,
+            pos=(width // 2, height // 2 - 60),
+            surface=surface,
+            centered=True,
+            shadow=True
+        )
+
+        # * Progress bar (outline + fill)
+        bar = pygame.Rect(0, 0, *self.bar_size)
+        bar.center = (width // 2, height // 2)
+        fill = bar.inflate(-6, -6)
+        fill.width = int(fill.width * max(0.0, min(1.0, progress)))
+        pygame.draw.rect(surface, self.theme.text_color, bar, 2, border_radius=6)
+        if fill.width > 0: pygame.draw.rect(surface, self.theme.highlight_color, fill, border_radius=4)
+        compositor.track("loading", bar.inflate(0, 160).move(0, -50), int(progress * 100))
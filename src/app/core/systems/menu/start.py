@@ -6,7 +6,7 @@ import pygame
 from pygame import Surface
 
 from app.core.systems.ui.volume_control import VolumeControl
-from tools import AssetManager
+from tools import AssetManager, image_cache
 from project import set_app_lang
 from project.theme.ui import UITheme
 from project.settings.lang import Language
@@ -195,7 +195,7 @@ class StartMenuManager:
         try:
             # img_name = f"some-pirate-{random.randint(0, 2):02d}.png"
             img_name = f"bg.jpg"
-            bg_image = pygame.image.load(AssetManager.get_image(img_name))
+            bg_image = image_cache.get(AssetManager.get_image(img_name), alpha=False)
             bg_scaled = pygame.transform.scale(bg_image, self.surface.get_size())
             print(f"Background loaded: {img_name}")
             return bg_scaled
@@ -1,10 +1,17 @@
 from enum import Enum
-from typing import Optional, Tuple, Dict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import pygame
 from pydantic import BaseModel, Field
 from pygame import Surface, font
+from app.core.engine.camera import Camera
+from app.core.engine.compositor import compositor
+from app.core.engine.render_queue import RenderLayer, RenderQueue
+from app.core.systems.ui.widget import WidgetCache
 from tools import AssetManager
 
+ALPHA_STEPS: int = 16  # * Fades go through this many alpha levels (each one cached once per hint look)
+
 class HintPosition(Enum):
     """Define possible hint positions relative to target"""
     ABOVE = "above"
@@ -24,25 +31,50 @@ class HintStyle(BaseModel):
     offset: int = Field(default=50)  # Distance from target
     fade_speed: float = Field(default=2.0)
 
-class Hint(BaseModel):
-    """Base class for creating floating hints"""
-    text: str = Field(...)
-    position: HintPosition = Field(default=HintPosition.ABOVE)
-    style: HintStyle = Field(default_factory=HintStyle)
-    font: Optional[pygame.font.Font] = None
-    _surface: Optional[Surface] = None
-    alpha: float = Field(default=0.0)
-    visible: bool = Field(default=False)
-
-    class Config:
-        arbitrary_types_allowed = True
-
-    def __init__(self, **data):
-        super().__init__(**data)
-        self.font = font.Font(AssetManager.get_font(self.style.font_name), self.style.font_size)
-        self._create_surface()
-
-    def _create_surface(self) -> None:
+class Hint:
+    """Base class for creating floating hints (hints with the same text & style share their surfaces)"""
+    __slots__ = ("text", "position", "style", "anchor", "alpha", "visible", "_look")
+
+    def __init__(
+            self, text: str, position: HintPosition = HintPosition.ABOVE, style: Optional[HintStyle] = None,
+            anchor: Optional[pygame.math.Vector2] = None, alpha: float = 0.0, visible: bool = False
+    ):
+        self.text = text
+        self.position = position
+        self.style = style if style is not None else HintStyle()  # * Config: stays a pydantic model
+        self.anchor = anchor  # * World position the hint floats over (see HintManager.draw_world)
+        self.alpha = alpha
+        self.visible = visible
+        self._look = (text, *self.style.model_dump().values())  # * Cache key of the rendered surfaces
+
+    @property
+    def font(self) -> font.Font: return hint_font(self.style.font_name, self.style.font_size)
+
+    def get_state(self) -> Dict[str, Any]:
+        """Arguments rebuilding this hint as it is now"""
+        return {
+            "text": self.text, "position": self.position, "style": self.style.model_copy(),
+            "anchor": pygame.math.Vector2(self.anchor) if self.anchor is not None else None,
+            "alpha": self.alpha, "visible": self.visible
+        }
+
+    def get_surface(self) -> Surface:
+        """Fully opaque hint surface (rendered once per text & style)"""
+        return hint_cache.get(self._look, self._create_surface)
+
+    def get_faded_surface(self) -> Optional[Surface]:
+        """Hint surface at the current alpha, quantized to ALPHA_STEPS levels (None: invisible)"""
+        level = round(self.alpha * ALPHA_STEPS / 255)
+        if level <= 0: return None
+        if level >= ALPHA_STEPS: return self.get_surface()
+        return hint_cache.get((self._look, level), lambda: self._fade(level * 255 // ALPHA_STEPS))
+
+    def _fade(self, alpha: int) -> Surface:
+        faded = self.get_surface().copy()
+        faded.set_alpha(alpha)
+        return faded
+
+    def _create_surface(self) -> Surface:
         # Create text surface
         text_surface = self.font.render(self.text, True, self.style.text_color)
         text_rect = text_surface.get_rect()
@@ -52,31 +84,30 @@ class Hint(BaseModel):
         height = text_rect.height + (self.style.padding * 2)
         
         # Create surface
-        self._surface = Surface((width, height), pygame.SRCALPHA)
+        surface = Surface((width, height), pygame.SRCALPHA)
         
         # Draw background
         pygame.draw.rect(
-            self._surface,
+            surface,
             (*self.style.bg_color, self.style.bg_alpha),
-            self._surface.get_rect(),
+            surface.get_rect(),
             border_radius=self.style.border_radius
         )
 
         # Draw text
-        self._surface.blit(text_surface, (self.style.padding, self.style.padding))
+        surface.blit(text_surface, (self.style.padding, self.style.padding))
+        return surface
 
     def update(self, dt: float) -> None:
         target_alpha = 255.0 if self.visible else 0.0
+        if self.alpha == target_alpha: return  # * Settled (most hints, most of the time)
         self.alpha += (target_alpha - self.alpha) * self.style.fade_speed * dt
         self.alpha = max(0.0, min(255.0, self.alpha))
+        if abs(target_alpha - self.alpha) < 255 / ALPHA_STEPS / 2: self.alpha = target_alpha  # * Same level: snap
 
     def get_position(self, target_pos: Tuple[int, int]) -> Tuple[int, int]:
-        if not self._surface:
-            return target_pos
-
         x, y = target_pos
-        width = self._surface.get_width()
-        height = self._surface.get_height()
+        width, height = self.get_surface().get_size()
 
         match self.position:
             case HintPosition.ABOVE:
@@ -88,27 +119,45 @@ class Hint(BaseModel):
             case HintPosition.RIGHT:
                 return (x + self.style.offset, y - height // 2)
 
-    def draw(self, surface: Surface, position: Tuple[int, int]) -> None:
-        if self.alpha <= 0 or not self._surface:
-            return
+    def draw(self, surface: Surface, position: Tuple[int, int], queue: Optional[RenderQueue] = None) -> None:
+        draw_hints(surface, [(self, position)], queue)
+
+
+@lru_cache(maxsize=None)
+def hint_font(font_name: str, size: int) -> font.Font:
+    return font.Font(AssetManager.get_font(font_name), size)
+
+
+def draw_hints(surface: Surface, hints: Iterable[Tuple[Hint, Tuple[int, int]]], queue: Optional[RenderQueue] = None) -> None:
+    """Draw (hint, target position) pairs: submitted to `queue` (over every actor) or drawn with a single blits call"""
+    batch: List[Tuple[Surface, Tuple[int, int]]] = []
+    drawn: List[Hint] = []
+    for hint, position in hints:
+        faded = hint.get_faded_surface()
+        if faded is None: continue
+        draw_pos = hint.get_position(position)
+        if queue is not None: queue.submit(RenderLayer.OVERLAY, draw_pos[1], faded, draw_pos, ("hint", id(hint)), faded)
+        else:
+            batch.append((faded, draw_pos))
+            drawn.append(hint)
+    if not batch: return
+    for hint, (faded, _), rect in zip(drawn, batch, surface.blits(batch)): compositor.track(("hint", id(hint)), rect, faded)
 
-        # Create alpha copy
-        display_surface = self._surface.copy()
-        display_surface.set_alpha(int(self.alpha))
-        
-        # Get draw position
-        draw_pos = self.get_position(position)
-        
-        # Draw hint
-        surface.blit(display_surface, draw_pos)
 
 class HintManager(BaseModel):
     """Manages multiple hints"""
     hints: Dict[str, Hint] = Field(default_factory=dict)
+    cull_margin: int = Field(default=200)  # * Screen pixels around the view where anchored hints are still drawn
+
+    class Config:
+        arbitrary_types_allowed = True
 
     def add_hint(self, key: str, hint: Hint) -> None:
         self.hints[key] = hint
 
+    def remove_hint(self, key: str) -> None:
+        self.hints.pop(key, None)
+
     def show_hint(self, key: str) -> None:
         if key in self.hints:
             self.hints[key].visible = True
@@ -121,7 +170,26 @@ class HintManager(BaseModel):
         for hint in self.hints.values():
             hint.update(dt)
 
-    def draw(self, surface: Surface, positions: Dict[str, Tuple[int, int]]) -> None:
-        for key, hint in self.hints.items():
-            if key in positions:
-                hint.draw(surface, positions[key])
+    def get_state(self) -> Dict[str, Dict[str, Any]]:
+        return {key: hint.get_state() for key, hint in self.hints.items()}
+
+    def draw(self, surface: Surface, positions: Dict[str, Tuple[int, int]], queue: Optional[RenderQueue] = None) -> None:
+        """Draw the hints of `positions` (screen target positions) in one batch"""
+        draw_hints(surface, ((self.hints[key], position) for key, position in positions.items() if key in self.hints), queue)
+
+    def draw_world(self, surface: Surface, camera: Camera, queue: Optional[RenderQueue] = None) -> None:
+        """Draw every anchored hint (loot labels, NPC names...) over its world position, skipping the off-screen ones"""
+        width, height = surface.get_size()
+        cam_x, cam_y = camera.render_position
+        zoom, margin = camera.zoom, self.cull_margin
+
+        def on_screen() -> Iterable[Tuple[Hint, Tuple[int, int]]]:
+            for hint in self.hints.values():
+                if hint.anchor is None or hint.alpha <= 0: continue
+                x, y = int((hint.anchor[0] - cam_x) * zoom), int((hint.anchor[1] - cam_y) * zoom)
+                if -margin <= x <= width + margin and -margin <= y <= height + margin: yield hint, (x, y)
+
+        draw_hints(surface, on_screen(), queue)
+
+
+hint_cache = WidgetCache(max_entries=2048)  # * Hint surfaces by look (and alpha level)
@@ -0,0 +1,108 @@
+# app/core/systems/ui/text.py
+from typing import Dict, List, Tuple
+import pygame
+from pygame import Surface, font
+
+from tools import AssetManager
+
+Color = Tuple[int, int, int]
+
+
+class TextEngine:
+    """Shared font, glyph and text surface caches"""
+    def __init__(self, max_texts: int = 256):
+        self.max_texts = max_texts
+        self._fonts: Dict[Tuple[str, int], font.Font] = {}
+        self._glyphs: Dict[Tuple[str, int, Color, str], Surface] = {}
+        self._texts: Dict[Tuple[str, int, Color, str], Surface] = {}
+        self._faded: Dict[Tuple[str, int, Color, str], Surface] = {}  # * Copies of the texts, owned to set their alpha
+
+    def font(self, font_name: str, size: int) -> font.Font:
+        """Get a (cached) font from the assets fonts directory"""
+        key = (font_name, size)
+        if key not in self._fonts:
+            self._fonts[key] = font.Font(AssetManager.get_font(font_name), size)
+        return self._fonts[key]
+
+    def glyph(self, font_name: str, size: int, color: Color, char: str) -> Surface:
+        """Get the rendered surface of a single character"""
+        key = (font_name, size, color, char)
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            glyph = self._glyphs[key] = self.font(font_name, size).render(char, True, color)
+        return glyph
+
+    def render(self, font_name: str, size: int, color: Color, text: str) -> Surface:
+        """Render a whole string once (small bounded cache for names, labels, indicators...)"""
+        key = (font_name, size, color, text)
+        surface = self._texts.get(key)
+        if surface is None:
+            if len(self._texts) >= self.max_texts:
+                self._texts.clear()
+                self._faded.clear()
+            surface = self._texts[key] = self.font(font_name, size).render(text, True, color)
+        return surface
+
+    def render_faded(self, font_name: str, size: int, color: Color, text: str, alpha: int) -> Surface:
+        """Get a rendered string at `alpha`, set on a copy owned by the engine (the shared render is never modified)"""
+        key = (font_name, size, color, text)
+        faded = self._faded.get(key)
+        if faded is None: faded = self._faded[key] = self.render(font_name, size, color, text).copy()
+        faded.set_alpha(alpha)
+        return faded
+
+    def layout(self, font_name: str, size: int, color: Color, text: str, max_width: int) -> "TextLayout":
+        return TextLayout(self, font_name, size, color, text, max_width)
+
+
+class TextLayout:
+    """Word-wrapped glyph layout of a text, computed once and revealed character by character"""
+    def __init__(self, engine: TextEngine, font_name: str, size: int, color: Color, text: str, max_width: int):
+        self.text = text
+        self.max_width = max_width
+        text_font = engine.font(font_name, size)
+        line_height = text_font.get_height()
+
+        # * (char index, glyph, position) for every visible glyph, in reading order
+        self.glyphs: List[Tuple[int, Surface, Tuple[int, int]]] = []
+        lines = self._wrap(text_font, text, max_width)
+        for row, (start, line) in enumerate(lines):
+            for i, char in enumerate(line):
+                if char == ' ': continue
+                x = text_font.size(line[:i])[0]
+                self.glyphs.append((start + i, engine.glyph(font_name, size, color, char), (x, row * line_height)))
+
+        width = max((text_font.size(line)[0] for _, line in lines), default=0)
+        self.surface = Surface((max(1, width), max(1, len(lines) * line_height)), pygame.SRCALPHA)
+        self.visible_chars = 0  # * Characters revealed so far
+        self._revealed = 0  # * Glyphs already blitted into self.surface
+
+    @staticmethod
+    def _wrap(text_font: font.Font, text: str, max_width: int) -> List[Tuple[int, str]]:
+        """Split text into (start index, line) pairs (same rules as the old per-frame wrapping)"""
+        lines: List[Tuple[int, str]] = []
+        line: List[str] = []
+        line_start = index = 0
+        for word in text.split(' '):
+            if line and text_font.size(' '.join(line + [word]))[0] > max_width:
+                lines.append((line_start, ' '.join(line)))
+                line, line_start = [], index
+            line.append(word)
+            index += len(word) + 1
+        if line: lines.append((line_start, ' '.join(line)))
+        return lines
+
+    def reveal(self, visible_chars: int) -> Surface:
+        """Blit the glyph run revealed since the last call and get the text surface (reveal only grows)"""
+        self.visible_chars = max(self.visible_chars, visible_chars)
+        end = self._revealed
+        while end < len(self.glyphs) and self.glyphs[end][0] < visible_chars: end += 1
+        if end > self._revealed:
+            # * BLEND_RGBA_MAX copies glyph pixels as-is onto the transparent layer (no dark antialias fringe)
+            run = [(glyph, pos, None, pygame.BLEND_RGBA_MAX) for _, glyph, pos in self.glyphs[self._revealed:end]]
+            self.surface.blits(run, doreturn=False)
+            self._revealed = end
+        return self.surface
+
+
+text_engine = TextEngine()
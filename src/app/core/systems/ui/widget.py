@@ -0,0 +1,45 @@
+# app/core/systems/ui/widget.py
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Hashable
+import pygame
+from pygame import Surface
+
+
+class WidgetCache:
+    """Composed HUD widget surfaces keyed by everything they depend on: each distinct key is rendered once"""
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._surfaces: OrderedDict[Hashable, Surface] = OrderedDict()  # * Least recently used first
+        self.renders = 0
+
+    def get(self, key: Hashable, render: Callable[[], Surface]) -> Surface:
+        """Get the surface of `key`, calling `render` only the first time (or after it was evicted)"""
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+
+        surface = self._surfaces[key] = render()
+        self.renders += 1
+        while len(self._surfaces) > self.max_entries: self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self) -> None: self._surfaces.clear()
+
+    def __len__(self) -> int: return len(self._surfaces)
+
+
+@lru_cache(maxsize=None)
+def default_font(size: int) -> pygame.font.Font:
+    """pygame's default font at `size` (built once per size)"""
+    return pygame.font.Font(None, size)
+
+
+def approach(current: float, target: float, max_step: float) -> float:
+    """Move `current` toward `target` by at most `max_step` (animated widget values)"""
+    if current < target: return min(target, current + max_step)
+    return max(target, current - max_step)
+
+
+hud_cache = WidgetCache()
@@ -1,10 +1,12 @@
-from pydantic import BaseModel, Field
-
-class Ability(BaseModel):
+class Ability:
     """Represents a player ability with cooldown management"""
-    name: str
-    cooldown: float = Field(default=1.0, ge=0.0)
-    current_cooldown: float = Field(default=0.0, ge=0.0)
+    __slots__ = ("name", "cooldown", "current_cooldown")
+
+    def __init__(self, name: str, cooldown: float = 1.0, current_cooldown: float = 0.0):
+        if cooldown < 0 or current_cooldown < 0: raise ValueError(f"Ability {name!r}: cooldowns can't be negative")
+        self.name = name
+        self.cooldown = cooldown
+        self.current_cooldown = current_cooldown
     
     def update(self, dt: float) -> None:
         """Update ability cooldown"""
@@ -1,8 +1,13 @@
 from enum import Enum
+import heapq
 import os
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 import pygame
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
+
+from app.core.engine.compositor import compositor
+from app.core.systems.ui.widget import WidgetCache, default_font, hud_cache
+from tools import image_cache
 
 class ItemType(Enum):
     WEAPON = "weapon"
@@ -29,20 +34,19 @@ class Item(BaseModel):
     stackable: bool = False
     quantity: int = 1
     image_path: Optional[str] = None
-    _surface: Optional[pygame.Surface] = None
 
     class Config:
         arbitrary_types_allowed = True
 
     def get_surface(self, size: Tuple[int, int] = (48, 48)) -> pygame.Surface:
-        """Get or create item's surface representation"""
-        if self._surface is None:
-            if self.image_path and os.path.exists(self.image_path):
-                self._surface = pygame.image.load(self.image_path).convert_alpha()
-                self._surface = pygame.transform.scale(self._surface, size)
-            else:
-                self._surface = self._create_default_surface(size)
-        return self._surface
+        """Get the item's icon at `size` (shared by every item with the same image, or type when it has none)"""
+        size = tuple(size)
+        if self.image_path: return icon_cache.get(("image", self.image_path, size), lambda: self._create_surface(size))
+        return icon_cache.get(("type", self.type, size), lambda: self._create_default_surface(size))
+
+    def _create_surface(self, size: Tuple[int, int]) -> pygame.Surface:
+        if not os.path.exists(self.image_path): return self._create_default_surface(size)
+        return pygame.transform.scale(image_cache.get(self.image_path), size)
 
     def _create_default_surface(self, size: Tuple[int, int]) -> pygame.Surface:
         """Create a default visual representation for items without images"""
@@ -56,15 +60,140 @@ class Item(BaseModel):
         pygame.draw.rect(surface, (255, 255, 255, 128), surface.get_rect(), width=2, border_radius=8)
         
         # Add first letter of item type
-        font = pygame.font.Font(None, size[0] // 2)
-        text = font.render(self.type.value[0].upper(), True, (255, 255, 255))
+        text = default_font(size[0] // 2).render(self.type.value[0].upper(), True, (255, 255, 255))
         text_rect = text.get_rect(center=(size[0]//2, size[1]//2))
         surface.blit(text, text_rect)
         
         return surface
 
+
+icon_cache = WidgetCache(max_entries=256)  # * Item icons by (image or type, size): shared by every item instance
+
+
+class ItemStore:
+    """Ordered item slots indexed by id: O(1) lookups, O(log n) adds & removes (free slots are reused lowest first)"""
+    __slots__ = ("slots", "capacity", "changed", "_index", "_free")
+
+    def __init__(self, slots: List[Optional[Item]], capacity: int):
+        self.slots = slots  # * Shared with the owner (None: free slot), grows up to `capacity`
+        self.capacity = capacity
+        self.changed: Set[int] = set()  # * Slots modified since the owner last consumed them (e.g. redrew them)
+        self.reindex()
+
+    def reindex(self) -> None:
+        """Rebuild the id index and the free slots from `slots` (after editing them directly)"""
+        self._index: Dict[str, List[int]] = {}  # * Item id -> slots holding it
+        self._free: List[int] = []  # * Heap of the free slots below len(slots)
+        for slot, item in enumerate(self.slots):
+            if item is None: self._free.append(slot)  # * Ascending: already a heap
+            else: self._index.setdefault(item.id, []).append(slot)
+        self.changed.update(range(len(self.slots)))
+
+    @property
+    def free_slots(self) -> int:
+        return len(self._free) + max(0, self.capacity - len(self.slots))
+
+    def __len__(self) -> int: return len(self.slots) - len(self._free)
+
+    def _place(self, item: Item) -> None:
+        """Put an item in the lowest free slot"""
+        slot = heapq.heappop(self._free) if self._free else len(self.slots)
+        if slot == len(self.slots): self.slots.append(item)
+        else: self.slots[slot] = item
+        self._index.setdefault(item.id, []).append(slot)
+        self.changed.add(slot)
+
+    def _take(self, item_id: str) -> Item:
+        """Empty the last slot filled with an item id"""
+        slots = self._index[item_id]
+        slot = slots.pop()
+        if not slots: del self._index[item_id]
+        item, self.slots[slot] = self.slots[slot], None
+        heapq.heappush(self._free, slot)
+        self.changed.add(slot)
+        return item
+
+    def _slots_needed(self, entries: Iterable[Tuple[str, bool, int]]) -> int:
+        """Free slots needed to store (item id, stackable, separate items) entries"""
+        needed, stacks = 0, set()
+        for item_id, stackable, count in entries:
+            if not stackable: needed += count
+            elif item_id not in self._index and item_id not in stacks:
+                stacks.add(item_id)
+                needed += 1
+        return needed
+
+    def _slots_moved(self, item_id: str, quantity: int) -> int:
+        """Separate items `_remove` takes for `quantity` units: the whole slots emptied, plus one for a split stack"""
+        moved = 0
+        for slot in reversed(self._index[item_id]):
+            moved += 1
+            quantity -= self.slots[slot].quantity
+            if quantity <= 0: break
+        return moved
+
+    def _remove(self, item_id: str, quantity: int) -> List[Item]:
+        """Take `quantity` units of an item id (checked by the caller), splitting a stack if needed"""
+        removed = []
+        while quantity > 0:
+            slot = self._index[item_id][-1]
+            item = self.slots[slot]
+            if item.quantity > quantity:
+                item.quantity -= quantity
+                self.changed.add(slot)
+                removed.append(item.model_copy(update={"quantity": quantity}))
+                break
+            quantity -= item.quantity
+            removed.append(self._take(item_id))
+        return removed
+
+    def get(self, item_id: str) -> Optional[Item]:
+        slots = self._index.get(item_id)
+        return self.slots[slots[0]] if slots else None
+
+    def get_slot(self, slot: int) -> Optional[Item]:
+        return self.slots[slot] if 0 <= slot < len(self.slots) else None
+
+    def count(self, item_id: str) -> int:
+        """Units held of an item id (stack quantities or separate items)"""
+        return sum(self.slots[slot].quantity for slot in self._index.get(item_id, ()))
+
+    def can_add(self, items: Iterable[Item]) -> bool:
+        return self._slots_needed((item.id, item.stackable, 1) for item in items) <= self.free_slots
+
+    def add(self, items: Iterable[Item]) -> bool:
+        """Add every item (stackables merge by id) or none of them if they don't fit"""
+        items = list(items)
+        if not self.can_add(items): return False
+        for item in items:
+            stack = self._index.get(item.id) if item.stackable else None
+            if stack:
+                self.slots[stack[0]].quantity += item.quantity
+                self.changed.add(stack[0])
+            else: self._place(item)
+        return True
+
+    def remove(self, quantities: Dict[str, int]) -> bool:
+        """Remove units of several item ids, or none of them if one is short"""
+        quantities = {item_id: quantity for item_id, quantity in quantities.items() if quantity > 0}
+        if any(self.count(item_id) < quantity for item_id, quantity in quantities.items()): return False
+        for item_id, quantity in quantities.items(): self._remove(item_id, quantity)
+        return True
+
+    def transfer(self, other: 'ItemStore', quantities: Dict[str, int]) -> bool:
+        """Move units of several item ids to another store, all or nothing (both sides are checked first)"""
+        quantities = {item_id: quantity for item_id, quantity in quantities.items() if quantity > 0}
+        if any(self.count(item_id) < quantity for item_id, quantity in quantities.items()): return False
+        entries = (
+            (item_id, self.get(item_id).stackable, self._slots_moved(item_id, quantity)) for item_id, quantity in quantities.items()
+        )
+        if other._slots_needed(entries) > other.free_slots: return False
+        return other.add([item for item_id, quantity in quantities.items() for item in self._remove(item_id, quantity)])
+
+
 class Inventory(BaseModel):
-    items: List[Item] = Field(default_factory=list)
+    # * Grid order (None: free slot). Saves from before the slot grid stored a plain `items` list: still accepted
+    slots: List[Optional[Item]] = Field(default_factory=list, validation_alias=AliasChoices("slots", "items"))
     capacity: int = Field(default=20)
     visible: bool = Field(default=False)
     selected_index: int = Field(default=-1)
@@ -76,113 +205,143 @@ class Inventory(BaseModel):
     background_color: Tuple[int, int, int, int] = (20, 20, 20, 230)
     border_color: Tuple[int, int, int] = (64, 64, 64)
     highlight_color: Tuple[int, int, int] = (255, 255, 255)
+
+    # * Runtime index over `slots` (a field, not a private attribute: those are slow to reach on hot paths)
+    store: Optional[ItemStore] = Field(default=None, exclude=True, repr=False)
+
+    # * Retained panel: the slots changed in the store are redrawn
+    _panel: Optional[pygame.Surface] = None
+    _version: int = 0  # * Bumped on every panel change (compositor)
     
     class Config:
         arbitrary_types_allowed = True
 
     def __init__(self, **data):
         super().__init__(**data)
-        # todo: Add some default items for testing
-        self.items = [
+        self.store = ItemStore(self.slots, self.capacity)
+        # todo: Add some default items for testing (only for inventories created without slots, e.g. not merchant stocks or saves)
+        if not data.keys() & {"slots", "items"}: self.add_items([
             Item(id="sword", name="Sword", type=ItemType.WEAPON, description="A sharp sword", value=10, stackable=False),
             Item(id="sword", name="Sword", type=ItemType.WEAPON, description="A sharp sword", value=10, stackable=False),
             Item(id="shield", name="Shield", type=ItemType.ARMOR, description="A sturdy shield", value=15, stackable=False),
             Item(id="potion", name="Potion", type=ItemType.CONSUMABLE, description="A healing potion", value=5, stackable=True, quantity=3),
             Item(id="key", name="Key", type=ItemType.QUEST, description="A mysterious key", value=0, stackable=False)
-        ]
+        ])
+
+    @property
+    def items(self) -> List[Item]:
+        """Every stored item, in grid order"""
+        return [item for item in self.slots if item is not None]
 
     def toggle_visibility(self) -> None:
         """Toggle inventory visibility"""
         self.visible = not self.visible
-        self.selected_index = -1  # Reset selection when toggling
+        self.select(-1)  # Reset selection when toggling
 
-    def add_item(self, item: Item) -> bool:
-        if len(self.items) >= self.capacity:
-            return False
-            
-        if item.stackable:
-            for existing_item in self.items:
-                if existing_item.id == item.id:
-                    existing_item.quantity += item.quantity
-                    return True
-                    
-        self.items.append(item)
-        return True
+    def select(self, index: int) -> None:
+        """Select a slot (-1: none), redrawing the old and new highlighted cells"""
+        if index == self.selected_index: return
+        self.invalidate(self.selected_index, index)
+        self.selected_index = index
 
-    def remove_item(self, item_id: str, quantity: int = 1) -> bool:
-        for item in self.items:
-            if item.id == item_id:
-                if item.stackable:
-                    if item.quantity <= quantity:
-                        self.items.remove(item)
-                    else:
-                        item.quantity -= quantity
-                else:
-                    self.items.remove(item)
-                return True
-        return False
-
-    def get_item(self, item_id: str) -> Optional[Item]:
-        return next((item for item in self.items if item.id == item_id), None)
+    def invalidate(self, *slots: int) -> None:
+        """Mark slots to redraw on the panel (no slot: the whole panel)"""
+        if not slots: self._panel = None
+        self.store.changed.update(slot for slot in slots if slot >= 0)
 
-    def draw(self, surface: pygame.Surface) -> None:
-        """Draw the inventory interface if visible"""
-        if not self.visible: return
+    def add_item(self, item: Item) -> bool: return self.store.add([item])
 
-        screen_width, screen_height = surface.get_size()
+    def add_items(self, items: Iterable[Item]) -> bool: return self.store.add(items)
+
+    def remove_item(self, item_id: str, quantity: int = 1) -> bool: return self.store.remove({item_id: quantity})
+
+    def remove_items(self, quantities: Dict[str, int]) -> bool: return self.store.remove(quantities)
+
+    def transfer(self, other: 'Inventory', quantities: Dict[str, int]) -> bool:
+        """Move items to another inventory (e.g. buying from a merchant stock), all or nothing"""
+        return self.store.transfer(other.store, quantities)
+
+    def count(self, item_id: str) -> int: return self.store.count(item_id)
+
+    def get_item(self, item_id: str) -> Optional[Item]: return self.store.get(item_id)
+
+    def _panel_rect(self, screen_size: Tuple[int, int]) -> pygame.Rect:
+        """Inventory panel area (centered on the screen)"""
         grid_width, grid_height = self.grid_size
         cell_width, cell_height = self.cell_size
-        
-        # Calculate inventory panel dimensions and position
         inv_width = (cell_width + self.padding) * grid_width + self.padding
         inv_height = (cell_height + self.padding) * grid_height + self.padding
-        inv_x = (screen_width - inv_width) // 2
-        inv_y = (screen_height - inv_height) // 2
-        
-        # Draw semi-transparent background
-        background = pygame.Surface((inv_width, inv_height), pygame.SRCALPHA)
-        pygame.draw.rect(background, self.background_color, 
-                        background.get_rect(), border_radius=10)
-        surface.blit(background, (inv_x, inv_y))
-        
-        # Draw grid cells
-        for y in range(grid_height):
-            for x in range(grid_width):
-                cell_index = y * grid_width + x
-                cell_x = inv_x + x * (cell_width + self.padding) + self.padding
-                cell_y = inv_y + y * (cell_height + self.padding) + self.padding
-                
-                # Draw cell background
-                cell_rect = pygame.Rect(cell_x, cell_y, cell_width, cell_height)
-                pygame.draw.rect(surface, self.border_color, cell_rect, 
-                               border_radius=8)
-                
-                # Draw item if exists
-                if cell_index < len(self.items):
-                    item = self.items[cell_index]
-                    item_surface = item.get_surface((cell_width-12, cell_height-12))
-                    surface.blit(item_surface, 
-                               (cell_x + 6, cell_y + 6))
-                    
-                    # Draw quantity for stackable items
-                    if item.stackable and item.quantity > 1:
-                        font = pygame.font.Font(None, 20)
-                        qty_text = font.render(str(item.quantity), True, (255, 255, 255))
-                        surface.blit(qty_text, (cell_x + cell_width - 20, cell_y + cell_height - 20))
-                
-                # Highlight selected cell
-                if cell_index == self.selected_index:
-                    pygame.draw.rect(surface, self.highlight_color, cell_rect, 
-                                   width=2, border_radius=8)
-        
+        return pygame.Rect((screen_size[0] - inv_width) // 2, (screen_size[1] - inv_height) // 2, inv_width, inv_height)
+
+    def _cell_rect(self, slot: int) -> pygame.Rect:
+        """Cell area of a slot (panel coordinates)"""
+        cell_width, cell_height = self.cell_size
+        x, y = slot % self.grid_size[0], slot // self.grid_size[0]
+        return pygame.Rect(x * (cell_width + self.padding) + self.padding, y * (cell_height + self.padding) + self.padding, cell_width, cell_height)
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """Draw the inventory interface if visible (blits the retained panel, redrawing the invalidated slots only)"""
+        if not self.visible: return
+
+        panel_rect = self._panel_rect(surface.get_size())
+        if self._panel is None or self._panel.get_size() != panel_rect.size:
+            # Draw semi-transparent background
+            self._panel = pygame.Surface(panel_rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(self._panel, self.background_color, self._panel.get_rect(), border_radius=10)
+            self.store.changed.update(range(self.grid_size[0] * self.grid_size[1]))
+        if self.store.changed: self._redraw_slots()
+
+        compositor.track("inventory", surface.blit(self._panel, panel_rect), self._version)
+
         # Draw tooltip for selected item
-        if 0 <= self.selected_index < len(self.items):
-            self._draw_tooltip(surface, self.items[self.selected_index], 
-                             pygame.mouse.get_pos())
+        selected = self.store.get_slot(self.selected_index)
+        if selected is not None: self._draw_tooltip(surface, selected, pygame.mouse.get_pos())
+
+    def _redraw_slots(self) -> None:
+        """Redraw the invalidated grid cells on the panel"""
+        cell_width, cell_height = self.cell_size
+        for slot in self.store.changed:
+            if slot >= self.grid_size[0] * self.grid_size[1]: continue
+            cell_rect = self._cell_rect(slot)
+            self._panel.fill(self.background_color, cell_rect)  # * Clears the cell's rounded corners
+
+            # Draw cell background
+            pygame.draw.rect(self._panel, self.border_color, cell_rect, border_radius=8)
+
+            # Draw item if exists
+            item = self.store.get_slot(slot)
+            if item is not None:
+                self._panel.blit(item.get_surface((cell_width-12, cell_height-12)), (cell_rect.x + 6, cell_rect.y + 6))
+
+                # Draw quantity for stackable items
+                if item.stackable and item.quantity > 1:
+                    qty_text = default_font(20).render(str(item.quantity), True, (255, 255, 255))
+                    self._panel.blit(qty_text, (cell_rect.right - 20, cell_rect.bottom - 20))
+
+            # Highlight selected cell
+            if slot == self.selected_index:
+                pygame.draw.rect(self._panel, self.highlight_color, cell_rect, width=2, border_radius=8)
+
+        self.store.changed.clear()
+        self._version += 1
 
     def _draw_tooltip(self, surface: pygame.Surface, item: Item, pos: Tuple[int, int]) -> None:
-        """Draw item tooltip with details"""
-        font = pygame.font.Font(None, 24)
+        """Draw item tooltip with details (rendered once per item content)"""
+        key = ("inventory.tooltip", item.id, item.name, item.type, item.value, item.description)
+        tooltip_surface = hud_cache.get(key, lambda: self._render_tooltip(item))
+        tooltip_width, tooltip_height = tooltip_surface.get_size()
+
+        # Adjust position to keep tooltip on screen
+        x, y = pos
+        screen_width, screen_height = surface.get_size()
+        if x + tooltip_width > screen_width: x = screen_width - tooltip_width
+        if y + tooltip_height > screen_height: y = screen_height - tooltip_height
+
+        compositor.track("inventory.tooltip", surface.blit(tooltip_surface, (x, y)), item.id)
+
+    @staticmethod
+    def _render_tooltip(item: Item) -> pygame.Surface:
+        font = default_font(24)
         tooltip_padding = 10
         line_height = 25
         
@@ -197,12 +356,6 @@ class Inventory(BaseModel):
         max_width = max(font.size(line)[0] for line in lines)
         tooltip_width = max_width + tooltip_padding * 2
         tooltip_height = len(lines) * line_height + tooltip_padding * 2
-        
-        # Adjust position to keep tooltip on screen
-        x, y = pos
-        screen_width, screen_height = surface.get_size()
-        if x + tooltip_width > screen_width: x = screen_width - tooltip_width
-        if y + tooltip_height > screen_height: y = screen_height - tooltip_height
 
         # Draw tooltip background
         tooltip_surface = pygame.Surface((tooltip_width, tooltip_height), pygame.SRCALPHA)
@@ -213,37 +366,30 @@ class Inventory(BaseModel):
         for i, line in enumerate(lines):
             text = font.render(line, True, (255, 255, 255))
             tooltip_surface.blit(text, (tooltip_padding, tooltip_padding + i * line_height))
-        
-        surface.blit(tooltip_surface, (x, y))
+        return tooltip_surface
 
     def handle_click(self, pos: Tuple[int, int]) -> None:
         """Handle mouse click in inventory grid"""
         if not self.visible:
             return
 
-        screen_width, screen_height = pygame.display.get_surface().get_size()
+        panel_rect = self._panel_rect(pygame.display.get_surface().get_size())
         grid_width, grid_height = self.grid_size
         cell_width, cell_height = self.cell_size
         
-        inv_width = (cell_width + self.padding) * grid_width + self.padding
-        inv_height = (cell_height + self.padding) * grid_height + self.padding
-        inv_x = (screen_width - inv_width) // 2
-        inv_y = (screen_height - inv_height) // 2
-        
         # Convert click position to grid coordinates
-        rel_x = pos[0] - inv_x - self.padding
-        rel_y = pos[1] - inv_y - self.padding
+        rel_x = pos[0] - panel_rect.x - self.padding
+        rel_y = pos[1] - panel_rect.y - self.padding
         
         if rel_x < 0 or rel_y < 0:
-            self.selected_index = -1
+            self.select(-1)
             return
             
         grid_x = rel_x // (cell_width + self.padding)
         grid_y = rel_y // (cell_height + self.padding)
         
         if 0 <= grid_x < grid_width and 0 <= grid_y < grid_height:
-            self.selected_index = grid_y * grid_width + grid_x
-            if self.selected_index >= len(self.items):
-                self.selected_index = -1
+            index = grid_y * grid_width + grid_x
+            self.select(index if self.store.get_slot(index) is not None else -1)
         else:
-            self.selected_index = -1
+            self.select(-1)
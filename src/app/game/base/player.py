@@ -1,16 +1,19 @@
 from enum import Enum
-from typing import Dict, Optional, Tuple
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 import pygame
-from pydantic import BaseModel, Field
 
 from app.core.engine.camera import Camera
+from app.core.engine.compositor import compositor
+from app.core.engine.render_queue import RenderLayer, RenderQueue
 from app.core.systems.entities import Actor
+from app.core.systems.entities.atlas import frame_atlas
 # todo: Handle this as a same module (mecanics) or something like that...
 from app.game.base.abilities import Ability
 from app.game.base.inventory import Inventory
 from app.game.base.reputation import Reputation
 
-from tools import AssetManager
+from tools import AssetManager, image_cache
 from tools.console import *
 
 
@@ -25,18 +28,14 @@ class PlayerDirection(Enum):
     UP = "up"
     SIDE = "side"
 
-class PlayerSprite(BaseModel):
+class PlayerSprite:
     """Enhanced sprite system for player character with multiple sprite sheets"""
-    sprite_sheets: Dict[str, Optional[pygame.Surface]] = Field(default_factory=dict)
-    frame_size: Tuple[int, int] = (64, 64)  # Sprite size is 64x64
-    current_state: PlayerState = Field(default=PlayerState.IDLE)
-    current_direction: PlayerDirection = Field(default=PlayerDirection.DOWN)
-    current_frame: int = Field(default=0)
-    animation_speed: float = Field(default=0.1)
-    animation_timer: float = Field(default=0.0)
-    flip_horizontal: bool = Field(default=False)
-    
-    # Frame counts for each animation type
+    __slots__ = (
+        "sprite_sheets", "frame_size", "current_state", "current_direction", "current_frame",
+        "animation_speed", "animation_timer", "flip_horizontal", "sheet_paths"
+    )
+
+    # Frame counts for each animation type (shared, read only)
     frame_counts: Dict[PlayerState, int] = {
         PlayerState.IDLE: 4,
         PlayerState.WALK: 4,
@@ -44,8 +43,19 @@ class PlayerSprite(BaseModel):
         PlayerState.PICKUP: 4
     }
 
-    class Config:
-        arbitrary_types_allowed = True
+    def __init__(
+            self, frame_size: Tuple[int, int] = (64, 64), current_state: PlayerState = PlayerState.IDLE,
+            current_direction: PlayerDirection = PlayerDirection.DOWN, animation_speed: float = 0.1
+    ):
+        self.sprite_sheets: Dict[str, Optional[pygame.Surface]] = {}
+        self.frame_size = frame_size  # Sprite size is 64x64
+        self.current_state = current_state
+        self.current_direction = current_direction
+        self.current_frame = 0
+        self.animation_speed = animation_speed
+        self.animation_timer = 0.0
+        self.flip_horizontal = False
+        self.sheet_paths: Dict[str, str] = {}  # Image cache paths of the acquired sheets
 
     def load_sprite_sheets(self):
         """Load all required sprite sheets"""
@@ -59,20 +69,59 @@ class PlayerSprite(BaseModel):
                 sheet_name = f"_{direction.value} {state.value}.png"
                 try:
                     path = AssetManager.get_image(f"static/main-character/{sheet_name}")
-                    sheet = pygame.image.load(path).convert_alpha()
+                    sheet = image_cache.acquire(path)
                     self.sprite_sheets[f"{direction.value}_{state.value}"] = sheet
+                    self.sheet_paths[f"{direction.value}_{state.value}"] = str(path)
                 except Exception as e:
                     self.sprite_sheets[f"{direction.value}_{state.value}"] = None
 
         # Load pickup animation separately
         try:
             pickup_path = AssetManager.get_image("static/main-character/_pick up.png")
-            pickup_sheet = pygame.image.load(pickup_path).convert_alpha()
+            pickup_sheet = image_cache.acquire(pickup_path)
             self.sprite_sheets["pickup"] = pickup_sheet
+            self.sheet_paths["pickup"] = str(pickup_path)
         except Exception as e:
             print(f"Error loading pickup animation: {e}")
             self.sprite_sheets["pickup"] = None
 
+    @staticmethod
+    def asset_paths() -> List[Path]:
+        """Get every sheet path used by load_sprite_sheets (e.g. to preload them)"""
+        return [
+            AssetManager.get_image(f"static/main-character/_{direction.value} {state.value}.png")
+            for direction in PlayerDirection for state in PlayerState if state != PlayerState.PICKUP
+        ] + [AssetManager.get_image("static/main-character/_pick up.png")]
+
+    def release_sprite_sheets(self) -> None:
+        """Release every sheet reference held in the image cache"""
+        for path in self.sheet_paths.values(): image_cache.release(path)
+        self.sheet_paths.clear()
+
+    def bake(self, scale: float) -> None:
+        """Pre-scale every loaded sheet into the shared frame atlas (flipped copies only for side sheets)"""
+        for key, sheet in self.sprite_sheets.items():
+            if sheet is None: continue
+            state = PlayerState.PICKUP if key == "pickup" else PlayerState(key.split("_", 1)[1])
+            coords = [(i, 0) for i in range(self.frame_counts[state])]
+            flips = (False, True) if key == "pickup" or key.startswith(PlayerDirection.SIDE.value) else (False,)
+            frame_atlas.bake(self._atlas_key(key), sheet, self.frame_size, scale, coords, flips)
+
+    def _atlas_key(self, sheet_key: str) -> str: return f"player/{sheet_key}"
+
+    def _current_sheet_key(self) -> str:
+        if self.current_state == PlayerState.PICKUP: return "pickup"
+        return f"{self.current_direction.value}_{self.current_state.value}"
+
+    def get_scaled_frame(self, scale: float) -> pygame.Surface:
+        """Get the current frame already scaled (and flipped) from the atlas"""
+        frame = frame_atlas.get(self._atlas_key(self._current_sheet_key()), self.current_frame, 0, self.flip_horizontal, scale)
+        if frame is not None: return frame
+
+        # * Fallback: scale on the fly (missing sheets or out of bounds frames)
+        size = (int(self.frame_size[0] * scale), int(self.frame_size[1] * scale))
+        return pygame.transform.scale(self.get_current_frame(), size)
+
     def update(self, dt: float):
         """Update animation frame"""
         self.animation_timer += dt
@@ -154,32 +203,38 @@ class PlayerSprite(BaseModel):
 
 
 class Player(Actor):
-    sprite: Optional[PlayerSprite] = Field(default=None)
-    scale_factor: float = Field(default=3.0)  # No scaling needed since sprites are 64x64
-    
-    reputation: Reputation = Field(default_factory=Reputation)
-    inventory: Inventory = Field(default_factory=Inventory)
-    abilities: Dict[str, Ability] = Field(default_factory=dict)
-    pickup_cooldown: float = Field(default=0.0)
-
-    class Config:
-        arbitrary_types_allowed = True
-
-    def __init__(self, **data):
-        super().__init__(**data)
-        if self.sprite is None:
-            self.sprite = PlayerSprite()
+    __slots__ = ("scale_factor", "reputation", "inventory", "abilities", "pickup_cooldown")
+
+    def __init__(
+            self, sprite: Optional[PlayerSprite] = None, scale_factor: float = 3.0,
+            reputation: Optional[Reputation] = None, inventory: Optional[Inventory] = None,
+            abilities: Optional[Dict[str, Ability]] = None, pickup_cooldown: float = 0.0, **data
+    ):
+        super().__init__(sprite=sprite if sprite is not None else PlayerSprite(), **data)
+        self.scale_factor = scale_factor  # No scaling needed since sprites are 64x64
+
+        # * Reputation & inventory are game (save) data: they stay pydantic models
+        self.reputation = reputation if reputation is not None else Reputation()
+        self.inventory = inventory if inventory is not None else Inventory()
+        self.abilities = abilities if abilities is not None else {}
+        self.pickup_cooldown = pickup_cooldown
         self.load_sprites()
 
     def load_sprites(self):
         """Load all player sprite sheets"""
         try:
             self.sprite.load_sprite_sheets()
+            self.sprite.bake(self.scale_factor)  # * Pre-scale frames once
         except Exception as e:
             print(f"Error loading player sprites: {e}")
 
+    def release_assets(self) -> None:
+        """Release the sprite sheets held in the image cache"""
+        if self.sprite: self.sprite.release_sprite_sheets()
+
     def update(self, dt: float, keys: pygame.key.ScancodeWrapper) -> None:
         if not self.sprite: return
+        self.snapshot()
         # Movement
         dx = keys[pygame.K_d] - keys[pygame.K_a]
         dy = keys[pygame.K_s] - keys[pygame.K_w]
@@ -213,27 +268,26 @@ class Player(Actor):
         # Update abilities
         for ability in self.abilities.values():
             ability.update(dt)
+        self.reputation.update(dt)  # * Bar transition
 
-    def draw(self, surface: pygame.Surface, camera: Camera) -> None:
+    def draw(self, surface: pygame.Surface, camera: Camera, alpha: float = 1.0, queue: Optional[RenderQueue] = None) -> None:
         if not self.sprite:
             return
                 
-        current_frame = self.sprite.get_current_frame()
-        
-        # Scale the frame
-        scaled_size = (
-            int(self.sprite.frame_size[0] * self.scale_factor),
-            int(self.sprite.frame_size[1] * self.scale_factor)
-        )
-        scaled_frame = pygame.transform.scale(current_frame, scaled_size)
+        scale = self.scale_factor * camera.zoom  # * Frames are baked once per zoom level
+        if scale != self.scale_factor: self.sprite.bake(scale)
+        scaled_frame = self.sprite.get_scaled_frame(scale)
+        scaled_width, scaled_height = scaled_frame.get_size()
         
         # Convert world position to screen position
-        screen_pos = camera.world_to_screen(self.position)
+        screen_pos = camera.world_to_screen(self.get_render_position(alpha))
         
         # Center the scaled sprite
         draw_pos = (
-            screen_pos[0] - scaled_size[0] // 2,
-            screen_pos[1] - scaled_size[1] // 2
+            screen_pos[0] - scaled_width // 2,
+            screen_pos[1] - scaled_height // 2
         )
         
-        surface.blit(scaled_frame, draw_pos)
+        if queue is not None:  # * Y-sorted with the other actors (by the feet)
+            queue.submit(RenderLayer.ENTITIES, draw_pos[1] + scaled_height, scaled_frame, draw_pos, "player", scaled_frame)
+        else: compositor.track("player", surface.blit(scaled_frame, draw_pos), scaled_frame)
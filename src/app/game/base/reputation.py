@@ -2,14 +2,24 @@ from typing import Tuple
 import pygame
 from pydantic import BaseModel, Field
 
+from app.core.engine.compositor import compositor
+from app.core.systems.ui.widget import approach, default_font, hud_cache
+
+BAR_GLOW: int = 10  # * Glow margin around the bar (pixels)
+BAR_SPEED: float = 20.0  # * Points per second the displayed value moves toward the real one
+
 
 class Reputation(BaseModel):
     """Manages the player's reputation and standing in the game world"""
     value: int = Field(default=10, ge=0, le=100)
+    _shown: float = 0.0  # * Value currently displayed (animated toward `value`)
     
     class Config:
         arbitrary_types_allowed = True
 
+    def model_post_init(self, __context) -> None:
+        self._shown = float(self.value)
+
     def modify(self, amount: int) -> None:
         """Modify reputation value ensuring it stays within bounds"""
         self.value = max(0, min(100, self.value + amount))
@@ -20,61 +30,78 @@ class Reputation(BaseModel):
 
     def get_status(self) -> str:
         """Get reputation status based on value"""
-        if self.value <= 25: return "Chaotic"
-        elif self.value >= 75: return "Lawful"
-        return "Neutral"
+        return get_status(self.value)
+
+    def update(self, dt: float) -> None:
+        """Animate the displayed value toward the real one (one cached keyframe per whole point)"""
+        if self._shown != self.value: self._shown = approach(self._shown, self.value, BAR_SPEED * dt)
 
     def draw(self, surface: pygame.Surface, position: Tuple[int, int], size: Tuple[int, int] = (200, 30)) -> None:
-        """Draw a stylized reputation bar with gradient effect"""
-
-        def get_gradient_color() -> Tuple[Tuple[int, int, int], Tuple[int, int, int]]:
-            """Get primary and secondary colors based on value gradient"""
-            # Primary color transitions from red (low) to blue (high)
-            r = int(255 * (1 - self.value / 100))  # Decreases from 255 to 0
-            b = int(255 * (self.value / 100))      # Increases from 0 to 255
-            g = int(128 * min(self.value, 100 - self.value) / 50)  # Peaks at 50
-
-            return (r, g, b), (r//2, g//2, b//2)  # return primary & darkened secondary color
-
-        primary_color, secondary_color = get_gradient_color()
-
-        # * Unpack size tuple
-        width, height = size
-
-        # Create surfaces
-        glow_surface = pygame.Surface((width + 20, height + 20), pygame.SRCALPHA)
-        bar_surface = pygame.Surface((width, height), pygame.SRCALPHA)
-        
-        # Draw glow
-        pygame.draw.rect(glow_surface, (*primary_color, 50), (10, 10, width, height), border_radius=height//2)        
-        pygame.draw.rect(bar_surface, secondary_color, (0, 0, width, height), border_radius=height//2)
-        
-        # Draw filled portion
-        fill_width = int(width * (self.value / 100))
-        if fill_width > 0:
-            pygame.draw.rect(bar_surface, primary_color, (0, 0, fill_width, height), border_radius=height//2)
-        
-        # Draw border with gradient
-        border_width = 4
-        for i in range(border_width):
-            pygame.draw.rect(bar_surface, (*secondary_color, 255 - (i * 50)), (i, i, width - i*2, height - i*2), border_radius=height//2, width=1)
-        
-        font = pygame.font.Font(None, height - 4)
-
-        # Add status text
-        # todo: Add some more user-friendly status text (also add more types of status)
-        status = self.get_status()
-        status_text = font.render(status, True, (255, 255, 255))
-        text_rect = status_text.get_rect(center=(width//2, height//2))
-
-        # * Unpack position tuple
+        """Draw the reputation bar (composed once per distinct value & size, then blitted)"""
+        shown = round(self._shown)
+        bar = hud_cache.get(("reputation", shown, tuple(size)), lambda: render_bar(shown, tuple(size)))
         x, y = position
-        
-        # Apply surfaces
-        surface.blit(glow_surface, (x - 10, y - 10))
-        surface.blit(bar_surface, (x, y))
-        surface.blit(status_text, (x + text_rect.x, y + text_rect.y))
-        
-        # Draw value
-        value_text = font.render(f"{self.value:.2f}%", True, (255, 255, 255))
-        surface.blit(value_text, (x + width + 10, y + height//2 - value_text.get_height()//2))
+        rect = surface.blit(bar, (x - BAR_GLOW, y - BAR_GLOW), special_flags=pygame.BLEND_PREMULTIPLIED)
+        compositor.track("reputation", rect, shown)
+
+
+def get_status(value: int) -> str:
+    """Get reputation status based on value"""
+    if value <= 25: return "Chaotic"
+    elif value >= 75: return "Lawful"
+    return "Neutral"
+
+
+def render_bar(value: int, size: Tuple[int, int]) -> pygame.Surface:
+    """Compose a stylized reputation bar with gradient effect (glow, bar, status & value text) into one premultiplied surface"""
+
+    def get_gradient_color() -> Tuple[Tuple[int, int, int], Tuple[int, int, int]]:
+        """Get primary and secondary colors based on value gradient"""
+        # Primary color transitions from red (low) to blue (high)
+        r = int(255 * (1 - value / 100))  # Decreases from 255 to 0
+        b = int(255 * (value / 100))      # Increases from 0 to 255
+        g = int(128 * min(value, 100 - value) / 50)  # Peaks at 50
+
+        return (r, g, b), (r//2, g//2, b//2)  # return primary & darkened secondary color
+
+    primary_color, secondary_color = get_gradient_color()
+
+    # * Unpack size tuple
+    width, height = size
+
+    # Create surfaces
+    glow_surface = pygame.Surface((width + BAR_GLOW * 2, height + BAR_GLOW * 2), pygame.SRCALPHA)
+    bar_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    
+    # Draw glow
+    pygame.draw.rect(glow_surface, (*primary_color, 50), (BAR_GLOW, BAR_GLOW, width, height), border_radius=height//2)
+    pygame.draw.rect(bar_surface, secondary_color, (0, 0, width, height), border_radius=height//2)
+    
+    # Draw filled portion
+    fill_width = int(width * (value / 100))
+    if fill_width > 0:
+        pygame.draw.rect(bar_surface, primary_color, (0, 0, fill_width, height), border_radius=height//2)
+    
+    # Draw border with gradient
+    border_width = 4
+    for i in range(border_width):
+        pygame.draw.rect(bar_surface, (*secondary_color, 255 - (i * 50)), (i, i, width - i*2, height - i*2), border_radius=height//2, width=1)
+    
+    font = default_font(height - 4)
+
+    # Add status text
+    # todo: Add some more user-friendly status text (also add more types of status)
+    status_text = font.render(get_status(value), True, (255, 255, 255))
+    text_rect = status_text.get_rect(center=(width//2, height//2))
+    value_text = font.render(f"{value:.2f}%", True, (255, 255, 255))
+
+    # * Compose with premultiplied alpha: layering stays the same as blitting each part on the screen
+    # * (font surfaces are converted first: premul_alpha mishandles their pixel format)
+    composed = pygame.Surface((width + BAR_GLOW * 2 + value_text.get_width(), height + BAR_GLOW * 2), pygame.SRCALPHA)
+    composed.blits([
+        (glow_surface.premul_alpha(), (0, 0), None, pygame.BLEND_PREMULTIPLIED),
+        (bar_surface.premul_alpha(), (BAR_GLOW, BAR_GLOW), None, pygame.BLEND_PREMULTIPLIED),
+        (status_text.convert_alpha().premul_alpha(), (BAR_GLOW + text_rect.x, BAR_GLOW + text_rect.y), None, pygame.BLEND_PREMULTIPLIED),
+        (value_text.convert_alpha().premul_alpha(), (width + BAR_GLOW * 2, BAR_GLOW + height//2 - value_text.get_height()//2), None, pygame.BLEND_PREMULTIPLIED),
+    ])
+    return composed
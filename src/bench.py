@@ -0,0 +1,169 @@
+"""Headless frame-time benchmark for the Engine / WorldManager loop
+
+Usage (from `src/`):
+    python bench.py --frames 600 --npcs 4 100 500 --maps main-copy.tmx main-map.tmx --output bench.json
+    python bench.py --frames 120 --npcs 10000 --maps main-copy.tmx --memory  # * Entity cost at scale
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Set, Tuple
+
+# * SDL dummy drivers: no window, no audio device (must be set before pygame is imported)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+with contextlib.redirect_stdout(io.StringIO()):  # * Game modules log on import, keep the JSON output clean
+    from project.settings.constants import GameInfo
+    from tools import image_cache
+    from tools.profiler import frame_profiler, percentile
+
+
+class ScriptedKeys:
+    """Stand-in for `pygame.key.get_pressed()` holding a fixed set of pressed keys"""
+    def __init__(self, pressed: Set[int]): self.pressed = pressed
+    def __getitem__(self, key: int) -> bool: return key in self.pressed
+
+
+# * (frames, pressed keys) segments, looped: walk a square while panning the camera
+INPUT_SCRIPT: List[Tuple[int, Set[int]]] = [
+    (90, {pygame.K_d, pygame.K_RIGHT}),
+    (90, {pygame.K_s, pygame.K_DOWN}),
+    (90, {pygame.K_a, pygame.K_LEFT, pygame.K_LSHIFT}),
+    (90, {pygame.K_w, pygame.K_UP}),
+    (30, set()),
+]
+INTERACT_EVERY: int = 120  # * Frames between scripted `E` presses (talk to the closest NPC)
+
+
+def scripted_keys(frame: int) -> ScriptedKeys:
+    frame %= sum(length for length, _ in INPUT_SCRIPT)
+    for length, pressed in INPUT_SCRIPT:
+        if frame < length: return ScriptedKeys(pressed)
+        frame -= length
+    return ScriptedKeys(set())
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "mean": sum(samples) / len(samples) if samples else 0.0,
+        "max": max(samples, default=0.0),
+    }
+
+
+def run_benchmark(
+        surface: pygame.Surface, map_file: str, npc_count: int, frames: int, warmup: int, seed: int, memory: bool = False
+) -> Dict:
+    """Boot a fresh engine on `map_file` with `npc_count` NPCs and time `frames` scripted frames (`memory`: trace the NPCs allocations)"""
+    from app.core.engine import Engine
+    from app.core.systems.entities.npc import NPC, NPCType
+    from project import app_data
+
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):  # * Keep the JSON output clean
+        setup_start = time.perf_counter()
+        engine = Engine()
+        engine.init(surface, map_file)
+        world_manager = engine.world_manager
+        npc_manager = world_manager.npc_manager
+
+        width, height = world_manager.camera.map_size
+        added = max(0, npc_count - len(npc_manager.npcs))
+        if memory: tracemalloc.start()  # * Sheets are already cached by the default NPCs: only the entities are traced
+        for _ in range(added):
+            npc_manager.add_npc(NPC(
+                position=pygame.math.Vector2(random.uniform(0, width), random.uniform(0, height)),
+                npc_type=NPCType.CIVILIAN
+            ))
+        npc_bytes = tracemalloc.get_traced_memory()[0] if memory else 0
+        if memory: tracemalloc.stop()
+        setup_ms = (time.perf_counter() - setup_start) * 1000.0
+
+        dt = 1.0 / app_data.settings.tick_rate  # * One fixed simulation step per frame
+        update_ms: List[float] = []
+        draw_ms: List[float] = []
+        interact = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_e)
+
+        for frame in range(warmup + frames):
+            if frame == warmup: frame_profiler.reset()
+            frame_profiler.enabled = frame >= warmup
+
+            pygame.event.pump()
+            if frame % INTERACT_EVERY == INTERACT_EVERY - 1: engine.handle_keydown(interact)
+
+            start = time.perf_counter()
+            engine.update(dt, scripted_keys(frame))
+            updated = time.perf_counter()
+            engine.render()
+            drawn = time.perf_counter()
+
+            if frame >= warmup:
+                update_ms.append((updated - start) * 1000.0)
+                draw_ms.append((drawn - updated) * 1000.0)
+
+    frame_profiler.enabled = False
+    sections = frame_profiler.report()
+    frame_profiler.reset()
+    images, npc_total = image_cache.stats(), len(npc_manager.npcs)
+    with contextlib.redirect_stdout(io.StringIO()): engine.cleanup()
+    report = {
+        "map": map_file,
+        "npcs": npc_total,
+        "frames": frames,
+        "setup_ms": setup_ms,
+        "images": images,
+        "update": {"total": summarize(update_ms), **{k.split(".", 1)[1]: v for k, v in sections.items() if k.startswith("update.")}},
+        "draw": {"total": summarize(draw_ms), **{k.split(".", 1)[1]: v for k, v in sections.items() if k.startswith("draw.")}},
+    }
+    if memory: report["memory"] = {"npcs_added": added, "bytes": npc_bytes, "bytes_per_npc": npc_bytes / added if added else 0.0}
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=f"{GameInfo.NAME} headless frame-time benchmark")
+    parser.add_argument("--frames", type=int, default=600, help="measured frames per run")
+    parser.add_argument("--warmup", type=int, default=60, help="frames to run before measuring")
+    parser.add_argument("--maps", nargs="+", default=["main-copy.tmx", "main-map.tmx"])
+    parser.add_argument("--npcs", nargs="+", type=int, default=[4, 100, 500], help="NPC counts to benchmark")
+    parser.add_argument("--size", nargs=2, type=int, default=[1080, 720], metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory", action="store_true", help="trace the memory allocated per added NPC (slows the setup)")
+    parser.add_argument("--output", type=str, default=None, help="write the JSON report here (default: stdout)")
+    args = parser.parse_args()
+
+    pygame.init()
+    surface = pygame.display.set_mode(tuple(args.size))
+
+    report = {
+        "game": f"{GameInfo.NAME} {GameInfo.VERSION}",
+        "config": vars(args),
+        "runs": []
+    }
+    for map_file in args.maps:
+        for npc_count in args.npcs:
+            try: report["runs"].append(run_benchmark(surface, map_file, npc_count, args.frames, args.warmup, args.seed, args.memory))
+            except Exception as e:  # * A broken map shouldn't abort the whole suite
+                print(f"Benchmark failed for {map_file} ({npc_count} NPCs): {e}", file=sys.stderr)
+                report["runs"].append({"map": map_file, "npcs": npc_count, "error": str(e)})
+    pygame.quit()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file: file.write(output)
+    else: print(output)
+
+
+if __name__ == "__main__":
+    main()
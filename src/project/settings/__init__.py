@@ -18,6 +18,9 @@ class Settings(BaseModel):
     volume: float = Field(default=0.7, ge=0.0, le=1.0)
     fullscreen: bool = Field(default=False)
     fps: int = Field(default=72, ge=30, le=144)
+    tick_rate: int = Field(default=60, ge=30, le=240)  # Fixed simulation steps per second
+    image_cache_mb: int = Field(default=128, ge=16, le=4096)  # Memory budget of the shared image cache
+    dirty_rects: bool = Field(default=False)  # Present only the screen regions that changed (low power displays)
 
 
     def __init__(self, **data):
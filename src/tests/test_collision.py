@@ -0,0 +1,66 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from array import array
+import pygame
+
+from app.core.engine.collision import TileCollisionMap
+
+SIZE = 4  # * Tiles per chunk side
+
+
+class Chunks:
+    """Two tile layers per chunk, only the `resident` chunks available"""
+    def __init__(self, resident):
+        self.resident = resident
+        self.reads = []
+
+    def get_chunk(self, cx, cy):
+        self.reads.append((cx, cy))
+        return self.resident.get((cx, cy))
+
+
+def _chunk(ground=(), walls=()):
+    """Chunk gids: layer 0 gets gid 1 (solid tile) at `ground`, layer 1 gets gid 2 at `walls`"""
+    gids = array("I", [0]) * (2 * SIZE * SIZE)
+    for x, y in ground: gids[y * SIZE + x] = 1
+    for x, y in walls: gids[SIZE * SIZE + y * SIZE + x] = 2
+    return gids
+
+
+def _map(resident, max_chunks=None):
+    collision = TileCollisionMap(4 * SIZE, 4 * SIZE, 16, 16, SIZE, Chunks(resident), max_chunks)
+    collision.solid_gids = {1}
+    collision.solid_layers = [(0, False), (1, True)]
+    return collision
+
+
+def test_chunks_are_baked_on_first_touch_only():
+    collision = _map({(0, 0): _chunk(ground=[(1, 1)], walls=[(2, 3)]), (1, 0): _chunk()})
+    assert collision.bakes == 0
+    assert collision.is_solid(1, 1) and collision.is_solid(2, 3) and not collision.is_solid(0, 0)
+    assert not collision.is_solid(SIZE, 0)
+    assert collision.source.reads == [(0, 0), (1, 0)] and collision.bakes == 2
+
+
+def test_chunks_not_streamed_in_block_until_they_arrive():
+    chunks = {}
+    collision = _map(chunks)
+    assert collision.is_solid(0, 0) and collision.bakes == 0
+    chunks[(0, 0)] = _chunk()
+    assert not collision.is_solid(0, 0) and collision.bakes == 1
+
+
+def test_collision_rects_are_applied_per_chunk():
+    collision = _map({(0, 0): _chunk(), (1, 0): _chunk()})
+    collision.rects = [pygame.Rect(3 * 16, 0, 32, 16)]  # * Tiles (3, 0) and (4, 0), across the chunk border
+    assert [collision.is_solid(x, 0) for x in range(2, 6)] == [False, True, True, False]
+
+
+def test_baked_chunks_are_bounded():
+    collision = _map({(cx, 0): _chunk(walls=[(0, 0)]) for cx in range(4)}, max_chunks=2)
+    assert all(collision.is_solid(cx * SIZE, 0) for cx in range(4))
+    assert len(collision._chunks) == 2 and collision.bakes == 4
@@ -0,0 +1,52 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from tools import ImageCache
+
+
+def _image(tmp_path, name: str, size=(32, 32)) -> str:
+    path = tmp_path / name
+    pygame.image.save(pygame.Surface(size), str(path))
+    return str(path)
+
+
+def test_get_over_budget_keeps_the_new_image(tmp_path):
+    cache = ImageCache(budget_bytes=1000)  # * Smaller than a single 32x32 image
+    path = _image(tmp_path, "a.png")
+    first = cache.get(path)
+    assert cache.get(path) is first
+    assert cache.get(path) is first
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 0)
+
+
+def test_acquire_over_budget_pins_the_image(tmp_path):
+    cache = ImageCache(budget_bytes=1000)
+    path = _image(tmp_path, "a.png")
+    surface = cache.acquire(path)
+    assert cache.stats()["pinned"] == 1
+    assert cache.acquire(path) is surface
+
+
+def test_put_over_budget_evicts_older_images_only(tmp_path):
+    cache = ImageCache(budget_bytes=1000)
+    cache.put("old", pygame.Surface((32, 32)))
+    cache.put("new", pygame.Surface((32, 32)))
+    stats = cache.stats()
+    assert (stats["images"], stats["evictions"]) == (1, 1)
+    assert cache.get("new") is not None and cache.stats()["hits"] == 1
+
+
+def test_release_makes_pinned_images_evictable(tmp_path):
+    cache = ImageCache(budget_bytes=1000)
+    first, second = _image(tmp_path, "a.png"), _image(tmp_path, "b.png")
+    cache.acquire(first)
+    cache.set_budget(cache.bytes)  # * Room for one image
+    cache.get(second)  # * Both over budget: the pinned one and the one just loaded stay
+    assert cache.stats()["images"] == 2
+    cache.release(first)
+    assert cache.stats()["images"] == 1 and cache.stats()["pinned"] == 0
@@ -0,0 +1,40 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from app.game.base.inventory import Inventory, Item, ItemStore, ItemType
+
+
+def _item(item_id: str, stackable: bool = False, quantity: int = 1) -> Item:
+    return Item(id=item_id, name=item_id, type=ItemType.WEAPON, description="", value=1, stackable=stackable, quantity=quantity)
+
+
+def test_transfer_counts_a_multi_unit_item_as_one_slot():
+    source, target = ItemStore([_item("crate", quantity=5)], 4), ItemStore([], 1)
+    assert source.transfer(target, {"crate": 5})
+    assert len(source) == 0 and target.count("crate") == 5 and len(target) == 1
+
+
+def test_transfer_counts_whole_slots_plus_a_split():
+    source = ItemStore([_item("crate", quantity=2), _item("crate", quantity=2), _item("crate", quantity=2)], 4)
+    assert not source.transfer(ItemStore([], 1), {"crate": 3})  # * One whole slot and a split one
+    target = ItemStore([], 2)
+    assert source.transfer(target, {"crate": 3})
+    assert source.count("crate") == 3 and target.count("crate") == 3 and len(target) == 2
+
+
+def test_transfer_is_all_or_nothing():
+    source, target = ItemStore([_item("sword"), _item("potion", True, 3)], 4), ItemStore([_item("shield")], 3)
+    assert not source.transfer(target, {"sword": 1, "potion": 1, "missing": 1})
+    assert not source.transfer(ItemStore([_item("shield")], 2), {"sword": 1, "potion": 5})
+    assert source.transfer(target, {"sword": 1, "potion": 2})
+    assert source.count("potion") == 1 and target.count("potion") == 2 and target.count("sword") == 1
+
+
+def test_old_saves_with_items_load_into_slots():
+    inventory = Inventory(items=[_item("sword").model_dump(), _item("potion", True, 2).model_dump()])
+    assert [item.id for item in inventory.slots] == ["sword", "potion"] and inventory.count("potion") == 2
+    assert Inventory(slots=[]).items == [] and len(Inventory(items=[]).store) == 0
+    assert "slots" in inventory.model_dump() and "items" not in inventory.model_dump()
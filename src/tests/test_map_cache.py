@@ -0,0 +1,89 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from app.core.engine.world.map_cache import MapBundleData, MapCache, bundle_path
+
+TMX = """<?xml version="1.0" encoding="UTF-8"?>
+<map version="1.10" orientation="orthogonal" renderorder="right-down" width="2" height="2" tilewidth="16" tileheight="16" infinite="0" nextlayerid="2" nextobjectid="1">
+ <layer id="1" name="Ground" width="2" height="2"><data encoding="csv">0,0,0,0</data></layer>
+</map>
+"""
+
+ANIMATED_TMX = """<?xml version="1.0" encoding="UTF-8"?>
+<map version="1.10" orientation="orthogonal" renderorder="right-down" width="2" height="2" tilewidth="16" tileheight="16" infinite="0" nextlayerid="2" nextobjectid="1">
+ <tileset firstgid="1" name="water" tilewidth="16" tileheight="16" tilecount="2" columns="2">
+  <image source="water.png" width="32" height="16"/>
+  <tile id="0"><animation><frame tileid="0" duration="10"/><frame tileid="1" duration="10"/></animation></tile>
+ </tileset>
+ <layer id="1" name="Ground" width="2" height="2"><data encoding="csv">1,0,0,0</data></layer>
+</map>
+"""
+
+
+def _map(tmp_path, name: str = "map.tmx") -> str:
+    path = tmp_path / name
+    path.write_text(TMX)
+    return str(path)
+
+
+def test_bundle_stays_open_until_its_last_reference_is_released(tmp_path):
+    cache, path = MapCache(), _map(tmp_path)
+    first, second = cache.acquire(path), cache.acquire(path)
+    assert first is second and cache.stats()["refs"] == 2
+    cache.release(first)
+    assert first.get_chunk(0, 0) is not None and cache.load(path) is first
+    cache.release(second)
+    assert cache.stats() == {"bundles": 0, "referenced": 0, "refs": 0}
+    assert first._mmap is None and cache.acquire(path) is not first
+
+
+def test_stale_bundle_stays_open_for_its_users(tmp_path):
+    cache, path = MapCache(), _map(tmp_path)
+    old = cache.acquire(path)
+    old.get_chunk(0, 0)
+    os.utime(bundle_path(path), (os.path.getmtime(path) - 10,) * 2)  # * The map changed since: recompiled on the next load
+    new = cache.acquire(path)
+    assert new is not old and old._mmap is not None
+    cache.release(old)
+    assert old._mmap is None and cache.load(path) is new and cache.stats()["refs"] == 1
+
+
+def test_clear_keeps_referenced_bundles(tmp_path):
+    cache = MapCache()
+    kept, dropped = cache.acquire(_map(tmp_path, "a.tmx")), cache.load(_map(tmp_path, "b.tmx"))
+    cache.clear()
+    assert cache.stats()["bundles"] == 1 and cache.load(kept.root / "a.tmx") is kept and dropped is not kept
+
+
+def test_concurrent_acquires_share_one_bundle(tmp_path):
+    cache, path = MapCache(), _map(tmp_path)
+    with ThreadPoolExecutor(max_workers=8) as executor: bundles = list(executor.map(lambda _: cache.acquire(path), range(32)))
+    assert all(bundle is bundles[0] for bundle in bundles) and cache.stats()["refs"] == 32
+    with ThreadPoolExecutor(max_workers=8) as executor: list(executor.map(cache.release, bundles))
+    assert cache.stats() == {"bundles": 0, "referenced": 0, "refs": 0}
+
+
+def test_animated_tiles_advance_once_drawn(tmp_path):
+    pygame.display.set_mode((64, 64))
+    sheet = pygame.Surface((32, 16))
+    sheet.fill((0, 0, 255), (0, 0, 16, 16))
+    sheet.fill((255, 255, 255), (16, 0, 16, 16))
+    pygame.image.save(sheet, str(tmp_path / "water.png"))
+    (tmp_path / "map.tmx").write_text(ANIMATED_TMX)
+    cache = MapCache()
+    bundle = cache.acquire(str(tmp_path / "map.tmx"))
+    data, view = MapBundleData(bundle), pygame.Rect(0, 0, 2, 2)
+    (*_, first), = data.get_tile_images_by_rect(view)  # * Drawn once: its position is tracked from now on
+    assert first.get_at((0, 0))[:3] == (0, 0, 255)
+    time.sleep(0.02)
+    changed = data.process_animation_queue(view)
+    (*_, second), = data.get_tile_images_by_rect(view)
+    assert changed and second is not first and second.get_at((0, 0))[:3] == (255, 255, 255)
+    cache.release(bundle)
@@ -0,0 +1,61 @@
+import os
+import threading
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from tools.preloader import AssetPreloader
+
+
+class Bundle:
+    image_paths = []
+
+
+class Loader:
+    """Map loader held on an event, counting the maps it handed out and got back"""
+    def __init__(self):
+        self.go, self.started = threading.Event(), threading.Event()
+        self.loaded, self.released = [], []
+
+    def load(self, path):
+        self.started.set()
+        self.go.wait(5)
+        bundle = Bundle()
+        self.loaded.append(bundle)
+        return bundle
+
+
+def test_map_taken_while_loading_is_released_by_poll():
+    preloader, loader = AssetPreloader(workers=1), Loader()
+    preloader.queue_map("a.tmx", loader.load, loader.released.append)
+    loader.started.wait(5)
+    assert preloader.take_map("a.tmx") is None  # * Still loading: nobody will own it
+    loader.go.set()
+    preloader.wait()
+    assert loader.released == loader.loaded and len(loader.loaded) == 1
+    assert preloader.take_map("a.tmx") is None and preloader.done
+
+
+def test_map_taken_before_loading_is_cancelled():
+    preloader, loader = AssetPreloader(workers=1), Loader()
+    preloader.queue_map("a.tmx", loader.load, loader.released.append)
+    preloader.queue_map("b.tmx", loader.load, loader.released.append)  # * Queued behind a.tmx
+    loader.started.wait(5)
+    assert preloader.take_map("b.tmx") is None
+    loader.go.set()
+    preloader.wait()
+    assert len(loader.loaded) == 1 and loader.released == []
+    assert preloader.take_map("a.tmx") is loader.loaded[0]
+
+
+def test_map_taken_while_loading_can_be_queued_again():
+    preloader, loader = AssetPreloader(workers=1), Loader()
+    preloader.queue_map("a.tmx", loader.load, loader.released.append)
+    loader.started.wait(5)
+    preloader.take_map("a.tmx")
+    preloader.queue_map("a.tmx", loader.load, loader.released.append)
+    loader.go.set()
+    preloader.wait()
+    assert len(loader.loaded) == 2 and len(loader.released) == 1
+    assert preloader.take_map("a.tmx") is loader.loaded[1]
@@ -0,0 +1,18 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from app.core.systems.ui.text import TextEngine
+
+
+def test_faded_text_leaves_the_shared_render_opaque():
+    pygame.init()
+    engine = TextEngine()
+    shared = engine.render("CascadiaCode.ttf", 16, (255, 255, 255), "Captain")
+    faded = engine.render_faded("CascadiaCode.ttf", 16, (255, 255, 255), "Captain", 64)
+    assert faded is not shared and faded.get_alpha() == 64 and shared.get_alpha() in (None, 255)
+    assert engine.render_faded("CascadiaCode.ttf", 16, (255, 255, 255), "Captain", 128) is faded and faded.get_alpha() == 128
@@ -0,0 +1,134 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+import pytest
+
+from app.core.engine.world import WorldManager
+from app.core.engine.world.map_cache import map_cache
+from app.core.systems.ui.hint import Hint
+from tools.preloader import asset_preloader
+
+
+def _portal(x: int, y: int, target: str, spawn: str) -> str:
+    return (
+        f'<object type="Portal" x="{x}" y="{y}" width="32" height="32"><properties>'
+        f'<property name="map" value="{target}"/><property name="spawn" value="{spawn}"/></properties></object>'
+    )
+
+
+def _tmx(path, objects: str) -> str:
+    """40x30 map of 16px tiles (no tileset) with an 'Objects' layer"""
+    path.write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<map version="1.10" orientation="orthogonal" renderorder="right-down" width="40" height="30" '
+        'tilewidth="16" tileheight="16" infinite="0" nextlayerid="3" nextobjectid="1">\n'
+        f' <layer id="1" name="Ground" width="40" height="30"><data encoding="csv">{",".join(["0"] * 1200)}</data></layer>\n'
+        f' <objectgroup id="2" name="Objects">{objects}</objectgroup>\n'
+        '</map>\n'
+    )
+    return str(path)
+
+
+class NoKeys:
+    def __getitem__(self, key): return False
+
+
+@pytest.fixture
+def maps(tmp_path):
+    """a <-> b <-> c: arriving in b or c lands on the portal leading back"""
+    a, b, c = (str(tmp_path / f"{name}.tmx") for name in "abc")
+    _tmx(tmp_path / "a.tmx", '<object name="back" x="100" y="300" width="32" height="32"/>' + _portal(300, 100, b, "arrival"))
+    _tmx(tmp_path / "b.tmx", (
+        '<object name="arrival" x="40" y="40" width="32" height="32"/>' + _portal(40, 40, a, "back")
+        + _portal(400, 300, c, "arrival")
+        + '<object type="NPC" x="200" y="200"><properties><property name="npc_type" value="MERCHANT"/>'
+          '<property name="dialogue" value="merchant-01, merchant-02"/></properties></object>'
+    ))
+    _tmx(tmp_path / "c.tmx", '<object name="arrival" x="40" y="40" width="32" height="32"/>' + _portal(40, 40, b, "arrival"))
+    return a, b, c
+
+
+@pytest.fixture
+def manager(maps):
+    pygame.init()
+    pygame.display.set_mode((320, 240))
+    refs = map_cache.stats()["refs"]
+    manager = WorldManager(max_resident=2)
+    manager.create_world("a", maps[0])
+    for path in maps[1:]: manager.world_name(path)  # * Registered as b and c
+    yield manager
+    manager.cleanup()
+    asset_preloader.wait()  # * Prefetches still loading get released
+    assert map_cache.stats()["refs"] == refs
+
+
+def _step_on(manager: WorldManager, portal_index: int = 0) -> None:
+    manager.player.position = pygame.math.Vector2(manager.current_world.portals[portal_index].rect.center)
+    manager.update(1 / 60, NoKeys())
+
+
+def test_portal_travel_does_not_bounce_back(manager):
+    _step_on(manager)
+    assert manager.current_name == "b"
+    for _ in range(10): manager.update(1 / 60, NoKeys())  # * Standing on b's portal back to a
+    assert manager.current_name == "b"
+
+    manager.player.position = pygame.math.Vector2(200, 100)  # * Leave the portal, then step on it again
+    manager.update(1 / 60, NoKeys())
+    _step_on(manager)
+    assert manager.current_name == "a"
+    assert manager.player.position == pygame.math.Vector2(manager.current_world.get_spawn_point("back"))
+
+
+def test_resident_worlds_stay_within_max_resident(manager, maps):
+    for name in ("b", "c", "b", "c"):
+        assert manager.switch_world(name)
+        assert len(manager.worlds) <= manager.max_resident and manager.current_world is manager.worlds[name]
+    assert list(manager.worlds) == ["b", "c"]
+
+
+def test_evicted_world_bundles_are_released(manager, maps):
+    bundle = manager.worlds["a"].tiled_map.bundle
+    manager.switch_world("b")
+    manager.switch_world("c")  # * Evicts a
+    assert "a" not in manager.worlds and bundle._mmap is None and bundle._gids is None
+    manager.cleanup()
+    asset_preloader.wait()
+    assert map_cache.stats()["refs"] == 0
+
+
+def test_saved_position_is_restored_on_return(manager):
+    manager.player.position = pygame.math.Vector2(200, 220)
+    manager.switch_world("b")
+    manager.switch_world("a")
+    assert manager.player.position == pygame.math.Vector2(200, 220)
+    manager.switch_world("b")
+    manager.switch_world("c")  # * a is unloaded: its state is restored from saved_states
+    manager.switch_world("a")
+    assert manager.player.position == pygame.math.Vector2(200, 220)
+
+
+def test_npcs_and_hints_belong_to_their_world(manager):
+    home = manager.npc_manager
+    npc, count = home.npcs[0], len(home.npcs)
+    npc.position, npc.current_dialogue_index = pygame.math.Vector2(123, 45), 2
+    home.hint_manager.add_hint("chest", Hint("Chest", anchor=pygame.math.Vector2(60, 60), visible=True))
+
+    manager.switch_world("b")
+    assert manager.npc_manager is not home
+    assert [(n.npc_type.name, n.dialogue_keys) for n in manager.npc_manager.npcs] == [("MERCHANT", ["merchant-01", "merchant-02"])]
+    assert "chest" not in manager.npc_manager.hint_manager.hints
+
+    manager.switch_world("c")  # * Evicts a
+    assert "a" not in manager.worlds and "npcs" in manager.saved_states["a"]
+    manager.switch_world("b")
+    manager.switch_world("a")
+    restored = {n.name: n for n in manager.npc_manager.npcs}
+    assert len(restored) == count and home.npcs == []  # * The old manager was cleared on unload
+    assert restored[npc.name].position == pygame.math.Vector2(123, 45) and restored[npc.name].current_dialogue_index == 2
+    chest = manager.npc_manager.hint_manager.hints["chest"]
+    assert chest.anchor == pygame.math.Vector2(60, 60) and chest.visible
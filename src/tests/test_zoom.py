@@ -0,0 +1,56 @@
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+import pyscroll
+import pytest
+from pytmx.util_pygame import load_pygame
+
+from app.core.engine.world.map_cache import MapBundleData, MapCache
+from app.core.engine.world.zoom import ScaledMapData
+
+TMX = """<?xml version="1.0" encoding="UTF-8"?>
+<map version="1.10" orientation="orthogonal" renderorder="right-down" width="2" height="2" tilewidth="16" tileheight="16" infinite="0" nextlayerid="2" nextobjectid="1">
+ <tileset firstgid="1" name="water" tilewidth="16" tileheight="16" tilecount="2" columns="2">
+  <image source="water.png" width="32" height="16"/>
+  <tile id="0"><animation><frame tileid="0" duration="10"/><frame tileid="1" duration="10"/></animation></tile>
+ </tileset>
+ <layer id="1" name="Ground" width="2" height="2"><data encoding="csv">1,0,0,0</data></layer>
+</map>
+"""
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    pygame.display.set_mode((64, 64))
+    sheet = pygame.Surface((32, 16))
+    sheet.fill((0, 0, 255), (0, 0, 16, 16))
+    sheet.fill((255, 255, 255), (16, 0, 16, 16))
+    pygame.image.save(sheet, str(tmp_path / "water.png"))
+    (tmp_path / "map.tmx").write_text(TMX)
+    return str(tmp_path / "map.tmx")
+
+
+def _assert_scaled_animation(inner: pyscroll.data.PyscrollDataAdapter) -> None:
+    data, view = ScaledMapData(inner, 2.0), pygame.Rect(0, 0, 2, 2)
+    (*_, first), = data.get_tile_images_by_rect(view)
+    assert first.get_size() == (32, 32) and first.get_at((0, 0))[:3] == (0, 0, 255)
+    time.sleep(0.02)
+    changed = data.process_animation_queue(view)
+    (*_, second), = data.get_tile_images_by_rect(view)
+    assert changed and second.get_size() == (32, 32) and second.get_at((0, 0))[:3] == (255, 255, 255)
+
+
+def test_scaled_bundle_tiles_animate(path):
+    cache = MapCache()
+    bundle = cache.acquire(path)
+    _assert_scaled_animation(MapBundleData(bundle))
+    cache.release(bundle)
+
+
+def test_scaled_tmx_tiles_animate(path):
+    _assert_scaled_animation(pyscroll.data.TiledMapData(load_pygame(path)))
@@ -1,6 +1,8 @@
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 from enum import Enum
-from typing import Union
+from typing import Dict, Optional, Union
 from pydantic import BaseModel
 import pygame
 
@@ -35,5 +37,98 @@ class AssetManager(BaseModel):
             setattr(cls, f"{method_name}_abs", lambda filename, at=asset_type: cls.get_asset(at, filename, True))
 
 
+@dataclass
+class CachedImage:
+    surface: pygame.Surface
+    size_bytes: int
+    refs: int = 0
+
+
+class ImageCache:
+    """Shared, reference-counted image cache with a byte budget (LRU eviction of unreferenced images)"""
+    def __init__(self, budget_bytes: int = 128 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self._images: OrderedDict[tuple, CachedImage] = OrderedDict()  # * (path, alpha) -> image, oldest first
+        self.hits = self.misses = self.evictions = 0
+        self.bytes = 0
+
+    def get(self, path: Union[Path, str], alpha: bool = True) -> pygame.Surface:
+        """Get a decoded (and converted) image without holding a reference to it"""
+        key = (str(path), alpha)
+        image = self._images.get(key)
+        if image is None:
+            self.misses += 1
+            image = self._images[key] = self._load(key[0], alpha)
+            self.bytes += image.size_bytes
+            self._evict(keep=key)
+        else:
+            self.hits += 1
+            self._images.move_to_end(key)
+        return image.surface
+
+    def put(self, path: Union[Path, str], surface: pygame.Surface, alpha: bool = True) -> pygame.Surface:
+        """Convert and store an image decoded elsewhere (e.g. on a preloader thread)"""
+        key = (str(path), alpha)
+        if key in self._images: return self.get(path, alpha)
+        image = self._images[key] = self._wrap(surface, alpha)
+        self.bytes += image.size_bytes
+        self._evict(keep=key)
+        return image.surface
+
+    def acquire(self, path: Union[Path, str], alpha: bool = True) -> pygame.Surface:
+        """Get an image and pin it in the cache until it's released"""
+        surface = self.get(path, alpha)
+        self._images[(str(path), alpha)].refs += 1
+        return surface
+
+    def release(self, path: Union[Path, str], alpha: bool = True) -> None:
+        """Drop a reference taken with acquire (the image becomes evictable at 0 refs)"""
+        image = self._images.get((str(path), alpha))
+        if image and image.refs > 0:
+            image.refs -= 1
+            self._evict()
+
+    def set_budget(self, budget_bytes: int) -> None:
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def clear(self) -> None:
+        """Forget every unreferenced image"""
+        for key in [key for key, image in self._images.items() if image.refs == 0]:
+            self.bytes -= self._images.pop(key).size_bytes
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "images": len(self._images),
+            "pinned": sum(1 for image in self._images.values() if image.refs > 0),
+            "bytes": self.bytes,
+            "budget_bytes": self.budget_bytes,
+        }
+
+    def _evict(self, keep: Optional[tuple] = None) -> None:
+        """Drop least recently used unreferenced images until the cache fits its budget (never `keep`: the image just stored)"""
+        if self.bytes <= self.budget_bytes: return
+        for key in list(self._images):
+            if self.bytes <= self.budget_bytes: break
+            if self._images[key].refs == 0 and key != keep:
+                self.bytes -= self._images.pop(key).size_bytes
+                self.evictions += 1
+
+    @staticmethod
+    def _load(path: str, alpha: bool) -> CachedImage:
+        return ImageCache._wrap(pygame.image.load(path), alpha)
+
+    @staticmethod
+    def _wrap(surface: pygame.Surface, alpha: bool) -> CachedImage:
+        try: surface = surface.convert_alpha() if alpha else surface.convert()
+        except pygame.error: pass  # * No display mode set yet: keep the unconverted surface
+        return CachedImage(surface=surface, size_bytes=surface.get_pitch() * surface.get_height())
+
+
+image_cache = ImageCache()
+
 pygame.font.init()  # * Initialize the font module (required for AssetManager.get_font)
 AssetManager.generate_methods()
\ No newline at end of file
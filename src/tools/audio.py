@@ -53,14 +53,17 @@ class AudioManager:
             if sound_type == AudioType.MUSIC:
                 # Music is streamed, not loaded into memory
                 pass
-            else:
-                self.sounds[name] = pygame.mixer.Sound(sound_path)
-                # Set initial volume based on type
-                volume = self._get_type_volume(sound_type)
-                self.sounds[name].set_volume(volume * self.config.master_volume)
+            else: self.add_sound(name, pygame.mixer.Sound(sound_path), sound_type)
         except Exception as e:
             print(f"Error loading sound {name}: {e}")
 
+    def add_sound(self, name: str, sound: pygame.mixer.Sound, sound_type: AudioType) -> None:
+        """Register an already decoded sound (e.g. by the asset preloader)"""
+        self.sounds[name] = sound
+        # Set initial volume based on type
+        volume = self._get_type_volume(sound_type)
+        self.sounds[name].set_volume(volume * self.config.master_volume)
+
     def play_music(self, filename: str, loop: bool = True) -> None:
         """Play background music"""
         try:
@@ -0,0 +1,111 @@
+# tools/preloader.py
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Union
+import pygame
+
+from tools import image_cache
+from tools.audio import AudioType, audio_manager
+
+
+class AssetKind(Enum):
+    IMAGE = "image"
+    MAP = "map"
+    SOUND = "sound"
+
+
+@dataclass
+class PreloadJob:
+    kind: AssetKind
+    key: str
+    future: Future
+    options: Dict[str, Any] = field(default_factory=dict)
+    done: bool = False
+    discard: bool = False  # * Nobody wants the result any more (released instead of kept)
+
+
+class AssetPreloader:
+    """Decodes images, maps and sounds on a thread pool; the main thread converts them in small `poll` slices"""
+    def __init__(self, workers: int = 4, budget_ms: float = 4.0):
+        self.budget_ms = budget_ms  # * Main thread time spent converting per poll (keeps the menu responsive)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="preload")
+        self._jobs: List[PreloadJob] = []
+        self._maps: Dict[str, Any] = {}  # * Map path -> MapBundle
+        self.errors: Dict[str, str] = {}
+
+    def queue_image(self, path: Union[Path, str], alpha: bool = True) -> None:
+        self._submit(AssetKind.IMAGE, str(path), lambda: pygame.image.load(str(path)), alpha=alpha)
+
+    def queue_map(
+            self, path: Union[Path, str], loader: Callable[[str], Any], release: Optional[Callable[[Any], None]] = None
+    ) -> None:
+        """Load a map with `loader` (e.g. map_cache.acquire); its `image_paths` are queued once it's ready.
+        `release` (e.g. map_cache.release) gets the maps that finish loading after they were taken"""
+        self._submit(AssetKind.MAP, str(path), lambda: loader(str(path)), release=release)
+
+    def queue_sound(self, name: str, path: Union[Path, str], sound_type: AudioType) -> None:
+        self._submit(AssetKind.SOUND, name, lambda: pygame.mixer.Sound(str(path)), sound_type=sound_type)
+
+    def _submit(self, kind: AssetKind, key: str, decode: Callable[[], Any], **options) -> None:
+        if any(job.kind == kind and job.key == key and not job.discard for job in self._jobs): return
+        self._jobs.append(PreloadJob(kind=kind, key=key, future=self._executor.submit(decode), options=options))
+
+    def poll(self, budget_ms: Optional[float] = None) -> float:
+        """Hand finished assets to their caches (main thread). Returns the progress"""
+        deadline = perf_counter() + (self.budget_ms if budget_ms is None else budget_ms) / 1000.0
+        for job in self._jobs:
+            if job.done or not job.future.done(): continue
+            if perf_counter() > deadline: break
+            try: self._finalize(job)
+            except Exception as e:
+                print(f"Error preloading {job.kind.value} {job.key}: {e}")
+                self.errors[job.key] = str(e)
+                job.done = True
+        self._jobs = [job for job in self._jobs if not (job.discard and job.done)]
+        return self.progress
+
+    def _finalize(self, job: PreloadJob) -> None:
+        result = job.future.result()  # * Re-raises worker errors
+        match job.kind:
+            case AssetKind.IMAGE: image_cache.put(job.key, result, job.options["alpha"])
+            case AssetKind.SOUND: audio_manager.add_sound(job.key, result, job.options["sound_type"])
+            case AssetKind.MAP if job.discard:
+                if job.options["release"]: job.options["release"](result)
+            case AssetKind.MAP:
+                self._maps[job.key] = result
+                [self.queue_image(path) for path in result.image_paths]  # * Tilesets are regular images
+        job.done = True
+
+    def wait(self) -> None:
+        """Block until everything queued is loaded"""
+        while not self.done:
+            for job in self._jobs:
+                if not job.done: job.future.exception()  # * Wait for the worker without raising
+            self.poll(budget_ms=float("inf"))
+
+    def take_map(self, path: Union[Path, str]) -> Any:
+        """Get (and forget) a preloaded map bundle or None if it isn't ready (its cache reference goes with it).
+        A map still loading is cancelled, or released by `poll` once it's done: it belongs to nobody any more"""
+        bundle = self._maps.pop(str(path), None)
+        for job in [job for job in self._jobs if job.kind == AssetKind.MAP and job.key == str(path)]:
+            if job.done or job.future.cancel(): self._jobs.remove(job)  # * The map can be queued again
+            else: job.discard = True
+        return bundle
+
+    @property
+    def progress(self) -> float:
+        """Fraction (0..1) of queued assets ready to use"""
+        if not self._jobs: return 1.0
+        return sum(job.done for job in self._jobs) / len(self._jobs)
+
+    @property
+    def done(self) -> bool: return all(job.done for job in self._jobs)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+asset_preloader = AssetPreloader()
@@ -0,0 +1,51 @@
+# tools/profiler.py
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Dict, Iterator, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples: return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class FrameProfiler:
+    """Collects per-section timings (in ms) for every frame. Disabled by default (no overhead)"""
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.samples: Dict[str, List[float]] = {}
+        self._null = nullcontext()
+
+    def section(self, name: str):
+        """Time a block of code: `with frame_profiler.section("draw.map"): ...`"""
+        return self._timed(name) if self.enabled else self._null
+
+    @contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        start = perf_counter()
+        try: yield
+        finally: self.samples.setdefault(name, []).append((perf_counter() - start) * 1000.0)
+
+    def add_sample(self, name: str, ms: float) -> None:
+        self.samples.setdefault(name, []).append(ms)
+
+    def reset(self) -> None: self.samples.clear()
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Summarize every section as p50/p95/p99/mean/max (ms)"""
+        return {
+            name: {
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "mean": sum(values) / len(values),
+                "max": max(values),
+                "samples": len(values),
+            } for name, values in self.samples.items() if values
+        }
+
+
+frame_profiler = FrameProfiler()